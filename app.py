@@ -1,16 +1,36 @@
+import os
 import streamlit as st
 import pandas as pd
 from src.config.settings import setup_page_config, get_styles
 from src.config.texts import get_texts
-from src.api.kucoin import fetch_candles
-from src.ui.chart import plot_candlestick
-import time
+from src.api.stream import get_stream
+from src.data.hub import get_data_hub
+from src.data.resample import BASE_TIMEFRAME, resample_frame
+from src.indicators.incremental import get_live_indicators
+from src.api.kucoin import fetch_chart_data, fetch_market_info
+from src.ui.chart import plot_candlestick, render_market_info
+from src.ui.watchlist import render_watchlist
+from src.ui.debug import remember_rerun, render_debug_metrics
+from src.ui.backtest import render_backtest
+from src.ui.sweep import render_sweep
+from src.ui.screener import render_screener
+from src.utils import metrics
 import random
 
+# Seconds between chart refreshes while streaming
+STREAM_REFRESH_SECONDS = 1
+# Default seconds between chart refreshes when auto refresh is on
+DEFAULT_REFRESH_SECONDS = 60
+
 # Page configuration
 setup_page_config()
+rerun_trace = metrics.begin_rerun("script")
 st.markdown(get_styles(), unsafe_allow_html=True)
 
+# Prometheus scrape endpoint, one per process
+if os.environ.get("METRICS_PORT"):
+    metrics.start_metrics_server(int(os.environ["METRICS_PORT"]))
+
 # Initialize session state
 if 'language' not in st.session_state:
     st.session_state.language = "English"
@@ -20,12 +40,20 @@ if 'show_grid' not in st.session_state:
     st.session_state.show_grid = True
 if 'show_crosshair' not in st.session_state:
     st.session_state.show_crosshair = True
+if 'webgl' not in st.session_state:
+    st.session_state.webgl = False
+if 'volume_profile' not in st.session_state:
+    st.session_state.volume_profile = False
 if 'timezone' not in st.session_state:
     st.session_state.timezone = "UTC"
-if 'last_refresh' not in st.session_state:
-    st.session_state.last_refresh = time.time()
 if 'auto_refresh' not in st.session_state:
     st.session_state.auto_refresh = True
+if 'refresh_interval' not in st.session_state:
+    st.session_state.refresh_interval = DEFAULT_REFRESH_SECONDS
+if 'streaming' not in st.session_state:
+    st.session_state.streaming = False
+if 'debug_metrics' not in st.session_state:
+    st.session_state.debug_metrics = False
 if 'indicators' not in st.session_state:
     st.session_state.indicators = {
         'MA': [],
@@ -37,13 +65,6 @@ if 'indicators' not in st.session_state:
 # Get texts based on language
 texts = get_texts(st.session_state.language)
 
-# Auto-refresh logic
-if st.session_state.auto_refresh:
-    current_time = time.time()
-    if current_time - st.session_state.last_refresh >= 60:  # 60 seconds = 1 minute
-        st.session_state.last_refresh = current_time
-        st.rerun()
-
 # Sidebar
 with st.sidebar:
     st.title(texts["title"])
@@ -74,6 +95,18 @@ with st.sidebar:
     with col2:
         if st.button("🔄", help=texts["manual_refresh"]):
             st.rerun()
+    if st.session_state.auto_refresh:
+        refresh_interval = st.number_input(
+            texts["refresh_interval_label"],
+            min_value=1,
+            value=st.session_state.refresh_interval,
+            help=texts["refresh_interval_help"]
+        )
+        if refresh_interval != st.session_state.refresh_interval:
+            st.session_state.refresh_interval = refresh_interval
+    streaming = st.checkbox(texts["live_stream"], value=st.session_state.streaming, help=texts["live_stream_help"])
+    if streaming != st.session_state.streaming:
+        st.session_state.streaming = streaming
     
     # Cryptocurrency selection
     st.caption(texts["select_coin"])
@@ -116,18 +149,41 @@ with st.sidebar:
     if show_crosshair != st.session_state.show_crosshair:
         st.session_state.show_crosshair = show_crosshair
     
+    webgl = st.checkbox(texts["webgl"], value=st.session_state.webgl, help=texts["webgl_help"])
+    if webgl != st.session_state.webgl:
+        st.session_state.webgl = webgl
+    
+    volume_profile = st.checkbox(texts["volume_profile"], value=st.session_state.volume_profile,
+                                 help=texts["volume_profile_help"])
+    if volume_profile != st.session_state.volume_profile:
+        st.session_state.volume_profile = volume_profile
+    
+    # Visible range: longer ranges are downsampled, shorter ones drawn at full resolution
+    st.caption(texts["view_range"])
+    view_ranges = {
+        "All": None,
+        "1M": 30*24*3600,
+        "1W": 7*24*3600,
+        "1D": 24*3600
+    }
+    view_range = st.selectbox("", list(view_ranges.keys()), key="view_range_select", label_visibility="collapsed",
+                              format_func=lambda option: texts["all"] if option == "All" else option)
+    
     # Indicators settings
     st.sidebar.markdown(f"### {texts['indicators_label']}")
     
     # Moving Average settings
     st.sidebar.markdown("#### Moving Average")
-    ma_col1, ma_col2 = st.sidebar.columns([3, 1])
+    ma_col1, ma_col2, ma_col3 = st.sidebar.columns([2, 2, 1])
     with ma_col1:
         ma_period = st.number_input("Period", min_value=1, value=20, key="ma_period")
     with ma_col2:
+        ma_kind = st.selectbox("Type", ["SMA", "EMA", "WMA"], key="ma_kind")
+    with ma_col3:
         if st.button("'+'", key="add_ma"):
             st.session_state.indicators['MA'].append({
                 'period': ma_period,
+                'kind': ma_kind,
                 'color': '#' + ''.join([random.choice('0123456789ABCDEF') for _ in range(6)])
             })
     
@@ -135,11 +191,11 @@ with st.sidebar:
     for i, ma in enumerate(st.session_state.indicators['MA']):
         ma_col1, ma_col2 = st.sidebar.columns([3, 1])
         with ma_col1:
-            st.markdown(f"MA({ma['period']})")
+            st.markdown(f"{ma.get('kind', 'SMA')}({ma['period']})")
         with ma_col2:
             if st.button("×", key=f"remove_ma_{i}"):
                 st.session_state.indicators['MA'].pop(i)
-                st.experimental_rerun()
+                st.rerun()
     
     # MACD settings
     st.sidebar.markdown("#### MACD")
@@ -166,7 +222,7 @@ with st.sidebar:
         with macd_col2:
             if st.button("×", key=f"remove_macd_{i}"):
                 st.session_state.indicators['MACD'].pop(i)
-                st.experimental_rerun()
+                st.rerun()
     
     # RSI settings
     st.sidebar.markdown("#### RSI")
@@ -188,7 +244,7 @@ with st.sidebar:
         with rsi_col2:
             if st.button("×", key=f"remove_rsi_{i}"):
                 st.session_state.indicators['RSI'].pop(i)
-                st.experimental_rerun()
+                st.rerun()
     
     # Ichimoku settings
     st.sidebar.markdown("#### Ichimoku")
@@ -215,38 +271,142 @@ with st.sidebar:
         with ichi_col2:
             if st.button("×", key=f"remove_ichi_{i}"):
                 st.session_state.indicators['Ichimoku'].pop(i)
-                st.experimental_rerun()
-    
-    # Auto-refresh settings
-    st.sidebar.markdown(f"### {texts['auto_refresh_label']}")
-    auto_refresh = st.sidebar.checkbox(texts["enable_auto_refresh_label"], value=False)
-    if auto_refresh:
-        refresh_interval = st.sidebar.number_input(
-            texts["refresh_interval_label"],
-            min_value=1,
-            value=5,
-            help=texts["refresh_interval_help"]
-        )
+                st.rerun()
     
     # Timezone selection moved to the end
     st.caption(texts["timezone"])
     timezone = st.selectbox("", ["UTC", "Asia/Tehran"], key="timezone_select", label_visibility="collapsed")
     if timezone != st.session_state.timezone:
         st.session_state.timezone = timezone
+    
+    debug_metrics = st.checkbox(texts["debug_metrics"], value=st.session_state.debug_metrics)
+    if debug_metrics != st.session_state.debug_metrics:
+        st.session_state.debug_metrics = debug_metrics
 
-# Fetch and display data
-df = fetch_candles(selected_coin_label, selected_timeframe)
-if df is not None:
-    plot_candlestick(
-        df=df,
-        indicators=st.session_state.indicators,
-        texts=texts,
-        language=st.session_state.language,
-        theme=st.session_state.theme,
-        show_grid=st.session_state.show_grid,
-        show_crosshair=st.session_state.show_crosshair,
-        symbol=selected_coin_label,
-        timeframe=selected_timeframe_label
-    )
+# Only the chart and market info rerun on refresh ticks; the sidebar keeps its last render
+if st.session_state.streaming:
+    refresh_every = STREAM_REFRESH_SECONDS
+elif st.session_state.auto_refresh:
+    refresh_every = st.session_state.refresh_interval
 else:
-    st.error(texts["error_no_data"])
\ No newline at end of file
+    refresh_every = None
+
+
+@st.fragment(run_every=refresh_every)
+def render_chart():
+    # A refresh tick is traced on its own; during a full run it is part of the script trace
+    with metrics.rerun("chart") as trace:
+        draw_chart()
+    remember_rerun(trace)
+
+
+def draw_chart():
+    # Fetch and display data
+    market_info = None
+    if st.session_state.streaming:
+        # REST is only used once to seed the ring buffer, then WebSocket pushes keep it current
+        stream = get_stream()
+        df = None
+        try:
+            buffer = stream.subscribe(
+                selected_coin_label,
+                load_history=lambda: get_data_hub().refresh(selected_coin_label, BASE_TIMEFRAME)
+            )
+        except Exception as e:
+            # Seeding is retried on the next rerun
+            st.error(f"Data Fetch Error: {e}")
+        else:
+            with metrics.span("app.data"):
+                df = resample_frame(buffer.to_frame(), selected_timeframe)
+        market_info = stream.market_info(selected_coin_label) or fetch_market_info(selected_coin_label)
+    else:
+        # Shared 1m series kept fresh by one background refresher per symbol, not per session;
+        # switching timeframes only resamples it locally. Market stats are fetched meanwhile.
+        # Refreshing faster than the hub's interval reloads the series at this session's pace
+        with metrics.span("app.data"):
+            df, market_info, errors = fetch_chart_data(
+                selected_coin_label,
+                selected_timeframe,
+                load_candles=lambda: get_data_hub().get(selected_coin_label, selected_timeframe, max_age=refresh_every)
+            )
+        if 'candles' in errors:
+            st.error(f"Data Fetch Error: {errors['candles']}")
+    if df is not None:
+        plot_candlestick(
+            df=df,
+            indicators=st.session_state.indicators,
+            texts=texts,
+            language=st.session_state.language,
+            theme=st.session_state.theme,
+            show_grid=st.session_state.show_grid,
+            show_crosshair=st.session_state.show_crosshair,
+            symbol=selected_coin_label,
+            timeframe=selected_timeframe_label,
+            market_info=market_info,
+            view_seconds=view_ranges[view_range],
+            webgl=st.session_state.webgl,
+            volume_profile=st.session_state.volume_profile,
+            # Streamed candles update shared incremental indicators instead of a batch recompute
+            live_indicators=(get_live_indicators(selected_coin_label, selected_timeframe)
+                             if st.session_state.streaming else None)
+        )
+    else:
+        # Partial result: show the stats that did arrive
+        render_market_info(market_info, texts)
+        st.error(texts["error_no_data"])
+
+
+chart_tab, backtest_tab, sweep_tab, screener_tab = st.tabs(
+    [texts["chart_tab"], texts["backtest_tab"], texts["sweep_tab"], texts["screener_tab"]]
+)
+with chart_tab:
+    render_chart()
+
+def load_analysis_candles():
+    """
+    Candles of the selected symbol and timeframe for a backtest or sweep run, or None after showing the error
+    Reuses what the chart reads, within the chart fetch's deadline
+    """
+    if st.session_state.streaming:
+        # The chart's ring buffer, so no REST polling once it is seeded
+        def load():
+            buffer = get_stream().subscribe(
+                selected_coin_label,
+                load_history=lambda: get_data_hub().refresh(selected_coin_label, BASE_TIMEFRAME)
+            )
+            return resample_frame(buffer.to_frame(), selected_timeframe)
+    else:
+        load = lambda: get_data_hub().get(selected_coin_label, selected_timeframe)
+    try:
+        df, _, errors = fetch_chart_data(selected_coin_label, selected_timeframe, load_candles=load)
+    except Exception as e:
+        st.error(f"Data Fetch Error: {e}")
+        return None
+    if 'candles' in errors:
+        st.error(f"Data Fetch Error: {errors['candles']}")
+        return None
+    if df is None or df.empty:
+        st.error(texts["error_no_data"])
+        return None
+    return df
+
+
+# Backtest and sweep load their candles only when run
+with backtest_tab:
+    render_backtest(load_analysis_candles, texts, selected_coin_label, selected_timeframe)
+with sweep_tab:
+    render_sweep(load_analysis_candles, texts, selected_timeframe)
+
+# Every USDT pair, fetched concurrently when a scan is requested
+with screener_tab:
+    render_screener(texts)
+
+# Watchlist of all listed coins from one all-tickers snapshot
+st.markdown(f"### {texts['watchlist']}")
+render_watchlist([f"{coin}-USDT" for coin in coins], texts)
+
+metrics.end_rerun(rerun_trace)
+remember_rerun(rerun_trace)
+if st.session_state.debug_metrics:
+    with st.sidebar:
+        render_debug_metrics(texts)
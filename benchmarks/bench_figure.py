@@ -0,0 +1,82 @@
+"""
+Benchmark plot_candlestick figure construction, patching and serialization in SVG and WebGL modes
+
+Run from the repository root:
+    python -m benchmarks.bench_figure --bars 1000 10000 100000
+"""
+import argparse
+import time
+import streamlit as st
+from src.config.texts import get_texts
+from src.ui import chart
+from src.ui.figure_model import FigureModel
+from benchmarks.bench_support_resistance import synthetic_candles
+
+INDICATORS = {
+    'MA': [
+        {'period': 20, 'color': '#ff0000', 'kind': 'SMA'},
+        {'period': 50, 'color': '#00ff00', 'kind': 'EMA'}
+    ],
+    'MACD': [{'fast': 12, 'slow': 26, 'signal': 9}],
+    'RSI': [{'period': 14, 'color': '#0000ff'}],
+    'Ichimoku': [{'tenkan': 9, 'kijun': 26, 'senkou': 52}]
+}
+
+
+def build_figure(df, webgl, max_points, figure_model=None):
+    """
+    Run plot_candlestick outside the Streamlit runtime and return the figure it would render
+    Without a figure_model every call builds a new figure
+    """
+    captured = {}
+    plotly_chart = st.plotly_chart
+    st.plotly_chart = lambda fig, **kwargs: captured.setdefault('fig', fig)
+    try:
+        chart.plot_candlestick(
+            df, INDICATORS, get_texts('English'), 'English', 'Dark',
+            show_grid=True, show_crosshair=True, symbol='BENCH-USDT', timeframe='1m',
+            market_info={'last': str(df['close'].iloc[-1]), 'changeRate': '0', 'volValue': '0', 'vol': '0'},
+            max_points=max_points, webgl=webgl, figure_model=figure_model or FigureModel()
+        )
+    finally:
+        st.plotly_chart = plotly_chart
+    return captured['fig']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--max-points', type=int, default=None,
+                        help="downsampling budget (default: no downsampling)")
+    args = parser.parse_args()
+
+    print(f"{'mode':<6} {'bars':>8} {'build (s)':>10} {'next bar (s)':>13} {'to_json (s)':>12} "
+          f"{'payload (MB)':>13} {'traces':>7} {'shapes':>7}")
+    for bars in args.bars:
+        df = synthetic_candles(bars)
+        max_points = args.max_points or bars
+        # Warm the indicator cache so both modes time rendering only
+        build_figure(df, False, max_points)
+        build_figure(df.iloc[:-1], False, max_points)
+        for mode, webgl in (('svg', False), ('webgl', True)):
+            build_time = patch_time = json_time = float('inf')
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                build_figure(df, webgl, max_points)
+                build_time = min(build_time, time.perf_counter() - start)
+                # Patch a figure built one candle earlier, as a rerun after a new bar does
+                figure_model = FigureModel()
+                build_figure(df.iloc[:-1], webgl, max_points, figure_model)
+                start = time.perf_counter()
+                fig = build_figure(df, webgl, max_points, figure_model)
+                patch_time = min(patch_time, time.perf_counter() - start)
+                start = time.perf_counter()
+                payload = fig.to_json()
+                json_time = min(json_time, time.perf_counter() - start)
+            print(f"{mode:<6} {bars:>8} {build_time:>10.4f} {patch_time:>13.4f} {json_time:>12.4f} "
+                  f"{len(payload) / 1e6:>13.2f} {len(fig.data):>7} {len(fig.layout.shapes):>7}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark vectorized support/resistance detection against the previous loop versions
+
+Run from the repository root:
+    python -m benchmarks.bench_support_resistance --bars 1000 5000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from src.indicators import technical
+from src.data import api
+
+
+def synthetic_candles(bars, seed=0):
+    """Random-walk OHLCV frame with one-minute candles"""
+    rng = np.random.default_rng(seed)
+    close = np.round(100 + np.cumsum(rng.normal(0, 1, bars)), 2)
+    high = close + np.round(rng.random(bars), 2)
+    low = close - np.round(rng.random(bars), 2)
+    return pd.DataFrame({
+        'timestamp': pd.date_range('2024-01-01', periods=bars, freq='min'),
+        'open': close,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': rng.random(bars) * 1000
+    })
+
+
+def legacy_technical_levels(df, window=20, threshold=0.02):
+    """Loop implementation previously in src.indicators.technical"""
+    levels = []
+    df['local_min'] = df['low'].rolling(window=window, center=True).min()
+    df['local_max'] = df['high'].rolling(window=window, center=True).max()
+    for i in range(window, len(df) - window):
+        if df['low'].iloc[i] == df['local_min'].iloc[i]:
+            price = df['low'].iloc[i]
+            if not any(abs(price - level[0]) / price < threshold for level in levels):
+                touches = sum(1 for j in range(i-window, i+window+1)
+                              if abs(df['low'].iloc[j] - price) / price < threshold)
+                levels.append((price, 'support', touches))
+    for i in range(window, len(df) - window):
+        if df['high'].iloc[i] == df['local_max'].iloc[i]:
+            price = df['high'].iloc[i]
+            if not any(abs(price - level[0]) / price < threshold for level in levels):
+                touches = sum(1 for j in range(i-window, i+window+1)
+                              if abs(df['high'].iloc[j] - price) / price < threshold)
+                levels.append((price, 'resistance', touches))
+    support_levels = sorted([level for level in levels if level[1] == 'support'],
+                            key=lambda x: x[2], reverse=True)[:5]
+    resistance_levels = sorted([level for level in levels if level[1] == 'resistance'],
+                               key=lambda x: x[2], reverse=True)[:5]
+    return support_levels, resistance_levels
+
+
+def legacy_api_levels(df, window=20, price_threshold=0.02, strength_threshold=2):
+    """Loop implementation previously in src.data.api"""
+    support_levels = []
+    resistance_levels = []
+    for i in range(window, len(df) - window):
+        current_price = df.iloc[i]["close"]
+        is_support = all(current_price <= df.iloc[i-j]["low"] for j in range(1, window)) and \
+            all(current_price <= df.iloc[i+j]["low"] for j in range(1, window))
+        is_resistance = all(current_price >= df.iloc[i-j]["high"] for j in range(1, window)) and \
+            all(current_price >= df.iloc[i+j]["high"] for j in range(1, window))
+        if is_support or is_resistance:
+            touches = 0
+            for j in range(i+1, len(df)):
+                price_range = current_price * price_threshold
+                if df.iloc[j]["low"] >= current_price - price_range and \
+                   df.iloc[j]["high"] <= current_price + price_range:
+                    touches += 1
+            if touches >= strength_threshold:
+                level = (current_price, i, touches)
+                if is_support:
+                    support_levels.append(level)
+                else:
+                    resistance_levels.append(level)
+    return support_levels, resistance_levels
+
+
+def timed(func, *args, repeat=3):
+    """Best wall time of `repeat` runs and the last result"""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, nargs='+', default=[1000, 5000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cases = [
+        ('technical', legacy_technical_levels, technical.find_support_resistance),
+        ('data.api', legacy_api_levels, api.find_support_resistance)
+    ]
+    print(f"{'variant':<10} {'bars':>8} {'legacy (s)':>12} {'vectorized (s)':>15} {'speedup':>9}  same")
+    for bars in args.bars:
+        df = synthetic_candles(bars)
+        for name, legacy, vectorized in cases:
+            legacy_time, expected = timed(legacy, df.copy(), repeat=args.repeat)
+            new_time, result = timed(vectorized, df.copy(), repeat=args.repeat)
+            print(f"{name:<10} {bars:>8} {legacy_time:>12.4f} {new_time:>15.4f} "
+                  f"{legacy_time / new_time:>8.0f}x  {result == expected}")
+
+
+if __name__ == '__main__':
+    main()
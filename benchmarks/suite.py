@@ -0,0 +1,225 @@
+"""
+Offline benchmark suite for candle parsing, indicators, support/resistance and figure build
+
+Every case runs on synthetic candles, so no network access is needed. Results are
+written as JSON per commit and can be compared to spot regressions.
+
+Run from the repository root:
+    python -m benchmarks.suite --bars 1000 10000 100000 1000000
+    python -m benchmarks.suite --only rsi macd --bars 100000
+    python -m benchmarks.suite --compare benchmarks/results/OLD.json benchmarks/results/NEW.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import numpy as np
+import pandas as pd
+from src.api.kucoin import parse_candles
+from src.backtest.engine import run_backtest
+from src.data import api
+from src.data.candles import Candles
+from src.data.resample import resample
+from src.indicators import technical
+from src.indicators.cache import get_indicator_cache
+from src.indicators.incremental import LiveIndicators
+from src.indicators.planner import evaluate_indicator
+from src.indicators.volume_profile import cached_profile
+from src.ui.downsample import DEFAULT_MAX_POINTS
+from benchmarks.bench_figure import build_figure
+from benchmarks.bench_support_resistance import synthetic_candles
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+DEFAULT_BARS = [1000, 10000, 100000, 1000000]
+# Keep running a case until it has taken this long or reached max repeats
+MIN_SECONDS = 0.2
+# A case slower than the baseline by more than this factor is reported as a regression
+REGRESSION_RATIO = 1.2
+
+
+def kucoin_body(df):
+    """Serialize candles the way /api/v1/market/candles returns them: strings, newest first"""
+    rows = np.column_stack([
+        df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64),
+        df['open'], df['close'], df['high'], df['low'], df['volume'], df['volume'] * df['close']
+    ])[::-1]
+    return json.dumps({'code': '200000', 'data': [[repr(value) for value in row] for row in rows.tolist()]})
+
+
+def figure(df):
+    """Cold figure build: fresh figure model and an empty indicator cache"""
+    get_indicator_cache().clear()
+    return build_figure(df, False, DEFAULT_MAX_POINTS)
+
+
+def revised_last_bar(df):
+    """df with the forming candle's close and volume revised like a streamed update"""
+    df = df.copy()
+    last = df.index[-1]
+    df.loc[last, 'close'] = (df.loc[last, 'high'] + df.loc[last, 'low']) / 2
+    df.loc[last, 'volume'] *= 1.5
+    return df
+
+
+def profile_tick(df):
+    """Profile df once; returns df with the forming candle revised"""
+    cached_profile(df, ('benchmark', len(df)))
+    return revised_last_bar(df)
+
+
+# Indicators recomputed per streamed tick, incrementally and in batch
+TICK_INDICATORS = [
+    ('MA', {'period': 20, 'min_periods': 20}),
+    ('MACD', {'fast': 12, 'slow': 26, 'signal': 9}),
+    ('RSI', {'period': 14}),
+    ('Ichimoku', {'tenkan': 9, 'kijun': 26, 'senkou': 52})
+]
+
+
+def live_tick(df):
+    """Seed live indicators on df; returns (live indicators, df with the forming candle revised)"""
+    live = LiveIndicators()
+    for name, params in TICK_INDICATORS:
+        live.evaluate(df, name, **params)
+    return live, revised_last_bar(df)
+
+
+BACKTEST_RULES = [
+    {'rule': 'ma_cross', 'fast': 20, 'slow': 50},
+    {'rule': 'macd'},
+    {'rule': 'rsi'},
+    {'rule': 'ichimoku'}
+]
+
+
+# name: (prepare(df) -> argument, run(argument))
+CASES = {
+    'parse_kucoin_json': (kucoin_body, lambda body: parse_candles(json.loads(body)['data']).to_frame()),
+    'ma': (None, lambda df: technical.calculate_ma(df, 20)),
+    'ma_batch_sma': (None, lambda df: technical.calculate_ma_batch(df, (5, 10, 20, 50, 100, 200))),
+    'ma_batch_ema': (None, lambda df: technical.calculate_ma_batch(df, (5, 10, 20, 50, 100, 200), kind='ema')),
+    'ma_batch_wma': (None, lambda df: technical.calculate_ma_batch(df, (5, 10, 20, 50, 100, 200), kind='wma')),
+    'macd': (None, technical.calculate_macd),
+    'rsi': (None, technical.calculate_rsi),
+    'ichimoku': (None, technical.calculate_ichimoku),
+    'volume_profile': (None, technical.calculate_volume_profile),
+    'volume_profile_update': (profile_tick, lambda df: cached_profile(df, ('benchmark', len(df)))),
+    'indicators_tick_incremental': (
+        live_tick,
+        lambda prepared: [prepared[0].evaluate(prepared[1], name, **params) for name, params in TICK_INDICATORS]
+    ),
+    'indicators_tick_batch': (
+        revised_last_bar,
+        lambda df: [evaluate_indicator(df, name, **params) for name, params in TICK_INDICATORS]
+    ),
+    'support_resistance_technical': (None, technical.find_support_resistance),
+    'support_resistance_data_api': (None, api.find_support_resistance),
+    'resample_1m_to_all': (
+        lambda df: Candles(df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64),
+                           *(df[name].to_numpy() for name in ('open', 'high', 'low', 'close', 'volume'))),
+        lambda candles: [resample(candles, timeframe) for timeframe in ('5m', '15m', '30m', '1h', '4h', '1d', '1w')]
+    ),
+    'figure_build': (None, figure),
+    'backtest_all_rules': (None, lambda df: run_backtest(df, BACKTEST_RULES, allow_short=True, timeframe='1m'))
+}
+
+
+def measure(run, argument, max_repeat):
+    """Wall times of repeated runs, at least one and at most max_repeat"""
+    times = []
+    started = time.perf_counter()
+    while len(times) < max_repeat and (not times or time.perf_counter() - started < MIN_SECONDS):
+        start = time.perf_counter()
+        run(argument)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short=10", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def run_suite(bars_list, names, max_repeat):
+    results = {}
+    print(f"{'case':<30} {'bars':>9} {'best (s)':>10} {'median (s)':>11} {'runs':>5}")
+    for bars in bars_list:
+        df = synthetic_candles(bars)
+        for name in names:
+            prepare, run = CASES[name]
+            argument = prepare(df) if prepare else df
+            times = measure(run, argument, max_repeat)
+            results.setdefault(name, {})[str(bars)] = {
+                'best': min(times),
+                'median': statistics.median(times),
+                'runs': len(times)
+            }
+            print(f"{name:<30} {bars:>9} {min(times):>10.5f} {statistics.median(times):>11.5f} {len(times):>5}")
+    return {
+        'commit': git_commit(),
+        'created': time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'machine': platform.machine(),
+        'results': results
+    }
+
+
+def compare(baseline_path, current_path, threshold=REGRESSION_RATIO):
+    """Print best-time ratios of current over baseline; returns the number of regressions"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    with open(current_path) as f:
+        current = json.load(f)
+    print(f"baseline {baseline['commit']}  current {current['commit']}")
+    print(f"{'case':<30} {'bars':>9} {'baseline (s)':>13} {'current (s)':>12} {'ratio':>7}")
+    regressions = 0
+    for name, by_bars in current['results'].items():
+        for bars, result in by_bars.items():
+            old = baseline['results'].get(name, {}).get(bars)
+            if old is None:
+                continue
+            ratio = result['best'] / old['best']
+            flag = ""
+            if ratio > threshold:
+                flag = "  slower"
+                regressions += 1
+            print(f"{name:<30} {bars:>9} {old['best']:>13.5f} {result['best']:>12.5f} {ratio:>6.2f}x{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--bars', type=int, nargs='+', default=DEFAULT_BARS)
+    parser.add_argument('--only', nargs='+', choices=sorted(CASES), help="cases to run (default: all)")
+    parser.add_argument('--repeat', type=int, default=5, help="maximum runs per case")
+    parser.add_argument('--output', help="results file (default: benchmarks/results/<commit>.json)")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="compare two results files instead of running")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO)
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, threshold=args.threshold) else 0)
+
+    # Streamlit warns on every call made outside its runtime
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    report = run_suite(args.bars, args.only or list(CASES), args.repeat)
+    output = args.output or os.path.join(RESULTS_DIR, f"{report['commit']}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == '__main__':
+    main()
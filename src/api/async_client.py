@@ -0,0 +1,51 @@
+"""
+Asyncio counterpart of src.api.client for fan-out over many symbols
+
+Requests share the thread client's base URL, retry policy and per-IP rate
+limiter, so async scans and the rest of the app draw from one quota.
+"""
+import asyncio
+import aiohttp
+from src.api import client
+from src.utils.metrics import increment, span
+
+# Concurrent requests in flight per scan
+DEFAULT_CONCURRENCY = 32
+
+
+def create_session(concurrency=DEFAULT_CONCURRENCY):
+    """Keep-alive session with the thread client's timeouts; must be created inside the event loop"""
+    connect, read = client.TIMEOUT
+    return aiohttp.ClientSession(
+        timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+        connector=aiohttp.TCPConnector(limit=concurrency)
+    )
+
+
+async def get(session, path, params=None, retries=client.MAX_RETRIES):
+    """
+    GET a KuCoin public endpoint and return the decoded JSON body
+    Retries connection errors, timeouts, 429 and 5xx responses like client.request
+    """
+    url = client.BASE_URL + path
+    weight = client.ENDPOINT_WEIGHTS.get(path, 1)
+    params = {key: str(value) for key, value in (params or {}).items()}
+    for attempt in range(retries + 1):
+        if attempt:
+            increment("kucoin.http_retries")
+        await asyncio.sleep(client.rate_limiter.reserve(weight))
+        delay = client.backoff_delay(attempt)
+        increment("kucoin.http_requests")
+        try:
+            with span(f"kucoin.async_http {path}"):
+                async with session.get(url, params=params) as response:
+                    if response.status not in client.RETRY_STATUS or attempt == retries:
+                        response.raise_for_status()
+                        return await response.json(content_type=None)
+                    retry_after = response.headers.get("Retry-After")
+                    if retry_after and retry_after.isdigit():
+                        delay = max(delay, int(retry_after))
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(delay)
@@ -0,0 +1,125 @@
+import os
+import random
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from src.utils.metrics import increment, span
+
+# Point at a stand-in server (e.g. tools/mock_kucoin.py) with KUCOIN_BASE_URL
+BASE_URL = os.environ.get("KUCOIN_BASE_URL", "https://api.kucoin.com").rstrip("/")
+
+# (connect, read) timeouts in seconds
+TIMEOUT = (3.05, 10)
+MAX_RETRIES = 3
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 8
+RETRY_STATUS = {429, 500, 502, 503, 504}
+POOL_SIZE = 16
+
+# KuCoin public pool: 2000 weight per 30 seconds per IP
+PUBLIC_QUOTA = 2000
+PUBLIC_QUOTA_WINDOW = 30
+ENDPOINT_WEIGHTS = {
+    "/api/v1/market/candles": 3,
+    "/api/v1/market/stats": 15,
+    "/api/v1/market/allTickers": 15,
+    "/api/v1/bullet-public": 10
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket rate limiter"""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens=1):
+        """Block until `tokens` are available, then consume them"""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def reserve(self, tokens=1):
+        """Consume `tokens` without blocking; returns the seconds to wait before using them"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # A negative balance makes later callers wait until it is paid back
+            self._tokens -= tokens
+            return max(0.0, -self._tokens / self.rate)
+
+
+rate_limiter = TokenBucket(rate=PUBLIC_QUOTA / PUBLIC_QUOTA_WINDOW, capacity=PUBLIC_QUOTA)
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Return the shared keep-alive session"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+        return _session
+
+
+def backoff_delay(attempt):
+    """Full-jitter exponential backoff delay for a retry attempt"""
+    return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+
+def request(method, path, params=None, timeout=TIMEOUT, retries=MAX_RETRIES):
+    """
+    Call a KuCoin public endpoint and return the decoded JSON body
+    Retries connection errors, timeouts, 429 and 5xx responses
+    """
+    url = BASE_URL + path
+    weight = ENDPOINT_WEIGHTS.get(path, 1)
+    for attempt in range(retries + 1):
+        if attempt:
+            increment("kucoin.http_retries")
+        with span("kucoin.rate_limit_wait"):
+            rate_limiter.acquire(weight)
+        delay = backoff_delay(attempt)
+        increment("kucoin.http_requests")
+        try:
+            with span(f"kucoin.http {path}"):
+                response = get_session().request(method, url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+        else:
+            if response.status_code not in RETRY_STATUS or attempt == retries:
+                response.raise_for_status()
+                return response.json()
+            retry_after = response.headers.get("Retry-After")
+            if retry_after and retry_after.isdigit():
+                delay = max(delay, int(retry_after))
+        time.sleep(delay)
+
+
+def get(path, params=None, **kwargs):
+    """GET a KuCoin public endpoint"""
+    return request("GET", path, params=params, **kwargs)
+
+
+def post(path, params=None, **kwargs):
+    """POST to a KuCoin public endpoint"""
+    return request("POST", path, params=params, **kwargs)
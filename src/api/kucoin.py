@@ -1,61 +1,227 @@
+import contextvars
+import threading
 import requests
 import pandas as pd
 import time
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from src.api import client
+from src.data.candles import Candles
+from src.data.store import get_candle_store
+from src.utils.metrics import increment, span
 
-@st.cache_data(ttl=60)
-def fetch_candles(symbol, timeframe):
-    """Fetch candlestick data from KuCoin API"""
-    # Convert timeframe to KuCoin format
-    timeframe_map = {
-        "1m": "1min",
-        "5m": "5min",
-        "15m": "15min",
-        "30m": "30min",
-        "1h": "1hour",
-        "4h": "4hour",
-        "1d": "1day",
-        "1w": "1week"
-    }
-    
-    url = "https://api.kucoin.com/api/v1/market/candles"
+# Convert timeframe to KuCoin format
+TIMEFRAME_MAP = {
+    "1m": "1min",
+    "5m": "5min",
+    "15m": "15min",
+    "30m": "30min",
+    "1h": "1hour",
+    "4h": "4hour",
+    "1d": "1day",
+    "1w": "1week"
+}
+
+TIMEFRAME_SECONDS = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "1h": 3600,
+    "4h": 14400,
+    "1d": 86400,
+    "1w": 604800
+}
+
+HISTORY_SECONDS = 60*24*3600
+
+# Market stats kept from the all-tickers snapshot
+TICKER_COLUMNS = ['last', 'changeRate', 'volValue', 'vol', 'high', 'low']
+
+# KuCoin returns at most this many candles per request
+MAX_CANDLES_PER_REQUEST = 1500
+BACKFILL_WORKERS = 8
+
+# Limits of a combined chart fetch: seconds to wait for candles and for stats, (connect, read) and
+# retries of each stats request
+CANDLES_TIMEOUT = 15
+MARKET_INFO_DEADLINE = 5
+MARKET_INFO_TIMEOUT = (3.05, 5)
+MARKET_INFO_RETRIES = 0
+CHART_FETCH_WORKERS = 8
+
+def parse_candles(rows):
+    """Parse KuCoin candle rows into a time-sorted Candles container"""
+    with span("kucoin.parse"):
+        return Candles.from_kucoin(rows)
+
+def request_candles(symbol, timeframe, start, end):
+    """Request raw candle rows for [start, end] from KuCoin API"""
     params = {
-        'type': timeframe_map.get(timeframe, timeframe),
+        'type': TIMEFRAME_MAP.get(timeframe, timeframe),
         'symbol': symbol,
-        'startAt': int(time.time()) - 60*24*3600,
-        'endAt': int(time.time())
+        'startAt': int(start),
+        'endAt': int(end)
     }
+    data = client.get("/api/v1/market/candles", params=params)
+    if data['code'] != '200000':
+        raise requests.RequestException(f"API Error: {data['msg']}")
+    return data['data']
+
+def split_range(start, end, timeframe, page_size=MAX_CANDLES_PER_REQUEST):
+    """Split [start, end] into (startAt, endAt) pages of at most page_size candles"""
+    # Both ends are inclusive, so an aligned page of page_size candles spans page_size - 1 steps
+    step = TIMEFRAME_SECONDS[timeframe] * max(page_size - 1, 1)
+    pages = []
+    page_start = int(start)
+    while page_start < end:
+        page_end = min(page_start + step, int(end))
+        pages.append((page_start, page_end))
+        page_start = page_end
+    return pages
+
+def backfill_candles(symbol, timeframe, start, end, max_workers=BACKFILL_WORKERS):
+    """
+    Fetch [start, end] in cap-sized pages on a bounded thread pool
+    Returns: Candles sorted by time, de-duplicated on timestamp
+    """
+    pages = split_range(start, end, timeframe)
+    if not pages:
+        return Candles.empty()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pages))) as executor:
+        # Each page runs in a copy of the caller's context so its spans land in the caller's rerun trace
+        futures = [executor.submit(contextvars.copy_context().run,
+                                   lambda page=page: parse_candles(request_candles(symbol, timeframe, *page)))
+                   for page in pages]
+        # Adjacent pages share their boundary candle
+        return Candles.concat([future.result() for future in futures])
+
+def sync_candle_series(symbol, timeframe, since=None):
+    """
+    Top up the local store from KuCoin API and return stored candles from `since` onwards
+    Without since, returns the whole stored history window as Candles
+    Raises requests.RequestException if the top-up fails
+    """
+    store = get_candle_store()
+    now = int(time.time())
+    window_start = now - HISTORY_SECONDS
+
+    # Only ask for candles from the last stored one onwards (it may still be forming)
+    last_timestamp = store.last_timestamp(symbol, timeframe)
+    start = window_start if last_timestamp is None else max(last_timestamp, window_start)
+    with span("kucoin.backfill"):
+        candles = backfill_candles(symbol, timeframe, start, now)
+    with span("store.upsert"):
+        store.upsert(symbol, timeframe, candles)
+    with span("store.load"):
+        return store.load_candles(symbol, timeframe, start=window_start if since is None else since)
+
+def sync_candles(symbol, timeframe):
+    """
+    Top up the local store from KuCoin API and return the stored history window
+    Raises requests.RequestException if the top-up fails
+    """
+    return sync_candle_series(symbol, timeframe).to_frame()
+
+@st.cache_data(ttl=60)
+def fetch_candles(symbol, timeframe):
+    """Fetch candlestick data, topping up the local store from KuCoin API"""
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
-        if data['code'] == '200000':
-            df = pd.DataFrame(data['data'], columns=['timestamp', 'open', 'close', 'high', 'low', 'volume', 'amount'])
-            df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
-            df['open'] = pd.to_numeric(df['open'], errors='coerce')
-            df['close'] = pd.to_numeric(df['close'], errors='coerce')
-            df['high'] = pd.to_numeric(df['high'], errors='coerce')
-            df['low'] = pd.to_numeric(df['low'], errors='coerce')
-            df['volume'] = pd.to_numeric(df['volume'], errors='coerce')
-            return df[['timestamp', 'open', 'high', 'low', 'close', 'volume']]
-        else:
-            st.error(f"API Error: {data['msg']}")
-            return pd.DataFrame()
+        return sync_candles(symbol, timeframe)
     except requests.RequestException as e:
         st.error(f"Data Fetch Error: {e}")
-        return pd.DataFrame()
+        return get_candle_store().load(symbol, timeframe, start=int(time.time()) - HISTORY_SECONDS)
 
-@st.cache_data(ttl=60)
-def fetch_market_info(symbol):
-    """Fetch market statistics from KuCoin API"""
-    url = "https://api.kucoin.com/api/v1/market/stats"
+# No spinner: also called from chart fetch workers, which have no script to draw it in
+@st.cache_resource(ttl=60, show_spinner=False)
+def _fetch_all_tickers(_timeout=client.TIMEOUT, _retries=client.MAX_RETRIES):
+    """Fetch the all-tickers snapshot; raises on failure so that no failed result is cached"""
+    # Only runs when the shared snapshot expired; the limits are not part of the cache key
+    increment("all_tickers.fetch")
+    data = client.get("/api/v1/market/allTickers", timeout=_timeout, retries=_retries)
+    if data['code'] != '200000':
+        raise ValueError(f"API Error: {data.get('msg')}")
+    tickers = pd.DataFrame(data['data']['ticker']).set_index('symbol')
+    return tickers[TICKER_COLUMNS].apply(pd.to_numeric, errors='coerce')
+
+def fetch_all_tickers(timeout=client.TIMEOUT, retries=client.MAX_RETRIES):
+    """
+    Fetch one snapshot of every KuCoin ticker, shared by all sessions
+    Returns: DataFrame indexed by symbol with float TICKER_COLUMNS, or None; do not mutate
+    A failed fetch is retried by the next caller instead of being served from the cache
+    """
+    try:
+        return _fetch_all_tickers(timeout, retries)
+    except (requests.RequestException, KeyError, ValueError):
+        increment("all_tickers.errors")
+        return None
+
+def request_market_info(symbol, timeout=MARKET_INFO_TIMEOUT, retries=MARKET_INFO_RETRIES):
+    """Request 24h market statistics for one symbol; returns None when unavailable"""
     params = {'symbol': symbol}
     try:
-        response = requests.get(url, params=params)
-        response.raise_for_status()
-        data = response.json()
+        data = client.get("/api/v1/market/stats", params=params, timeout=timeout, retries=retries)
         if data['code'] == '200000':
             return data['data']
         return None
     except:
-        return None 
\ No newline at end of file
+        return None
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_market_info(symbol):
+    """
+    Fetch market statistics, from the all-tickers snapshot when the symbol is in it
+    Both requests use the bounded MARKET_INFO_TIMEOUT and MARKET_INFO_RETRIES
+    """
+    increment("market_info.fetch")
+    tickers = fetch_all_tickers(MARKET_INFO_TIMEOUT, MARKET_INFO_RETRIES)
+    if tickers is not None and symbol in tickers.index:
+        return tickers.loc[symbol].to_dict()
+    return request_market_info(symbol)
+
+_chart_fetch_executor = None
+_chart_fetch_lock = threading.Lock()
+
+def get_chart_fetch_executor():
+    """Return the thread pool that loads chart candles alongside market stats"""
+    global _chart_fetch_executor
+    with _chart_fetch_lock:
+        if _chart_fetch_executor is None:
+            _chart_fetch_executor = ThreadPoolExecutor(max_workers=CHART_FETCH_WORKERS,
+                                                       thread_name_prefix="chart-fetch")
+        return _chart_fetch_executor
+
+def fetch_chart_data(symbol, timeframe, load_candles=None, candles_timeout=CANDLES_TIMEOUT,
+                     market_info_timeout=MARKET_INFO_DEADLINE):
+    """
+    Load a render's candles and market stats concurrently instead of one after the other
+    load_candles: callable returning the candle frame, run on a worker thread (default: sync_candles)
+    Waits at most candles_timeout for the candles and market_info_timeout for the stats
+    Returns: (candles or None, market_info or None, {'candles' or 'market_info': error message})
+    """
+    if load_candles is None:
+        load_candles = lambda: sync_candles(symbol, timeframe)
+    errors = {}
+    started = time.monotonic()
+    executor = get_chart_fetch_executor()
+    # The workers keep this rerun's metrics context, so their spans land in the same trace
+    future = executor.submit(contextvars.copy_context().run, load_candles)
+    market_future = executor.submit(contextvars.copy_context().run, fetch_market_info, symbol)
+    try:
+        market_info = market_future.result(timeout=market_info_timeout)
+    except TimeoutError:
+        # Like the candles, a late result still fills the shared cache for a later render
+        market_info = None
+    if market_info is None:
+        errors['market_info'] = f"No market stats for {symbol}"
+    try:
+        # Both deadlines count from the submit, not one after the other
+        candles = future.result(timeout=max(candles_timeout - (time.monotonic() - started), 0))
+    except TimeoutError:
+        # The load carries on in the background and is picked up by a later render
+        candles = None
+        errors['candles'] = f"No candles for {symbol} within {candles_timeout}s"
+    except requests.RequestException as e:
+        candles = None
+        errors['candles'] = str(e)
+    return candles, market_info, errors 
\ No newline at end of file
@@ -0,0 +1,188 @@
+import json
+import threading
+import uuid
+import websocket
+from src.api import client
+from src.api.kucoin import TIMEFRAME_MAP, parse_candles
+from src.data.buffer import CandleRingBuffer
+from src.data.hub import SingleFlight
+from src.data.resample import BASE_TIMEFRAME
+
+DEFAULT_CAPACITY = 100000
+RECONNECT_DELAY = 5
+DEFAULT_PING_INTERVAL = 18
+
+
+def candle_topic(symbol, timeframe):
+    return f"/market/candles:{symbol}_{TIMEFRAME_MAP.get(timeframe, timeframe)}"
+
+
+def snapshot_topic(symbol):
+    return f"/market/snapshot:{symbol}"
+
+
+def snapshot_to_market_info(snapshot):
+    """Map a snapshot push to the fields returned by /api/v1/market/stats"""
+    return {
+        'symbol': snapshot.get('symbol'),
+        'last': snapshot.get('lastTradedPrice'),
+        'changeRate': snapshot.get('changeRate'),
+        'volValue': snapshot.get('volValue'),
+        'vol': snapshot.get('vol'),
+        'high': snapshot.get('high'),
+        'low': snapshot.get('low')
+    }
+
+
+class KuCoinStream:
+    """
+    Background WebSocket subscriber that keeps one ring buffer of 1m candles
+    and the latest market snapshot per symbol; other timeframes are resampled locally
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, endpoint=None):
+        # A fixed endpoint skips the bullet-public token request (e.g. a local stand-in server)
+        self.capacity = capacity
+        self.endpoint = endpoint
+        self._buffers = {}
+        self._market_info = {}
+        self._topics = set()
+        self._seeding = SingleFlight()
+        self._lock = threading.Lock()
+        self._ws = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def subscribe(self, symbol, load_history=None):
+        """
+        Return the 1m ring buffer for symbol, subscribing on first use
+        load_history: optional callable returning a 1m candle frame to seed the buffer
+        Concurrent first callers share one seed; the buffer is only registered once it
+        succeeded, so a failed seed raises to every waiting caller and is retried next time
+        """
+        buffer = self._buffers.get(symbol)
+        if buffer is not None:
+            return buffer
+        return self._seeding.do(symbol, lambda: self._register(symbol, load_history))
+
+    def _register(self, symbol, load_history):
+        with self._lock:
+            buffer = self._buffers.get(symbol)
+        if buffer is not None:
+            # Registered by a seed that finished while this caller was queued
+            return buffer
+        buffer = CandleRingBuffer(self.capacity)
+        if load_history is not None:
+            history = load_history()
+            if history is not None and len(history):
+                buffer.extend_frame(history)
+
+        # Ticks are only merged once the buffer is registered, after the history
+        with self._lock:
+            self._buffers[symbol] = buffer
+            topics = [candle_topic(symbol, BASE_TIMEFRAME), snapshot_topic(symbol)]
+            new_topics = [topic for topic in topics if topic not in self._topics]
+            self._topics.update(new_topics)
+
+        for topic in new_topics:
+            self._send_subscribe(topic)
+        self.start()
+        return buffer
+
+    def market_info(self, symbol):
+        """Latest streamed market stats for symbol, or None before the first push"""
+        return self._market_info.get(symbol)
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="kucoin-stream", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+
+    def _connect_info(self):
+        """Return (url, ping interval in seconds)"""
+        if self.endpoint:
+            return self.endpoint, DEFAULT_PING_INTERVAL
+        data = client.post("/api/v1/bullet-public")['data']
+        server = data['instanceServers'][0]
+        url = f"{server['endpoint']}?token={data['token']}&connectId={uuid.uuid4().hex}"
+        return url, server['pingInterval'] / 1000
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                url, ping_interval = self._connect_info()
+                ws = websocket.WebSocketApp(url, on_open=self._on_open, on_message=self._on_message)
+                self._ws = ws
+                pinger = threading.Thread(target=self._ping_loop, args=(ws, ping_interval), daemon=True)
+                pinger.start()
+                ws.run_forever()
+            except Exception as e:
+                print(f"Stream error: {e}")
+            self._ws = None
+            self._stop.wait(RECONNECT_DELAY)
+
+    def _ping_loop(self, ws, interval):
+        # KuCoin drops connections that do not send an application-level ping
+        while self._ws is ws and not self._stop.wait(interval):
+            try:
+                ws.send(json.dumps({'id': uuid.uuid4().hex, 'type': 'ping'}))
+            except websocket.WebSocketException:
+                return
+
+    def _send_subscribe(self, topic, ws=None):
+        ws = ws or self._ws
+        if ws is None or ws.sock is None or not ws.sock.connected:
+            # Subscribed on (re)connect by _on_open
+            return
+        try:
+            ws.send(json.dumps({
+                'id': uuid.uuid4().hex,
+                'type': 'subscribe',
+                'topic': topic,
+                'response': True
+            }))
+        except websocket.WebSocketException:
+            pass
+
+    def _on_open(self, ws):
+        with self._lock:
+            topics = list(self._topics)
+        for topic in topics:
+            self._send_subscribe(topic, ws)
+
+    def _on_message(self, ws, message):
+        msg = json.loads(message)
+        if msg.get('type') != 'message':
+            return
+        topic = msg.get('topic', '')
+        data = msg.get('data', {})
+        if topic.startswith("/market/candles:"):
+            symbol, timeframe_type = topic.split(":", 1)[1].rsplit("_", 1)
+            buffer = self._buffers.get(symbol)
+            if buffer is not None and timeframe_type == TIMEFRAME_MAP[BASE_TIMEFRAME]:
+                buffer.update(next(parse_candles([data['candles']]).rows()))
+        elif topic.startswith("/market/snapshot:"):
+            snapshot = data.get('data', data)
+            self._market_info[snapshot.get('symbol')] = snapshot_to_market_info(snapshot)
+
+
+_stream = None
+_stream_lock = threading.Lock()
+
+
+def get_stream():
+    """Return the process-wide KuCoin stream"""
+    global _stream
+    with _stream_lock:
+        if _stream is None:
+            _stream = KuCoinStream()
+        return _stream
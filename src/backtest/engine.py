@@ -0,0 +1,182 @@
+"""
+Vectorized backtester for indicator rules
+
+Each rule turns candles into a target position per bar (+1 long, -1 short, 0 flat)
+using the indicator functions in src.indicators.technical. Rules are combined by
+consensus, positions take effect on the bar after the signal, and returns, equity,
+drawdown and the trade list are computed with array operations only.
+"""
+from dataclasses import dataclass
+import numpy as np
+import pandas as pd
+from src.api.kucoin import TIMEFRAME_SECONDS
+from src.indicators.technical import INDICATORS, cached_indicator
+
+# Fee per unit of position change, e.g. 0.001 = 0.1% per side
+DEFAULT_FEE = 0.001
+YEAR_SECONDS = 365 * 24 * 3600
+
+
+def _hold(events):
+    """Forward-fill a float array of events (NaN = no event), starting flat"""
+    index = np.where(np.isnan(events), 0, np.arange(len(events)))
+    np.maximum.accumulate(index, out=index)
+    held = events[index]
+    return np.nan_to_num(held, nan=0.0)
+
+
+def _above_below(a, b):
+    """+1 where a > b, -1 where a < b, 0 where equal or undefined"""
+    with np.errstate(invalid='ignore'):
+        return np.sign(np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64))
+
+
+def _indicator(df, name, symbol, timeframe, **params):
+    """Compute an indicator, through the shared indicator cache when the candles are identified"""
+    if symbol is None:
+        return INDICATORS[name](df, **params)
+    return cached_indicator(df, name, symbol, timeframe, **params)
+
+
+def ma_cross_signal(df, fast=20, slow=50, kind='sma', symbol=None, timeframe=None):
+    """Long while the fast moving average is above the slow one, short while below"""
+    # One cache entry per period, so sweeps over fast x slow reuse each average
+    fast_ma, = _indicator(df, 'MABatch', symbol, timeframe, periods=(fast,), kind=kind)
+    slow_ma, = _indicator(df, 'MABatch', symbol, timeframe, periods=(slow,), kind=kind)
+    return np.nan_to_num(_above_below(fast_ma, slow_ma))
+
+
+def rsi_signal(df, period=14, lower=30, upper=70, symbol=None, timeframe=None):
+    """Mean reversion: go long when RSI drops below lower, short above upper, hold in between"""
+    rsi = _indicator(df, 'RSI', symbol, timeframe, period=period).to_numpy(dtype=np.float64)
+    events = np.full(len(rsi), np.nan)
+    events[rsi < lower] = 1.0
+    events[rsi > upper] = -1.0
+    return _hold(events)
+
+
+def macd_signal(df, fast=12, slow=26, signal=9, symbol=None, timeframe=None):
+    """Long while MACD is above its signal line, short while below"""
+    macd, signal_line, _ = _indicator(df, 'MACD', symbol, timeframe, fast=fast, slow=slow, signal=signal)
+    return np.nan_to_num(_above_below(macd.to_numpy(), signal_line.to_numpy()))
+
+
+def ichimoku_signal(df, tenkan=9, kijun=26, senkou=52, symbol=None, timeframe=None):
+    """Long above the cloud, short below it, hold the last side while inside"""
+    _, _, senkou_a, senkou_b, _ = _indicator(df, 'Ichimoku', symbol, timeframe,
+                                             tenkan=tenkan, kijun=kijun, senkou=senkou)
+    a = senkou_a.to_numpy(dtype=np.float64)
+    b = senkou_b.to_numpy(dtype=np.float64)
+    close = df['close'].to_numpy(dtype=np.float64)
+    events = np.full(len(close), np.nan)
+    with np.errstate(invalid='ignore'):
+        events[close > np.fmax(a, b)] = 1.0
+        events[close < np.fmin(a, b)] = -1.0
+    return _hold(events)
+
+
+# rule name: signal(df, **params, symbol=None, timeframe=None)
+RULES = {
+    'ma_cross': ma_cross_signal,
+    'rsi': rsi_signal,
+    'macd': macd_signal,
+    'ichimoku': ichimoku_signal
+}
+
+
+@dataclass
+class BacktestResult:
+    """Per-bar arrays aligned with the input candles, the trade list and summary stats"""
+    position: np.ndarray
+    returns: np.ndarray
+    equity: np.ndarray
+    drawdown: np.ndarray
+    trades: pd.DataFrame
+    stats: dict
+
+
+def combine_signals(signals):
+    """Consensus of rule signals: a side is taken only when every rule agrees on it"""
+    signals = np.asarray(signals, dtype=np.float64)
+    total = signals.sum(axis=0)
+    return np.where(total == len(signals), 1.0, np.where(total == -len(signals), -1.0, 0.0))
+
+
+def _trade_runs(position):
+    """(starts, ends): first and last bar of each run of constant non-zero position"""
+    n = len(position)
+    change = np.flatnonzero(np.diff(position, prepend=0.0))
+    starts = change[position[change] != 0]
+    # A run ends on the bar before the next change, or on the last bar while still open
+    next_change = np.append(change, n)
+    ends = next_change[np.searchsorted(change, starts, side='right')] - 1
+    return starts, ends
+
+
+def _trades(df, position, starts, ends, trade_return):
+    """One row per trade"""
+    close = df['close'].to_numpy(dtype=np.float64)
+    timestamp = df['timestamp'].to_numpy()
+    # Filled at the close of the signal bar, closed at the close of the run's last bar
+    return pd.DataFrame({
+        'entry_time': timestamp[starts - 1],
+        'exit_time': timestamp[ends],
+        'side': np.where(position[starts] > 0, 'long', 'short'),
+        'entry_price': close[starts - 1],
+        'exit_price': close[ends],
+        'bars': ends - starts + 1,
+        'return': trade_return,
+        'open': ends == len(position) - 1
+    })
+
+
+def run_backtest(df, rules, fee=DEFAULT_FEE, allow_short=False, timeframe=None, symbol=None, with_trades=True):
+    """
+    Backtest a consensus of rules over candles
+    rules: list of {'rule': name in RULES, **params}
+    timeframe: key of TIMEFRAME_SECONDS, used to annualize the Sharpe ratio
+    symbol: with timeframe, identifies the candles so indicators go through the shared cache
+    with_trades: build the trade list DataFrame; stats are computed either way
+    Returns: BacktestResult, with trades None unless with_trades
+    """
+    n = len(df)
+    close = df['close'].to_numpy(dtype=np.float64)
+    if not rules or n < 2:
+        target = np.zeros(n)
+    else:
+        target = combine_signals([
+            RULES[rule['rule']](df, **{k: v for k, v in rule.items() if k != 'rule'}, symbol=symbol, timeframe=timeframe)
+            for rule in rules
+        ])
+    if not allow_short:
+        target = np.maximum(target, 0.0)
+
+    # Signals are known at a bar's close, so they are held from the next bar on
+    position = np.concatenate(([0.0], target[:-1])) if n else target
+    bar_return = np.zeros(n)
+    if n > 1:
+        # A zero close (bad print) contributes no return rather than inf
+        bar_return[1:] = np.divide(close[1:], close[:-1], out=np.ones(n - 1), where=close[:-1] != 0) - 1
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    returns = position * bar_return - fee * turnover
+    equity = np.cumprod(1 + returns)
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if n else equity
+    starts, ends = _trade_runs(position)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        trade_return = position[starts] * (close[ends] / close[starts - 1] - 1) - 2 * fee
+    trades = _trades(df, position, starts, ends, trade_return) if with_trades else None
+
+    stats = {
+        'total_return': float(equity[-1] - 1) if n else 0.0,
+        'max_drawdown': float(drawdown.min()) if n else 0.0,
+        'trades': len(starts),
+        'win_rate': float((trade_return > 0).mean()) if len(starts) else 0.0,
+        'exposure': float(np.mean(position != 0)) if n else 0.0,
+        'sharpe': 0.0
+    }
+    # std() of fewer than two returns is undefined and warns
+    if n > 1 and timeframe in TIMEFRAME_SECONDS:
+        deviation = returns.std()
+        if deviation > 0:
+            stats['sharpe'] = float(returns.mean() / deviation * np.sqrt(YEAR_SECONDS / TIMEFRAME_SECONDS[timeframe]))
+    return BacktestResult(position, returns, equity, drawdown, trades, stats)
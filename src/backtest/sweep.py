@@ -0,0 +1,111 @@
+"""
+Parallel parameter sweep over one backtest rule
+
+The candle arrays are copied once into a shared memory block that every worker
+process maps read-only, so tasks only carry parameter combinations. Combinations
+are sent in chunks of neighbouring values, which lets each worker reuse shared
+intermediates (e.g. one EMA per span) through its own indicator cache, and
+results are yielded as soon as each chunk finishes.
+"""
+import itertools
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from src.backtest.engine import run_backtest, DEFAULT_FEE
+from src.data.candles import Candles
+from src.indicators.cache import DEFAULT_MAX_BYTES, get_indicator_cache
+
+COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+# Stats a sweep can rank by; all are better when higher (drawdowns are negative)
+OBJECTIVES = ('sharpe', 'total_return', 'max_drawdown', 'win_rate')
+# Cache key for the worker's candles; each worker sees exactly one series
+SWEEP_SYMBOL = "sweep"
+# (a, b) params where a must be below b for a combination to make sense
+ORDERED = (('fast', 'slow'), ('lower', 'upper'), ('tenkan', 'kijun'), ('kijun', 'senkou'))
+# Chunks per worker: enough to balance load, few enough to keep cache reuse high
+CHUNKS_PER_WORKER = 8
+# Indicator series of the swept length a worker's cache holds; a chunk only reuses a few of them
+WORKER_CACHE_SERIES = 32
+
+
+def parameter_grid(ranges):
+    """All combinations of {param: values}, skipping ones that break an ORDERED pair"""
+    names = list(ranges)
+    combos = []
+    for values in itertools.product(*(ranges[name] for name in names)):
+        params = dict(zip(names, (int(value) for value in values)))
+        if any(short in params and long in params and params[short] >= params[long] for short, long in ORDERED):
+            continue
+        combos.append(params)
+    return combos
+
+
+def _share(df):
+    """Copy candle columns into a new shared memory block; returns (block, length)"""
+    length = len(df)
+    block = SharedMemory(create=True, size=max(len(COLUMNS) * length * 8, 1))
+    arrays = np.ndarray((len(COLUMNS), length), dtype=np.float64, buffer=block.buf)
+    arrays[0].view(np.int64)[:] = df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+    for row, name in enumerate(COLUMNS[1:], start=1):
+        arrays[row] = df[name].to_numpy(dtype=np.float64)
+    return block, length
+
+
+# Set in each worker process by _attach
+_block = None
+_frame = None
+
+
+def _attach(name, length):
+    """Worker initializer: map the shared candles and wrap them in a frame without copying"""
+    global _block, _frame
+    # Every worker has its own cache, so the default budget would be paid once per core
+    get_indicator_cache().max_bytes = min(WORKER_CACHE_SERIES * max(length, 1) * 8, DEFAULT_MAX_BYTES)
+    _block = SharedMemory(name=name)
+    arrays = np.ndarray((len(COLUMNS), length), dtype=np.float64, buffer=_block.buf)
+    arrays.flags.writeable = False
+    _frame = Candles(arrays[0].view(np.int64), *arrays[1:]).to_frame()
+
+
+def _evaluate(rule, combos, fee, allow_short, timeframe):
+    """Backtest one chunk of combinations in a worker; returns [(params, stats)]"""
+    return [
+        (params, run_backtest(_frame, [{'rule': rule, **params}], fee=fee, allow_short=allow_short,
+                              timeframe=timeframe, symbol=SWEEP_SYMBOL, with_trades=False).stats)
+        for params in combos
+    ]
+
+
+def sweep(df, rule, ranges, fee=DEFAULT_FEE, allow_short=False, timeframe=None, max_workers=None):
+    """
+    Backtest rule for every combination in ranges on a process pool
+    ranges: {param: iterable of values}, see parameter_grid
+    Yields: (params, stats) as results arrive, in completion order
+    """
+    combos = parameter_grid(ranges)
+    if not combos:
+        return
+    max_workers = max_workers or os.cpu_count() or 1
+    size = max(1, -(-len(combos) // (max_workers * CHUNKS_PER_WORKER)))
+    block, length = _share(df)
+    # Spawned workers do not inherit the Streamlit server's threads and locks
+    executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn"),
+                                   initializer=_attach, initargs=(block.name, length))
+    try:
+        futures = [
+            executor.submit(_evaluate, rule, combos[start:start + size], fee, allow_short, timeframe)
+            for start in range(0, len(combos), size)
+        ]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+        block.close()
+        block.unlink()
+
+
+def best(results, objective, count=10):
+    """Top combinations by objective"""
+    return sorted(results, key=lambda result: result[1][objective], reverse=True)[:count]
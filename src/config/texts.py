@@ -47,7 +47,7 @@ texts = {
         "pan_left": "← Pan Left",
         "pan_right": "Pan Right →",
         "refresh_settings": "Refresh Settings",
-        "auto_refresh": "Auto Refresh (1 min)",
+        "auto_refresh": "Auto Refresh",
         "manual_refresh": "Manual Refresh",
         "theme_label": "Theme",
         "symbol_label": "Symbol",
@@ -56,10 +56,66 @@ texts = {
         "show_grid_label": "Show Grid",
         "show_crosshair_label": "Show Crosshair",
         "indicators_label": "Indicators",
-        "auto_refresh_label": "Auto Refresh",
-        "enable_auto_refresh_label": "Enable Auto Refresh",
         "refresh_interval_label": "Refresh Interval (seconds)",
-        "refresh_interval_help": "Time between updates in seconds"
+        "refresh_interval_help": "Time between updates in seconds",
+        "live_stream": "Live Stream",
+        "live_stream_help": "Stream candles over WebSocket instead of polling",
+        "watchlist": "Watchlist",
+        "view_range": "Visible Range",
+        "all": "All",
+        "webgl": "High Performance (WebGL)",
+        "webgl_help": "Draw overlays with WebGL; faster for long histories",
+        "volume_profile": "Volume Profile",
+        "volume_profile_help": "Volume traded at each price over the visible range, with the point of control and 70% value area",
+        "debug_metrics": "Debug Metrics",
+        "last_rerun": "Last run",
+        "latency_percentiles": "Latency percentiles",
+        "counters": "Counters",
+        "chart_tab": "Chart",
+        "backtest_tab": "Backtest",
+        "backtest_rules": "Rules (all must agree)",
+        "rule_ma_cross": "MA Crossover",
+        "rule_macd": "MACD Signal Cross",
+        "rule_rsi": "RSI Thresholds",
+        "rule_ichimoku": "Price vs Ichimoku Cloud",
+        "backtest_fee": "Fee per Trade (%)",
+        "backtest_short": "Allow Short Positions",
+        "backtest_no_rules": "Select at least one rule",
+        "backtest_run": "Run Backtest",
+        "backtest_hint": "Run the backtest to test the rules on the selected coin and timeframe",
+        "backtest_return": "Total Return",
+        "backtest_drawdown": "Max Drawdown",
+        "backtest_sharpe": "Sharpe Ratio",
+        "backtest_trades": "Trades",
+        "backtest_win_rate": "Win Rate",
+        "backtest_equity": "Equity",
+        "backtest_trade_list": "Trades",
+        "sweep_tab": "Parameter Sweep",
+        "sweep_rule": "Rule",
+        "sweep_objective": "Objective",
+        "objective_sharpe": "Sharpe Ratio",
+        "objective_total_return": "Total Return",
+        "objective_max_drawdown": "Max Drawdown",
+        "objective_win_rate": "Win Rate",
+        "sweep_combinations": "{count:,} combinations",
+        "sweep_run": "Run Sweep",
+        "sweep_best": "Best combinations",
+        "screener_tab": "Screener",
+        "screener_pairs": "Pairs (by 24h volume)",
+        "screener_pairs_help": "Scan the most traded USDT pairs first",
+        "screener_scan": "Scan",
+        "screener_scanning": "Scanning USDT pairs...",
+        "screener_failed": "{count} pairs could not be fetched",
+        "macd_bullish": "Bullish",
+        "macd_bearish": "Bearish",
+        "macd_bullish_cross": "Bullish cross",
+        "macd_bearish_cross": "Bearish cross",
+        "support": "Support",
+        "resistance": "Resistance",
+        "screener_ma_distance": "Dist. MA(50)",
+        "screener_level": "Nearest S/R",
+        "screener_level_type": "S/R Type",
+        "screener_level_distance": "Dist. S/R"
     },
     "Persian": {
         "title": "نمودار ارز دیجیتال",
@@ -109,7 +165,7 @@ texts = {
         "pan_left": "← حرکت به چپ",
         "pan_right": "حرکت به راست →",
         "refresh_settings": "تنظیمات به‌روزرسانی",
-        "auto_refresh": "به‌روزرسانی خودکار (۱ دقیقه)",
+        "auto_refresh": "به‌روزرسانی خودکار",
         "manual_refresh": "به‌روزرسانی دستی",
         "theme_label": "تم",
         "symbol_label": "نماد",
@@ -118,10 +174,66 @@ texts = {
         "show_grid_label": "نمایش خطوط شبکه",
         "show_crosshair_label": "نمایش نشانگر",
         "indicators_label": "اندیکاتورها",
-        "auto_refresh_label": "به‌روزرسانی خودکار",
-        "enable_auto_refresh_label": "فعال‌سازی به‌روزرسانی خودکار",
         "refresh_interval_label": "فاصله به‌روزرسانی (ثانیه)",
-        "refresh_interval_help": "فاصله زمانی بین به‌روزرسانی‌ها به ثانیه"
+        "refresh_interval_help": "فاصله زمانی بین به‌روزرسانی‌ها به ثانیه",
+        "live_stream": "پخش زنده",
+        "live_stream_help": "دریافت کندل‌ها از طریق وب‌سوکت به جای درخواست دوره‌ای",
+        "watchlist": "دیده‌بان بازار",
+        "view_range": "بازه نمایش",
+        "all": "همه",
+        "webgl": "عملکرد بالا (WebGL)",
+        "webgl_help": "رسم اندیکاتورها با WebGL؛ سریع‌تر برای تاریخچه‌های طولانی",
+        "volume_profile": "پروفایل حجم",
+        "volume_profile_help": "حجم معامله‌شده در هر قیمت در بازه نمایش، همراه با نقطه کنترل و ناحیه ارزش ۷۰٪",
+        "debug_metrics": "معیارهای اشکال‌زدایی",
+        "last_rerun": "آخرین اجرا",
+        "latency_percentiles": "صدک‌های تأخیر",
+        "counters": "شمارنده‌ها",
+        "chart_tab": "نمودار",
+        "backtest_tab": "بک‌تست",
+        "backtest_rules": "قوانین (همه باید موافق باشند)",
+        "rule_ma_cross": "تقاطع میانگین متحرک",
+        "rule_macd": "تقاطع MACD با خط سیگنال",
+        "rule_rsi": "آستانه‌های RSI",
+        "rule_ichimoku": "قیمت نسبت به ابر ایچیموکو",
+        "backtest_fee": "کارمزد هر معامله (٪)",
+        "backtest_short": "اجازه موقعیت فروش",
+        "backtest_no_rules": "حداقل یک قانون انتخاب کنید",
+        "backtest_run": "اجرای بک‌تست",
+        "backtest_hint": "بک‌تست را اجرا کنید تا قوانین روی ارز و بازه زمانی انتخاب‌شده آزموده شوند",
+        "backtest_return": "بازده کل",
+        "backtest_drawdown": "بیشترین افت سرمایه",
+        "backtest_sharpe": "نسبت شارپ",
+        "backtest_trades": "معاملات",
+        "backtest_win_rate": "نرخ برد",
+        "backtest_equity": "سرمایه",
+        "backtest_trade_list": "معاملات",
+        "sweep_tab": "جستجوی پارامترها",
+        "sweep_rule": "قانون",
+        "sweep_objective": "معیار",
+        "objective_sharpe": "نسبت شارپ",
+        "objective_total_return": "بازده کل",
+        "objective_max_drawdown": "بیشترین افت سرمایه",
+        "objective_win_rate": "نرخ برد",
+        "sweep_combinations": "{count:,} ترکیب",
+        "sweep_run": "اجرای جستجو",
+        "sweep_best": "بهترین ترکیب‌ها",
+        "screener_tab": "غربالگر",
+        "screener_pairs": "تعداد جفت‌ها (بر اساس حجم ۲۴ ساعته)",
+        "screener_pairs_help": "ابتدا جفت‌های USDT پرمعامله‌تر بررسی می‌شوند",
+        "screener_scan": "اسکن",
+        "screener_scanning": "در حال اسکن جفت‌های USDT...",
+        "screener_failed": "دریافت {count} جفت ناموفق بود",
+        "macd_bullish": "صعودی",
+        "macd_bearish": "نزولی",
+        "macd_bullish_cross": "تقاطع صعودی",
+        "macd_bearish_cross": "تقاطع نزولی",
+        "support": "حمایت",
+        "resistance": "مقاومت",
+        "screener_ma_distance": "فاصله از MA(50)",
+        "screener_level": "نزدیک‌ترین حمایت/مقاومت",
+        "screener_level_type": "نوع سطح",
+        "screener_level_distance": "فاصله از سطح"
     },
     "German": {
         "title": "Krypto-Chart",
@@ -171,7 +283,7 @@ texts = {
         "pan_left": "← Nach Links",
         "pan_right": "Nach Rechts →",
         "refresh_settings": "Aktualisierungseinstellungen",
-        "auto_refresh": "Automatische Aktualisierung (1 Min)",
+        "auto_refresh": "Automatische Aktualisierung",
         "manual_refresh": "Manuelle Aktualisierung",
         "theme_label": "Theme",
         "symbol_label": "Symbol",
@@ -180,10 +292,66 @@ texts = {
         "show_grid_label": "Raster anzeigen",
         "show_crosshair_label": "Fadenkreuz anzeigen",
         "indicators_label": "Indikatoren",
-        "auto_refresh_label": "Automatische Aktualisierung",
-        "enable_auto_refresh_label": "Automatische Aktualisierung aktivieren",
         "refresh_interval_label": "Aktualisierungsintervall (Sekunden)",
-        "refresh_interval_help": "Zeit zwischen Aktualisierungen in Sekunden"
+        "refresh_interval_help": "Zeit zwischen Aktualisierungen in Sekunden",
+        "live_stream": "Live-Stream",
+        "live_stream_help": "Kerzen per WebSocket streamen statt abzufragen",
+        "watchlist": "Beobachtungsliste",
+        "view_range": "Sichtbarer Bereich",
+        "all": "Alle",
+        "webgl": "Hohe Leistung (WebGL)",
+        "webgl_help": "Overlays mit WebGL zeichnen; schneller bei langen Historien",
+        "volume_profile": "Volumenprofil",
+        "volume_profile_help": "Gehandeltes Volumen je Preis im sichtbaren Bereich, mit Point of Control und 70%-Value-Area",
+        "debug_metrics": "Debug-Metriken",
+        "last_rerun": "Letzter Lauf",
+        "latency_percentiles": "Latenz-Perzentile",
+        "counters": "Zähler",
+        "chart_tab": "Chart",
+        "backtest_tab": "Backtest",
+        "backtest_rules": "Regeln (alle müssen übereinstimmen)",
+        "rule_ma_cross": "MA-Kreuzung",
+        "rule_macd": "MACD-Signalkreuzung",
+        "rule_rsi": "RSI-Schwellen",
+        "rule_ichimoku": "Kurs vs. Ichimoku-Wolke",
+        "backtest_fee": "Gebühr pro Trade (%)",
+        "backtest_short": "Short-Positionen erlauben",
+        "backtest_no_rules": "Mindestens eine Regel auswählen",
+        "backtest_run": "Backtest starten",
+        "backtest_hint": "Starten Sie den Backtest, um die Regeln für die gewählte Münze und den Zeitrahmen zu testen",
+        "backtest_return": "Gesamtrendite",
+        "backtest_drawdown": "Maximaler Drawdown",
+        "backtest_sharpe": "Sharpe-Ratio",
+        "backtest_trades": "Trades",
+        "backtest_win_rate": "Trefferquote",
+        "backtest_equity": "Kapital",
+        "backtest_trade_list": "Trades",
+        "sweep_tab": "Parameter-Suche",
+        "sweep_rule": "Regel",
+        "sweep_objective": "Zielgröße",
+        "objective_sharpe": "Sharpe-Ratio",
+        "objective_total_return": "Gesamtrendite",
+        "objective_max_drawdown": "Maximaler Drawdown",
+        "objective_win_rate": "Trefferquote",
+        "sweep_combinations": "{count:,} Kombinationen",
+        "sweep_run": "Suche starten",
+        "sweep_best": "Beste Kombinationen",
+        "screener_tab": "Screener",
+        "screener_pairs": "Paare (nach 24h-Volumen)",
+        "screener_pairs_help": "Die meistgehandelten USDT-Paare zuerst scannen",
+        "screener_scan": "Scannen",
+        "screener_scanning": "USDT-Paare werden gescannt...",
+        "screener_failed": "{count} Paare konnten nicht geladen werden",
+        "macd_bullish": "Bullisch",
+        "macd_bearish": "Bärisch",
+        "macd_bullish_cross": "Bullische Kreuzung",
+        "macd_bearish_cross": "Bärische Kreuzung",
+        "support": "Unterstützung",
+        "resistance": "Widerstand",
+        "screener_ma_distance": "Abst. MA(50)",
+        "screener_level": "Nächste U/W",
+        "screener_level_type": "U/W-Typ",
+        "screener_level_distance": "Abst. U/W"
     }
 }
 
@@ -1,7 +1,9 @@
-import requests
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
 import pytz
+from numpy.lib.stride_tricks import sliding_window_view
+from src.api import client
+from src.data.candles import Candles
 
 def fetch_candles(symbol, timeframe):
     """Fetch candlestick data from KuCoin API"""
@@ -23,23 +25,12 @@ def fetch_candles(symbol, timeframe):
         start_time = end_time - (timeframe_seconds[timeframe] * 200)  # Get last 200 candles
         
         # Make API request
-        url = f"https://api.kucoin.com/api/v1/market/candles?symbol={symbol}&type={timeframe}&startAt={start_time}&endAt={end_time}"
-        response = requests.get(url)
-        data = response.json()
+        params = {"symbol": symbol, "type": timeframe, "startAt": start_time, "endAt": end_time}
+        data = client.get("/api/v1/market/candles", params=params)
         
         if data["code"] == "200000":
-            # Convert data to DataFrame
-            df = pd.DataFrame(data["data"], columns=["timestamp", "open", "close", "high", "low", "volume", "turnover"])
-            
-            # Convert timestamp to datetime
-            df["timestamp"] = pd.to_datetime(df["timestamp"].astype(int), unit="s")
-            
-            # Convert string values to float
-            for col in ["open", "close", "high", "low", "volume", "turnover"]:
-                df[col] = df[col].astype(float)
-            
-            # Sort by timestamp
-            df = df.sort_values("timestamp")
+            # Parse rows straight into arrays, sorted by timestamp
+            df = Candles.from_kucoin(data["data"]).to_frame(turnover=True)
             
             return df
         else:
@@ -52,9 +43,7 @@ def fetch_market_info(symbol):
     """Fetch market information from KuCoin API"""
     try:
         # Make API request
-        url = f"https://api.kucoin.com/api/v1/market/stats?symbol={symbol}"
-        response = requests.get(url)
-        data = response.json()
+        data = client.get("/api/v1/market/stats", params={"symbol": symbol})
         
         if data["code"] == "200000":
             return data["data"]
@@ -64,38 +53,54 @@ def fetch_market_info(symbol):
         print(f"Error fetching market info: {e}")
         return None
 
+def _neighbour_extreme(values, window, func):
+    """
+    func (np.min/np.max) of the window-1 bars before and after each bar
+    Returns two arrays aligned with values; NaN where the neighbourhood is incomplete
+    """
+    before = np.full(len(values), np.nan)
+    after = np.full(len(values), np.nan)
+    size = window - 1
+    if size < 1:
+        # Empty neighbourhoods: every comparison is vacuously true
+        fill = np.inf if func is np.min else -np.inf
+        return np.full(len(values), fill), np.full(len(values), fill)
+    if len(values) > size:
+        extremes = func(sliding_window_view(values, size), axis=1)
+        before[size:] = extremes[:-1]
+        after[:-size] = extremes[1:]
+    return before, after
+
 def find_support_resistance(df, window=20, price_threshold=0.02, strength_threshold=2):
     """Find support and resistance levels using price action"""
     support_levels = []
     resistance_levels = []
     
-    for i in range(window, len(df) - window):
-        # Get the current window
-        current_window = df.iloc[i-window:i+window]
-        current_price = df.iloc[i]["close"]
-        
-        # Find local minimums and maximums
-        is_support = all(current_price <= df.iloc[i-j]["low"] for j in range(1, window)) and \
-                    all(current_price <= df.iloc[i+j]["low"] for j in range(1, window))
-        
-        is_resistance = all(current_price >= df.iloc[i-j]["high"] for j in range(1, window)) and \
-                       all(current_price >= df.iloc[i+j]["high"] for j in range(1, window))
+    close = df["close"].to_numpy(dtype=np.float64)
+    low = df["low"].to_numpy(dtype=np.float64)
+    high = df["high"].to_numpy(dtype=np.float64)
+    
+    # Local minimums and maximums against the window-1 bars on each side
+    low_before, low_after = _neighbour_extreme(low, window, np.min)
+    high_before, high_after = _neighbour_extreme(high, window, np.max)
+    index = np.arange(window, max(len(df) - window, window))
+    is_support = (close[index] <= low_before[index]) & (close[index] <= low_after[index])
+    is_resistance = (close[index] >= high_before[index]) & (close[index] >= high_after[index])
+    
+    # Calculate level strength based on later bars that stay inside the price band
+    for i, support in zip(index[is_support | is_resistance], is_support[is_support | is_resistance]):
+        current_price = close[i]
+        price_range = current_price * price_threshold
+        touches = int(np.count_nonzero(
+            (low[i+1:] >= current_price - price_range) & (high[i+1:] <= current_price + price_range)
+        ))
         
-        # Calculate level strength based on touches
-        if is_support or is_resistance:
-            touches = 0
-            for j in range(i+1, len(df)):
-                price_range = current_price * price_threshold
-                if df.iloc[j]["low"] >= current_price - price_range and \
-                   df.iloc[j]["high"] <= current_price + price_range:
-                    touches += 1
-            
-            # Add level if it has enough touches
-            if touches >= strength_threshold:
-                level = (current_price, i, touches)
-                if is_support:
-                    support_levels.append(level)
-                else:
-                    resistance_levels.append(level)
+        # Add level if it has enough touches
+        if touches >= strength_threshold:
+            level = (current_price, int(i), touches)
+            if support:
+                support_levels.append(level)
+            else:
+                resistance_levels.append(level)
     
-    return support_levels, resistance_levels 
\ No newline at end of file
+    return support_levels, resistance_levels
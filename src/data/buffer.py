@@ -0,0 +1,83 @@
+import threading
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+class CandleRingBuffer:
+    """Fixed-size OHLCV ring buffer updated in place as candles stream in"""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.version = 0
+        self._timestamps = np.zeros(capacity, dtype=np.int64)
+        self._values = np.zeros((capacity, 5), dtype=np.float64)
+        self._head = 0
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _last_index(self):
+        return (self._head - 1) % self.capacity
+
+    def update(self, candle):
+        """
+        Apply one (timestamp, open, high, low, close, volume) candle
+        Revises the newest candle in place, appends a newer one, ignores older ones
+        """
+        timestamp = int(candle[0])
+        with self._lock:
+            if self._size:
+                last = self._last_index()
+                if timestamp == self._timestamps[last]:
+                    self._values[last] = candle[1:]
+                    self.version += 1
+                    return True
+                if timestamp < self._timestamps[last]:
+                    return False
+            self._timestamps[self._head] = timestamp
+            self._values[self._head] = candle[1:]
+            self._head = (self._head + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+            self.version += 1
+            return True
+
+    def extend_frame(self, df):
+        """Append candles from a frame with the usual timestamp/OHLCV columns"""
+        timestamps = df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64)
+        values = df[COLUMNS[1:]].to_numpy(dtype=np.float64)
+        if not self._size and len(df):
+            # Bulk copy the newest `capacity` rows into an empty buffer
+            timestamps = timestamps[-self.capacity:]
+            values = values[-self.capacity:]
+            with self._lock:
+                count = len(timestamps)
+                self._timestamps[:count] = timestamps
+                self._values[:count] = values
+                self._head = count % self.capacity
+                self._size = count
+                self.version += 1
+            return
+        for timestamp, row in zip(timestamps, values):
+            self.update((timestamp, *row))
+
+    def last(self):
+        """Return the newest candle tuple or None"""
+        with self._lock:
+            if not self._size:
+                return None
+            last = self._last_index()
+            return (int(self._timestamps[last]), *self._values[last])
+
+    def to_frame(self):
+        """Return buffered candles as a time-sorted DataFrame"""
+        with self._lock:
+            order = np.arange(self._head - self._size, self._head) % self.capacity
+            timestamps = self._timestamps[order]
+            values = self._values[order]
+        df = pd.DataFrame(values, columns=COLUMNS[1:])
+        df.insert(0, 'timestamp', pd.to_datetime(timestamps, unit='s'))
+        return df
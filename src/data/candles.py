@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover')
+
+# Column order of KuCoin candle rows
+KUCOIN_ORDER = ('timestamp', 'open', 'close', 'high', 'low', 'volume', 'turnover')
+
+
+class Candles:
+    """
+    Compact OHLCV container: an int64 epoch-second array plus contiguous price arrays
+    Slicing returns views; to_frame() wraps the arrays without copying them
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, timestamp, open, high, low, close, volume, turnover=None):
+        self.timestamp = timestamp
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+        self.turnover = turnover
+
+    @classmethod
+    def empty(cls, dtype=np.float64):
+        return cls(np.empty(0, dtype=np.int64), *(np.empty(0, dtype=dtype) for _ in range(6)))
+
+    @classmethod
+    def from_columns(cls, values, order, dtype=np.float64):
+        """
+        Build from a (rows, fields) array-like, reversing to time order if needed
+        order: field name of each column
+        """
+        values = np.asarray(values, dtype=np.float64)
+        if not len(values):
+            return cls.empty(dtype)
+        column = {name: i for i, name in enumerate(order)}
+        if len(values) > 1 and values[0, column['timestamp']] > values[-1, column['timestamp']]:
+            values = values[::-1]
+        # One transposed copy makes every field a contiguous row of the same block
+        prices = np.ascontiguousarray(values.T, dtype=dtype)
+        timestamp = values[:, column['timestamp']].astype(np.int64)
+        return cls(timestamp, *(prices[column[name]] if name in column else None for name in FIELDS[1:]))
+
+    @classmethod
+    def from_kucoin(cls, rows, dtype=np.float64):
+        """Parse KuCoin candle rows (lists of strings, newest first) in one pass"""
+        return cls.from_columns(rows, KUCOIN_ORDER, dtype)
+
+    @classmethod
+    def concat(cls, parts):
+        """Merge candle sets into one sorted set, keeping the last copy of each timestamp"""
+        parts = [part for part in parts if len(part)]
+        if not parts:
+            return cls.empty()
+        fields = [name for name in FIELDS if all(getattr(part, name) is not None for part in parts)]
+        merged = {name: np.concatenate([getattr(part, name) for part in parts]) for name in fields}
+        # Stable sort then keep the last row of each run of equal timestamps
+        order = np.argsort(merged['timestamp'], kind='stable')
+        timestamp = merged['timestamp'][order]
+        keep = np.append(timestamp[1:] != timestamp[:-1], True)
+        index = order[keep]
+        return cls(**{name: values[index] for name, values in merged.items()})
+
+    def __len__(self):
+        return len(self.timestamp)
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("Candles only support slicing")
+        return Candles(*(None if values is None else values[key] for values in self._arrays()))
+
+    def _arrays(self):
+        return [getattr(self, name) for name in FIELDS]
+
+    @property
+    def nbytes(self):
+        return sum(values.nbytes for values in self._arrays() if values is not None)
+
+    def rows(self):
+        """(timestamp, open, high, low, close, volume) tuples of Python scalars"""
+        return zip(*(getattr(self, name).tolist() for name in FIELDS[:6]))
+
+    def to_frame(self, turnover=False):
+        """DataFrame over the same arrays with datetime timestamps"""
+        names = FIELDS if turnover and self.turnover is not None else FIELDS[:6]
+        data = {name: getattr(self, name) for name in names}
+        data['timestamp'] = self.timestamp.view('datetime64[s]')
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,175 @@
+import contextvars
+import threading
+import time
+from src.api.kucoin import HISTORY_SECONDS, sync_candle_series
+from src.data.resample import BASE_TIMEFRAME, MultiTimeframe
+from src.utils.metrics import get_metrics, increment
+
+REFRESH_INTERVAL = 60
+# Stop refreshing a symbol nobody has read for this long
+IDLE_TIMEOUT = 300
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution"""
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, func):
+        """Run func for key, or wait for the identical call already in flight"""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = func()
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class DataHub:
+    """
+    Process-wide owner of the latest candles per symbol
+    Only the 1m base series is fetched upstream; every timeframe is resampled from it
+    locally, and one background refresher per active symbol keeps it current
+    """
+
+    def __init__(self, loader, interval=REFRESH_INTERVAL, idle_timeout=IDLE_TIMEOUT, history_seconds=HISTORY_SECONDS):
+        # loader(symbol, since) returns base Candles from `since` onwards, or the full window when since is None
+        self.loader = loader
+        self.interval = interval
+        self.idle_timeout = idle_timeout
+        self.history_seconds = history_seconds
+        self.upstream_requests = 0
+        self._series = {}
+        self._last_read = {}
+        self._loaded_at = {}
+        self._refreshers = {}
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def get(self, symbol, timeframe, max_age=None):
+        """
+        Latest candles for (symbol, timeframe); loads the symbol on first use. Do not mutate
+        A snapshot older than max_age seconds (default: the refresh interval), e.g. after the
+        idle refresher stopped, is reloaded first
+        """
+        with self._lock:
+            self._last_read[symbol] = time.monotonic()
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._refresh(symbol)
+        elif time.monotonic() - self._loaded_at.get(symbol, 0) > (self.interval if max_age is None else max_age):
+            try:
+                series = self._refresh(symbol)
+            except Exception as e:
+                # Serve the previous candles; the refresher tries again
+                print(f"Refresh error for {symbol}: {e}")
+        self._ensure_refresher(symbol)
+        return series.frame(timeframe)
+
+    def refresh(self, symbol, timeframe):
+        """Fetch new base candles for symbol once, however many callers ask concurrently"""
+        return self._refresh(symbol).frame(timeframe)
+
+    def series(self, symbol):
+        """The symbol's MultiTimeframe, or None before its first load"""
+        return self._series.get(symbol)
+
+    def active(self):
+        with self._lock:
+            return list(self._refreshers)
+
+    def stop(self):
+        self._stop.set()
+
+    def _refresh(self, symbol):
+        return self._flight.do(symbol, lambda: self._load(symbol))
+
+    def _load(self, symbol):
+        with self._lock:
+            self.upstream_requests += 1
+        increment("hub.upstream_loads")
+        series = self._series.get(symbol)
+        if series is None:
+            series = MultiTimeframe(self.loader(symbol, None), self.history_seconds)
+            self._series[symbol] = series
+        else:
+            # Re-read from the newest base candle, which may have still been forming
+            series.update(self.loader(symbol, series.last_timestamp()))
+        self._loaded_at[symbol] = time.monotonic()
+        return series
+
+    def _ensure_refresher(self, symbol):
+        with self._lock:
+            if symbol in self._refreshers:
+                return
+            # Timed refreshes outlive the rerun that started them, so they run in an empty context rather
+            # than recording into its trace; loads a reader triggers in get() run in the reader's context
+            thread = threading.Thread(target=contextvars.Context().run, args=(self._refresh_loop, symbol),
+                                      name=f"hub-{symbol}", daemon=True)
+            self._refreshers[symbol] = thread
+        thread.start()
+
+    def _until_stale(self, symbol):
+        """Seconds until the symbol's snapshot is older than the refresh interval"""
+        return max(self._loaded_at.get(symbol, 0) + self.interval - time.monotonic(), 0)
+
+    def _refresh_loop(self, symbol):
+        delay = self.interval
+        while not self._stop.wait(delay):
+            with self._lock:
+                # Decided under the lock, so a concurrent get() either keeps this loop or starts a new one
+                if time.monotonic() - self._last_read.get(symbol, 0) > self.idle_timeout:
+                    del self._refreshers[symbol]
+                    return
+            delay = self._until_stale(symbol)
+            if delay > 0:
+                # A reader reloaded it meanwhile
+                continue
+            delay = self.interval
+            try:
+                self._refresh(symbol)
+            except Exception as e:
+                # Keep serving the previous candles
+                print(f"Refresh error for {symbol}: {e}")
+        with self._lock:
+            del self._refreshers[symbol]
+
+
+_hub = None
+_hub_lock = threading.Lock()
+
+
+def get_data_hub():
+    """Return the process-wide data hub shared by all Streamlit sessions"""
+    global _hub
+    with _hub_lock:
+        if _hub is None:
+            _hub = DataHub(lambda symbol, since: sync_candle_series(symbol, BASE_TIMEFRAME, since))
+            get_metrics().register_gauges("hub", lambda: {
+                "hub_active_symbols": len(_hub.active()),
+                "hub_upstream_requests": _hub.upstream_requests
+            })
+        return _hub
@@ -0,0 +1,130 @@
+"""
+Local multi-timeframe candles
+
+Only 1m candles are fetched; 5m … 1w candles are aggregated from them with
+vectorized reductions over the runs of 1m rows that share a bucket, and
+kept current by re-aggregating just the buckets that new 1m rows touch.
+"""
+import threading
+import numpy as np
+from src.api.kucoin import TIMEFRAME_SECONDS
+from src.data.candles import Candles, FIELDS
+
+BASE_TIMEFRAME = "1m"
+
+# Buckets are aligned to UTC; weeks start on Monday (the epoch was a Thursday)
+BUCKET_ORIGIN = {"1w": 4 * 86400}
+
+
+def bucket_start(timestamps, timeframe):
+    """Open time of the timeframe bucket each epoch-second timestamp falls in"""
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    origin = BUCKET_ORIGIN.get(timeframe, 0)
+    return (timestamps - origin) // seconds * seconds + origin
+
+
+def resample(candles, timeframe):
+    """Aggregate time-sorted base candles into timeframe candles"""
+    if timeframe == BASE_TIMEFRAME or not len(candles):
+        return candles
+    buckets = bucket_start(candles.timestamp, timeframe)
+    starts = np.flatnonzero(np.diff(buckets, prepend=buckets[0] - 1))
+    ends = np.append(starts[1:], len(buckets)) - 1
+    return Candles(
+        buckets[starts],
+        candles.open[starts],
+        np.maximum.reduceat(candles.high, starts),
+        np.minimum.reduceat(candles.low, starts),
+        candles.close[ends],
+        np.add.reduceat(candles.volume, starts),
+        None if candles.turnover is None else np.add.reduceat(candles.turnover, starts)
+    )
+
+
+def resample_frame(df, timeframe):
+    """resample() for a candle DataFrame"""
+    if timeframe == BASE_TIMEFRAME:
+        return df
+    candles = Candles(
+        df['timestamp'].to_numpy(dtype='datetime64[s]').astype(np.int64),
+        *(df[name].to_numpy(dtype=np.float64) for name in FIELDS[1:6])
+    )
+    return resample(candles, timeframe).to_frame()
+
+
+class MultiTimeframe:
+    """
+    1m base candles of one symbol plus every timeframe derived from them so far
+    update() merges new or revised 1m rows and re-aggregates only the affected buckets
+    """
+
+    def __init__(self, base=None, history_seconds=None):
+        self.history_seconds = history_seconds
+        self.version = 0
+        self._base = Candles.empty() if base is None else base
+        self._derived = {}
+        self._frames = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._base)
+
+    def last_timestamp(self):
+        """Open time of the newest base candle, or None"""
+        with self._lock:
+            return int(self._base.timestamp[-1]) if len(self._base) else None
+
+    def update(self, candles):
+        """Merge new or revised base candles; returns the number of rows merged"""
+        if not len(candles):
+            return 0
+        with self._lock:
+            first = int(candles.timestamp[0])
+            # Base rows from the first changed candle onwards are replaced
+            keep = int(np.searchsorted(self._base.timestamp, first))
+            self._base = Candles.concat([self._base[:keep], candles])
+            trimmed = self._trim()
+            for timeframe, derived in list(self._derived.items()):
+                if trimmed:
+                    # The oldest bucket may have lost rows; re-derive from scratch
+                    self._derived[timeframe] = resample(self._base, timeframe)
+                    continue
+                bucket = int(bucket_start(np.int64(first), timeframe))
+                tail = int(np.searchsorted(self._base.timestamp, bucket))
+                head = int(np.searchsorted(derived.timestamp, bucket))
+                self._derived[timeframe] = Candles.concat([derived[:head], resample(self._base[tail:], timeframe)])
+            self._frames.clear()
+            self.version += 1
+        return len(candles)
+
+    def candles(self, timeframe):
+        """Candles for timeframe, derived on first use. Do not mutate"""
+        with self._lock:
+            if timeframe == BASE_TIMEFRAME:
+                return self._base
+            derived = self._derived.get(timeframe)
+            if derived is None:
+                derived = self._derived[timeframe] = resample(self._base, timeframe)
+            return derived
+
+    def frame(self, timeframe):
+        """DataFrame for timeframe, built once per version. Do not mutate"""
+        with self._lock:
+            frame = self._frames.get(timeframe)
+            version = self.version
+        if frame is None:
+            frame = self.candles(timeframe).to_frame()
+            with self._lock:
+                if self.version == version:
+                    self._frames[timeframe] = frame
+        return frame
+
+    def _trim(self):
+        """Drop base rows older than history_seconds; allows a day of slack to trim rarely"""
+        if self.history_seconds is None or not len(self._base):
+            return False
+        start = self._base.timestamp[-1] - self.history_seconds
+        if self._base.timestamp[0] >= start - 86400:
+            return False
+        self._base = self._base[int(np.searchsorted(self._base.timestamp, start)):]
+        return True
@@ -0,0 +1,96 @@
+import os
+import sqlite3
+import threading
+from src.data.candles import Candles
+
+DEFAULT_DB_PATH = os.environ.get("CANDLE_DB_PATH", os.path.join("data", "candles.db"))
+
+COLUMNS = ['timestamp', 'open', 'high', 'low', 'close', 'volume']
+
+
+class CandleStore:
+    """On-disk OHLCV candle store keyed by symbol and timeframe"""
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        if path != ":memory:":
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS candles (
+                    symbol TEXT NOT NULL,
+                    timeframe TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    open REAL,
+                    high REAL,
+                    low REAL,
+                    close REAL,
+                    volume REAL,
+                    PRIMARY KEY (symbol, timeframe, timestamp)
+                ) WITHOUT ROWID
+            """)
+
+    def last_timestamp(self, symbol, timeframe):
+        """Return the newest stored candle time (epoch seconds) or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT MAX(timestamp) FROM candles WHERE symbol = ? AND timeframe = ?",
+                (symbol, timeframe)
+            ).fetchone()
+        return row[0]
+
+    def upsert(self, symbol, timeframe, rows):
+        """
+        Insert or replace candles
+        rows: Candles or an iterable of (timestamp, open, high, low, close, volume) tuples
+        """
+        if isinstance(rows, Candles):
+            rows = rows.rows()
+        # The newest candle is still forming, so stored rows are replaced, not skipped
+        with self._lock, self._conn:
+            cursor = self._conn.executemany(
+                "INSERT OR REPLACE INTO candles VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                ((symbol, timeframe) + tuple(row) for row in rows)
+            )
+        return cursor.rowcount
+
+    def load(self, symbol, timeframe, start=None, end=None):
+        """Load candles in [start, end] (epoch seconds) as a time-sorted DataFrame"""
+        return self.load_candles(symbol, timeframe, start, end).to_frame()
+
+    def load_candles(self, symbol, timeframe, start=None, end=None):
+        """Load candles in [start, end] (epoch seconds) as a Candles container"""
+        query = "SELECT timestamp, open, high, low, close, volume FROM candles WHERE symbol = ? AND timeframe = ?"
+        params = [symbol, timeframe]
+        if start is not None:
+            query += " AND timestamp >= ?"
+            params.append(int(start))
+        if end is not None:
+            query += " AND timestamp <= ?"
+            params.append(int(end))
+        query += " ORDER BY timestamp"
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return Candles.from_columns(rows, COLUMNS)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_candle_store():
+    """Return the process-wide candle store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = CandleStore()
+        return _store
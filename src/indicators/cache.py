@@ -0,0 +1,107 @@
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from src.utils.metrics import get_metrics, increment
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def _nbytes(value):
+    """Approximate memory held by a cached indicator result"""
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True))
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True).sum())
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(_nbytes(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def data_key(df, symbol, timeframe):
+    """
+    Identify a candle frame by symbol, timeframe and its newest candle
+    The newest high, low, close and volume are included because a forming candle is revised in place
+    """
+    if not len(df):
+        return (symbol, timeframe, None, 0, None)
+    last = tuple(float(df[column].iloc[-1]) for column in ('high', 'low', 'close', 'volume'))
+    return (symbol, timeframe, df['timestamp'].iloc[-1], len(df), last)
+
+
+class IndicatorCache:
+    """Thread-safe LRU cache of indicator results bounded by a memory budget"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        """Return the cached result for key, computing and storing it on a miss"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                increment("indicator_cache.hit")
+                return entry[0]
+            self.misses += 1
+        increment("indicator_cache.miss")
+
+        value = compute()
+        nbytes = _nbytes(value)
+        if nbytes > self.max_bytes:
+            return value
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size -= previous[1]
+            self._entries[key] = (value, nbytes)
+            self.size += nbytes
+            while self.size > self.max_bytes:
+                _, (_, evicted_bytes) = self._entries.popitem(last=False)
+                self.size -= evicted_bytes
+                self.evictions += 1
+        return value
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self.size,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_indicator_cache():
+    """Return the process-wide indicator cache shared by all sessions"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = IndicatorCache()
+            get_metrics().register_gauges("indicator_cache", lambda: {
+                f"indicator_cache_{name}": value for name, value in _cache.stats().items()
+            })
+        return _cache
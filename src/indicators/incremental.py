@@ -0,0 +1,409 @@
+"""
+Stateful indicators that update in O(1) per new or revised candle
+
+Each indicator mirrors a batch function in src.indicators.technical and
+follows pandas' own rolling/ewm arithmetic so both give the same values.
+`update()` appends a newer candle or revises the newest one in place.
+LiveIndicators seeds them from the batch kernels and then feeds streamed
+candles, which is what the chart uses in live streaming mode.
+"""
+import math
+import threading
+from collections import OrderedDict, deque
+import numpy as np
+import pandas as pd
+from src.indicators.planner import evaluate_indicator
+from src.utils.metrics import increment
+
+NAN = float('nan')
+INITIAL_CAPACITY = 1024
+# EWM state is rebuilt from this many spans of candles; older ones weigh in below 1e-17
+EWM_WARMUP_SPANS = 20
+# Live indicator sets kept, least recently used dropped first
+MAX_LIVE_SERIES = 32
+
+
+class _RollingMean:
+    """Rolling mean with pandas' compensated add/remove summation"""
+
+    def __init__(self, window, min_periods=None):
+        self.window = window
+        self.min_periods = window if min_periods is None else min_periods
+        self._values = deque()
+        self._state = (0.0, 0.0, 0.0, 0, 0, 0, NAN)
+        self._undo = None
+
+    def push(self, value):
+        sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev = self._state
+        removed = None
+        if self.window == 1 or not self._values:
+            # pandas restarts the sums whenever the window no longer overlaps the previous one
+            sum_x = comp_add = comp_remove = 0.0
+            nobs = neg_ct = same_ct = 0
+            prev = value
+            if self._values:
+                removed = self._values.popleft()
+        elif len(self._values) == self.window:
+            removed = self._values.popleft()
+            if removed == removed:
+                nobs -= 1
+                y = -removed - comp_remove
+                t = sum_x + y
+                comp_remove = t - sum_x - y
+                sum_x = t
+                if math.copysign(1.0, removed) < 0:
+                    neg_ct -= 1
+        if value == value:
+            nobs += 1
+            y = value - comp_add
+            t = sum_x + y
+            comp_add = t - sum_x - y
+            sum_x = t
+            if math.copysign(1.0, value) < 0:
+                neg_ct += 1
+            same_ct = same_ct + 1 if value == prev else 1
+            prev = value
+        self._values.append(value)
+        self._undo = (self._state, removed)
+        self._state = (sum_x, comp_add, comp_remove, nobs, neg_ct, same_ct, prev)
+        return self.value
+
+    def revise(self, value):
+        state, removed = self._undo
+        self._values.pop()
+        if removed is not None:
+            self._values.appendleft(removed)
+        self._state = state
+        return self.push(value)
+
+    @property
+    def value(self):
+        sum_x, _, _, nobs, neg_ct, same_ct, prev = self._state
+        if nobs < self.min_periods or nobs == 0:
+            return NAN
+        result = sum_x / nobs
+        if same_ct >= nobs:
+            result = prev
+        elif neg_ct == 0 and result < 0:
+            result = 0.0
+        elif neg_ct == nobs and result > 0:
+            result = 0.0
+        return result
+
+
+class _RollingExtreme:
+    """Rolling max or min over a monotonic deque of (index, value)"""
+
+    def __init__(self, window, mode='max'):
+        self.window = window
+        self._better = (lambda a, b: a >= b) if mode == 'max' else (lambda a, b: a <= b)
+        self._deque = deque()
+        self._count = 0
+        self._undo = None
+
+    def push(self, value):
+        index = self._count
+        expired = []
+        while self._deque and self._deque[0][0] <= index - self.window:
+            expired.append(self._deque.popleft())
+        dominated = []
+        while self._deque and self._better(value, self._deque[-1][1]):
+            dominated.append(self._deque.pop())
+        self._deque.append((index, value))
+        self._count += 1
+        self._undo = (expired, dominated)
+        return self.value
+
+    def revise(self, value):
+        expired, dominated = self._undo
+        self._deque.pop()
+        self._deque.extend(reversed(dominated))
+        self._deque.extendleft(reversed(expired))
+        self._count -= 1
+        return self.push(value)
+
+    @property
+    def value(self):
+        if self._count < self.window:
+            return NAN
+        return self._deque[0][1]
+
+
+class _EWM:
+    """Exponential moving average matching pandas ewm(span, adjust=False)"""
+
+    def __init__(self, span):
+        com = (span - 1) / 2.0
+        self.alpha = 1.0 / (1.0 + com)
+        self.value = NAN
+        self._previous = NAN
+
+    def push(self, value):
+        self._previous = self.value
+        self.value = self._apply(self._previous, value)
+        return self.value
+
+    def revise(self, value):
+        self.value = self._apply(self._previous, value)
+        return self.value
+
+    def _apply(self, weighted, value):
+        if weighted != weighted:
+            return value
+        if value != value or weighted == value:
+            return weighted
+        old_wt = 1.0 - self.alpha
+        return (old_wt * weighted + self.alpha * value) / (old_wt + self.alpha)
+
+
+class _Shift:
+    """Delay line returning the value pushed `periods` updates ago"""
+
+    def __init__(self, periods):
+        self._values = deque([NAN] * periods, maxlen=periods + 1)
+
+    def push(self, value):
+        self._values.append(value)
+        return self._values[0]
+
+    def revise(self, value):
+        self._values[-1] = value
+        return self._values[0]
+
+
+class IncrementalIndicator:
+    """
+    Base class keeping full output series plus the state needed for the next candle
+    Subclasses implement _step(high, low, close, revise) returning one output tuple
+    and `warmup`, the number of trailing candles that determine their state
+    """
+    outputs = ()
+    warmup = 0
+
+    def __init__(self):
+        self.last_timestamp = None
+        self._values = self._allocate(0)
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def update(self, timestamp, high, low, close):
+        """Feed one candle; a repeated timestamp revises the newest candle"""
+        if self.last_timestamp is not None and timestamp < self.last_timestamp:
+            raise ValueError("Candles must arrive in time order")
+        revise = timestamp == self.last_timestamp
+        values = self._step(high, low, close, revise)
+        if not revise:
+            if self._count == self._values.shape[1]:
+                values_so_far, self._values = self._values, self._allocate(2 * self._count)
+                self._values[:, :self._count] = values_so_far
+            self._count += 1
+        self._values[:, self._count - 1] = values
+        self.last_timestamp = timestamp
+        return values
+
+    def sync_frame(self, df):
+        """Feed only the rows of df at or after the newest seen candle"""
+        timestamps = df['timestamp'].to_numpy()
+        start = 0
+        if self.last_timestamp is not None:
+            start = int(np.searchsorted(timestamps, self.last_timestamp, side='left'))
+        highs = df['high'].to_numpy(dtype=np.float64)
+        lows = df['low'].to_numpy(dtype=np.float64)
+        closes = df['close'].to_numpy(dtype=np.float64)
+        for i in range(start, len(df)):
+            self.update(timestamps[i], float(highs[i]), float(lows[i]), float(closes[i]))
+        return self
+
+    def seed(self, df, outputs):
+        """
+        Start from batch outputs for df instead of feeding every candle
+        Only the last `warmup` candles are fed, to rebuild the running state
+        outputs: one array per output aligned with df, e.g. from the batch function
+        """
+        self.sync_frame(df.iloc[max(len(df) - self.warmup, 0):])
+        self._values = self._allocate(len(df))
+        self._values[:, :len(df)] = np.array(outputs, dtype=np.float64).reshape(len(self.outputs), len(df))
+        self._count = len(df)
+        return self
+
+    def follows(self, df):
+        """Whether df continues the candles fed so far, possibly without some of the oldest"""
+        if self.last_timestamp is None:
+            return True
+        timestamps = df['timestamp'].to_numpy()
+        index = int(np.searchsorted(timestamps, self.last_timestamp, side='left'))
+        return index < len(timestamps) and timestamps[index] == self.last_timestamp and index < self._count
+
+    def trim(self, keep):
+        """Drop outputs older than the newest `keep` candles"""
+        if self._count > keep:
+            values_so_far, self._values = self._values, self._allocate(keep)
+            self._values[:, :keep] = values_so_far[:, self._count - keep:self._count]
+            self._count = keep
+
+    def _allocate(self, count):
+        """Output storage for at least count candles, never below INITIAL_CAPACITY"""
+        return np.empty((len(self.outputs), max(count, INITIAL_CAPACITY)))
+
+    @classmethod
+    def from_frame(cls, df, *args, **kwargs):
+        return cls(*args, **kwargs).sync_frame(df)
+
+    def arrays(self, length=None):
+        """Copies of the outputs for the newest `length` candles; one array or a tuple"""
+        length = self._count if length is None else min(length, self._count)
+        result = tuple(values[self._count - length:self._count].copy() for values in self._values)
+        return result[0] if len(result) == 1 else result
+
+    def series(self, index=None):
+        """Return outputs as pandas Series, in the same order as the batch function"""
+        result = tuple(pd.Series(values[:self._count], index=index, dtype=np.float64) for values in self._values)
+        return result[0] if len(result) == 1 else result
+
+
+class IncrementalMA(IncrementalIndicator):
+    """Incremental calculate_ma"""
+    outputs = ('ma',)
+
+    def __init__(self, period, min_periods=1):
+        super().__init__()
+        self.warmup = period
+        self._mean = _RollingMean(period, min_periods)
+
+    def _step(self, high, low, close, revise):
+        return (self._mean.revise(close) if revise else self._mean.push(close),)
+
+
+class IncrementalMACD(IncrementalIndicator):
+    """Incremental calculate_macd"""
+    outputs = ('macd', 'signal', 'histogram')
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        super().__init__()
+        self.warmup = EWM_WARMUP_SPANS * (max(fast, slow) + signal)
+        self._fast = _EWM(fast)
+        self._slow = _EWM(slow)
+        self._signal = _EWM(signal)
+
+    def _step(self, high, low, close, revise):
+        op = 'revise' if revise else 'push'
+        macd = getattr(self._fast, op)(close) - getattr(self._slow, op)(close)
+        signal = getattr(self._signal, op)(macd)
+        return macd, signal, macd - signal
+
+
+class IncrementalRSI(IncrementalIndicator):
+    """Incremental calculate_rsi"""
+    outputs = ('rsi',)
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.warmup = period + 1
+        self._gain = _RollingMean(period)
+        self._loss = _RollingMean(period)
+        self._prev_close = NAN
+        self._last_close = NAN
+
+    def _step(self, high, low, close, revise):
+        if not revise:
+            self._prev_close = self._last_close
+        self._last_close = close
+        delta = close - self._prev_close
+        # Same signed zeros as delta.where(...) in the batch version
+        gain = delta if delta > 0 else 0.0
+        loss = -(delta if delta < 0 else 0.0)
+        if revise:
+            gain, loss = self._gain.revise(gain), self._loss.revise(loss)
+        else:
+            gain, loss = self._gain.push(gain), self._loss.push(loss)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rs = np.float64(gain) / np.float64(loss)
+            return (float(100 - (100 / (1 + rs))),)
+
+
+class IncrementalIchimoku(IncrementalIndicator):
+    """
+    Incremental calculate_ichimoku
+    Chikou is close shifted back by kijun, so each candle fills the value kijun bars earlier
+    """
+    outputs = ('tenkan', 'kijun', 'senkou_a', 'senkou_b', 'chikou')
+
+    def __init__(self, tenkan=9, kijun=26, senkou=52):
+        super().__init__()
+        self.warmup = max(tenkan, kijun, senkou) + kijun
+        self.kijun_period = kijun
+        self._extremes = {
+            name: (_RollingExtreme(window, 'max'), _RollingExtreme(window, 'min'))
+            for name, window in (('tenkan', tenkan), ('kijun', kijun), ('senkou', senkou))
+        }
+        self._shift_a = _Shift(kijun)
+        self._shift_b = _Shift(kijun)
+
+    def _step(self, high, low, close, revise):
+        op = 'revise' if revise else 'push'
+        mid = {
+            name: (getattr(high_max, op)(high) + getattr(low_min, op)(low)) / 2
+            for name, (high_max, low_min) in self._extremes.items()
+        }
+        senkou_a = getattr(self._shift_a, op)((mid['tenkan'] + mid['kijun']) / 2)
+        senkou_b = getattr(self._shift_b, op)(mid['senkou'])
+        count = self._count + (0 if revise else 1)
+        if count > self.kijun_period:
+            self._values[4, count - 1 - self.kijun_period] = close
+        return mid['tenkan'], mid['kijun'], senkou_a, senkou_b, NAN
+
+
+INCREMENTAL = {
+    'MA': IncrementalMA,
+    'MACD': IncrementalMACD,
+    'RSI': IncrementalRSI,
+    'Ichimoku': IncrementalIchimoku
+}
+
+
+class LiveIndicators:
+    """
+    Incremental indicators over one live candle series (one symbol and timeframe)
+    Each evaluate() only feeds the candles that arrived or were revised since the
+    previous one, so a streamed tick costs O(1) per indicator instead of a batch recompute
+    """
+
+    def __init__(self):
+        self._indicators = {}
+        self._lock = threading.Lock()
+
+    def evaluate(self, df, name, **params):
+        """Outputs of indicator `name` aligned with df: one array, or a tuple like the batch function"""
+        key = (name, tuple(sorted(params.items())))
+        with self._lock:
+            indicator = self._indicators.get(key)
+            if indicator is None or not indicator.follows(df):
+                # First use or a discontinuity: batch history, then incremental from here on
+                outputs = evaluate_indicator(df, name, **params)
+                outputs = outputs if isinstance(outputs, tuple) else (outputs,)
+                indicator = INCREMENTAL[name](**params).seed(df, [output.to_numpy() for output in outputs])
+                self._indicators[key] = indicator
+                increment("live_indicators.seeded")
+            else:
+                indicator.sync_frame(df)
+            if len(indicator) > 2 * len(df):
+                indicator.trim(len(df))
+            return indicator.arrays(len(df))
+
+
+_live = OrderedDict()
+_live_lock = threading.Lock()
+
+
+def get_live_indicators(symbol, timeframe):
+    """Return the process-wide LiveIndicators of a streamed (symbol, timeframe)"""
+    with _live_lock:
+        live = _live.get((symbol, timeframe))
+        if live is None:
+            live = _live[(symbol, timeframe)] = LiveIndicators()
+        _live.move_to_end((symbol, timeframe))
+        while len(_live) > MAX_LIVE_SERIES:
+            _live.popitem(last=False)
+        return live
@@ -0,0 +1,144 @@
+"""
+Indicator plan compiler
+
+Active indicator configs are lowered to a DAG of primitive kernels
+(ewm, rolling mean/max/min, diff, shift and a few elementwise ops).
+Nodes are identified by (op, inputs, params), so configs that share an
+intermediate such as close.ewm(span=12) or high.rolling(26).max() share
+one node, and each distinct node is evaluated once per render.
+"""
+from dataclasses import dataclass
+from src.indicators.cache import get_indicator_cache, data_key
+
+KERNELS = {
+    'ewm': lambda s, span: s.ewm(span=span, adjust=False).mean(),
+    'rolling_mean': lambda s, window, min_periods: s.rolling(window=window, min_periods=min_periods).mean(),
+    'rolling_max': lambda s, window: s.rolling(window).max(),
+    'rolling_min': lambda s, window: s.rolling(window).min(),
+    'diff': lambda s: s.diff(),
+    'shift': lambda s, periods: s.shift(periods),
+    'sub': lambda a, b: a - b,
+    'mid': lambda a, b: (a + b) / 2,
+    'gain': lambda s: s.where(s > 0, 0),
+    'loss': lambda s: -s.where(s < 0, 0),
+    'rsi': lambda gain, loss: 100 - (100 / (1 + gain / loss))
+}
+
+
+@dataclass(frozen=True)
+class Node:
+    """One kernel application; equal nodes are the same computation"""
+    op: str
+    inputs: tuple
+    params: tuple
+
+
+class Plan:
+    """DAG of primitive kernel nodes in evaluation (topological) order"""
+
+    def __init__(self):
+        self.nodes = {}
+
+    def node(self, op, *inputs, **params):
+        node = Node(op, inputs, tuple(sorted(params.items())))
+        self.nodes.setdefault(node, None)
+        return node
+
+    def column(self, name):
+        return self.node('column', name=name)
+
+    def evaluate(self, df, symbol=None, timeframe=None):
+        """
+        Evaluate every node once and return {node: Series}
+        With symbol and timeframe, nodes also go through the shared indicator cache
+        """
+        cache = get_indicator_cache() if symbol is not None else None
+        prefix = data_key(df, symbol, timeframe) if cache is not None else None
+        results = {}
+        for node in self.nodes:
+            if node.op == 'column':
+                results[node] = df[dict(node.params)['name']]
+                continue
+            compute = lambda: KERNELS[node.op](*(results[i] for i in node.inputs), **dict(node.params))
+            results[node] = cache.get_or_compute(prefix + (node,), compute) if cache is not None else compute()
+        return results
+
+
+def ma_nodes(plan, period, min_periods=1):
+    close = plan.column('close')
+    return plan.node('rolling_mean', close, window=period, min_periods=min_periods)
+
+
+def macd_nodes(plan, fast=12, slow=26, signal=9):
+    close = plan.column('close')
+    macd = plan.node('sub', plan.node('ewm', close, span=fast), plan.node('ewm', close, span=slow))
+    signal_line = plan.node('ewm', macd, span=signal)
+    return macd, signal_line, plan.node('sub', macd, signal_line)
+
+
+def rsi_nodes(plan, period=14):
+    delta = plan.node('diff', plan.column('close'))
+    gain = plan.node('rolling_mean', plan.node('gain', delta), window=period, min_periods=None)
+    loss = plan.node('rolling_mean', plan.node('loss', delta), window=period, min_periods=None)
+    return plan.node('rsi', gain, loss)
+
+
+def ichimoku_nodes(plan, tenkan=9, kijun=26, senkou=52):
+    high = plan.column('high')
+    low = plan.column('low')
+
+    def midpoint(window):
+        return plan.node('mid', plan.node('rolling_max', high, window=window),
+                         plan.node('rolling_min', low, window=window))
+
+    tenkan_line = midpoint(tenkan)
+    kijun_line = midpoint(kijun)
+    senkou_a = plan.node('shift', plan.node('mid', tenkan_line, kijun_line), periods=kijun)
+    senkou_b = plan.node('shift', midpoint(senkou), periods=kijun)
+    chikou = plan.node('shift', plan.column('close'), periods=-kijun)
+    return tenkan_line, kijun_line, senkou_a, senkou_b, chikou
+
+
+INDICATOR_NODES = {
+    'MA': ma_nodes,
+    'MACD': macd_nodes,
+    'RSI': rsi_nodes,
+    'Ichimoku': ichimoku_nodes
+}
+
+# Keys of st.session_state.indicators configs that are indicator parameters
+CONFIG_PARAMS = {
+    'MA': ('period',),
+    'MACD': ('fast', 'slow', 'signal'),
+    'RSI': ('period',),
+    'Ichimoku': ('tenkan', 'kijun', 'senkou')
+}
+
+
+def compile_indicators(indicators, **overrides):
+    """
+    Compile st.session_state.indicators into one plan
+    Returns: (plan, {indicator name: [output node(s) per config]})
+    overrides: extra params per indicator name, e.g. MA={'min_periods': None}
+    """
+    plan = Plan()
+    outputs = {}
+    for name, configs in indicators.items():
+        if name not in INDICATOR_NODES:
+            continue
+        extra = overrides.get(name, {})
+        outputs[name] = [
+            INDICATOR_NODES[name](plan, **{param: config[param] for param in CONFIG_PARAMS[name]}, **extra)
+            for config in configs
+        ]
+    return plan, outputs
+
+
+def evaluate_indicator(df, name, symbol=None, timeframe=None, **params):
+    """Evaluate a single indicator through a one-off plan"""
+    plan = Plan()
+    nodes = INDICATOR_NODES[name](plan, **params)
+    results = plan.evaluate(df, symbol, timeframe)
+    if isinstance(nodes, tuple):
+        return tuple(results[node] for node in nodes)
+    return results[nodes]
@@ -1,75 +1,134 @@
+import bisect
 import pandas as pd
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from src.indicators.cache import get_indicator_cache, data_key
+from src.indicators.planner import INDICATOR_NODES, evaluate_indicator
+from src.indicators.volume_profile import calculate_profile
 
-def calculate_ma(df, period):
+def calculate_ma(df, period, min_periods=1):
     """Calculate Moving Average"""
-    return df['close'].rolling(window=period, min_periods=1).mean()
+    return evaluate_indicator(df, 'MA', period=period, min_periods=min_periods)
+
+MA_KINDS = ('sma', 'ema', 'wma')
+MA_BATCH_BLOCK = 2048
+
+def calculate_ma_batch(df, periods, kind='sma', min_periods=None):
+    """
+    Calculate moving averages of close for many periods at once
+    SMA and WMA share one cumulative-sum pass; EMA uses ewm(adjust=False) like MACD
+    min_periods (SMA only): valid closes needed before a value is produced, defaults to the period
+    NaN closes are skipped like rolling().mean(); a WMA needs a full window of valid closes
+    Returns: float64 array of shape (len(periods), len(df))
+    """
+    if kind not in MA_KINDS:
+        raise ValueError(f"Unknown moving average kind: {kind}")
+    close = df['close'].to_numpy(dtype=np.float64)
+    periods = np.asarray(periods, dtype=np.int64)
+    result = np.full((len(periods), len(close)), np.nan)
+    if not len(close) or not len(periods):
+        return result
+    
+    if kind == 'ema':
+        for row, period in enumerate(periods):
+            result[row] = df['close'].ewm(span=int(period), adjust=False).mean().to_numpy()
+        return result
+    
+    longest = int(periods.max())
+    required = periods if min_periods is None or kind == 'wma' else np.minimum(min_periods, periods)
+    valid = ~np.isnan(close)
+    # Blocks with a local origin keep the cumulative sums small, so differences stay precise
+    for start in range(0, len(close), MA_BATCH_BLOCK):
+        end = min(start + MA_BATCH_BLOCK, len(close))
+        origin = max(start - longest + 1, 0)
+        block_valid = valid[origin:end]
+        # NaN closes add nothing to the sums and are left out of the count, like rolling().mean()
+        base = close[origin:end][block_valid][0] if block_valid.any() else 0.0
+        x = np.where(block_valid, close[origin:end] - base, 0.0)
+        sums = np.concatenate(([0.0], np.cumsum(x)))
+        counts = np.concatenate(([0], np.cumsum(block_valid)))
+        local = np.arange(start - origin, end - origin)
+        first = np.maximum(local[None, :] + 1 - periods[:, None], 0)
+        count = counts[local + 1][None, :] - counts[first]
+        window_sum = sums[local + 1][None, :] - sums[first]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if kind == 'sma':
+                values = window_sum / count
+            else:
+                # Weights 1..period: sum(j * x_j) - (i - period) * sum(x_j) over the window
+                weighted = np.concatenate(([0.0], np.cumsum(np.arange(len(x)) * x)))
+                weighted_sum = weighted[local + 1][None, :] - weighted[first]
+                values = (weighted_sum - (local[None, :] - periods[:, None]) * window_sum) / (periods * (periods + 1) / 2)[:, None]
+        result[:, start:end] = np.where((count >= required[:, None]) & (count > 0), values + base, np.nan)
+    return result
 
 def calculate_macd(df, fast=12, slow=26, signal=9):
     """Calculate MACD (Moving Average Convergence Divergence)"""
-    ema_fast = df['close'].ewm(span=fast, adjust=False).mean()
-    ema_slow = df['close'].ewm(span=slow, adjust=False).mean()
-    macd = ema_fast - ema_slow
-    signal_line = macd.ewm(span=signal, adjust=False).mean()
-    histogram = macd - signal_line
-    return macd, signal_line, histogram
+    return evaluate_indicator(df, 'MACD', fast=fast, slow=slow, signal=signal)
 
 def calculate_ichimoku(df, tenkan=9, kijun=26, senkou=52):
     """Calculate Ichimoku Cloud indicators"""
-    tenkan_line = (df['high'].rolling(tenkan).max() + df['low'].rolling(tenkan).min()) / 2
-    kijun_line = (df['high'].rolling(kijun).max() + df['low'].rolling(kijun).min()) / 2
-    senkou_a = ((tenkan_line + kijun_line) / 2).shift(kijun)
-    senkou_b = ((df['high'].rolling(senkou).max() + df['low'].rolling(senkou).min()) / 2).shift(kijun)
-    chikou = df['close'].shift(-kijun)
-    return tenkan_line, kijun_line, senkou_a, senkou_b, chikou
+    return evaluate_indicator(df, 'Ichimoku', tenkan=tenkan, kijun=kijun, senkou=senkou)
 
 def calculate_rsi(df, period=14):
     """Calculate RSI (Relative Strength Index)"""
-    delta = df['close'].diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    rs = gain / loss
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
+    return evaluate_indicator(df, 'RSI', period=period)
 
 def calculate_volume_profile(df, bins=10):
-    """Calculate Volume Profile"""
-    price_bins = pd.qcut(df['close'], q=bins, duplicates='drop')
-    volume_profile = df.groupby(price_bins)['volume'].sum()
-    return volume_profile
+    """
+    Calculate Volume Profile
+    Each candle's volume is spread over its high-low range into about `bins` equal-width price bins
+    Returns: volume Series indexed by the bins' price intervals
+    """
+    profile = calculate_profile(df, bins=bins)
+    edges = profile['prices'] - profile['bin_size'] / 2
+    index = pd.IntervalIndex.from_arrays(edges, edges + profile['bin_size'], closed='left')
+    return pd.Series(profile['volumes'], index=index, name='volume')
+
+def _accept_levels(candidates, levels, threshold):
+    """
+    Greedily accept candidate prices that are not within threshold of an accepted level
+    levels: sorted list of already accepted prices, updated in place
+    """
+    accepted = []
+    for k, price in enumerate(candidates):
+        # Only the nearest accepted level on each side can be within threshold
+        pos = bisect.bisect_left(levels, price)
+        neighbours = levels[max(pos - 1, 0):pos + 1]
+        if not any(abs(price - level) / price < threshold for level in neighbours):
+            bisect.insort(levels, price)
+            accepted.append(k)
+    return accepted
+
+def _count_touches(values, index, window, threshold):
+    """Count bars in [i-window, i+window] within threshold of values[i] for each i in index"""
+    windows = sliding_window_view(values, 2 * window + 1)[index - window]
+    prices = values[index][:, None]
+    return (np.abs(windows - prices) / prices < threshold).sum(axis=1)
 
 def find_support_resistance(df, window=20, threshold=0.02):
     """
     Find support and resistance levels using local minima and maxima
     Returns: list of tuples (price, type, strength)
     """
-    levels = []
+    low = df['low'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    local_min = df['low'].rolling(window=window, center=True).min().to_numpy()
+    local_max = df['high'].rolling(window=window, center=True).max().to_numpy()
     
-    # Get local minima and maxima
-    df['local_min'] = df['low'].rolling(window=window, center=True).min()
-    df['local_max'] = df['high'].rolling(window=window, center=True).max()
+    # Pivot candidates in the same order the levels are scanned: supports, then resistances
+    interior = np.arange(window, max(len(df) - window, window))
+    support_index = interior[low[interior] == local_min[interior]]
+    resistance_index = interior[high[interior] == local_max[interior]]
     
-    # Find support levels (local minima)
-    for i in range(window, len(df) - window):
-        if df['low'].iloc[i] == df['local_min'].iloc[i]:
-            price = df['low'].iloc[i]
-            # Check if this level is significant enough
-            if not any(abs(price - level[0]) / price < threshold for level in levels):
-                # Calculate strength based on number of touches
-                touches = sum(1 for j in range(i-window, i+window+1) 
-                            if abs(df['low'].iloc[j] - price) / price < threshold)
-                levels.append((price, 'support', touches))
-    
-    # Find resistance levels (local maxima)
-    for i in range(window, len(df) - window):
-        if df['high'].iloc[i] == df['local_max'].iloc[i]:
-            price = df['high'].iloc[i]
-            # Check if this level is significant enough
-            if not any(abs(price - level[0]) / price < threshold for level in levels):
-                # Calculate strength based on number of touches
-                touches = sum(1 for j in range(i-window, i+window+1) 
-                            if abs(df['high'].iloc[j] - price) / price < threshold)
-                levels.append((price, 'resistance', touches))
+    levels = []
+    accepted_prices = []
+    for index, values, kind in ((support_index, low, 'support'), (resistance_index, high, 'resistance')):
+        if not len(index):
+            continue
+        touches = _count_touches(values, index, window, threshold)
+        for k in _accept_levels(values[index], accepted_prices, threshold):
+            levels.append((values[index[k]], kind, int(touches[k])))
     
     # Sort levels by strength and return top 5 for each type
     support_levels = sorted([level for level in levels if level[1] == 'support'], 
@@ -77,4 +136,25 @@ def find_support_resistance(df, window=20, threshold=0.02):
     resistance_levels = sorted([level for level in levels if level[1] == 'resistance'], 
                              key=lambda x: x[2], reverse=True)[:5]
     
-    return support_levels, resistance_levels 
\ No newline at end of file
+    return support_levels, resistance_levels
+
+INDICATORS = {
+    'MA': calculate_ma,
+    'MABatch': calculate_ma_batch,
+    'MACD': calculate_macd,
+    'RSI': calculate_rsi,
+    'Ichimoku': calculate_ichimoku,
+    'VolumeProfile': calculate_volume_profile,
+    'SupportResistance': find_support_resistance
+}
+
+def cached_indicator(df, name, symbol, timeframe, **params):
+    """
+    Compute an indicator through the cache shared by all sessions
+    Results are keyed by (symbol, timeframe, newest candle, indicator, params) and must not be mutated
+    """
+    if name in INDICATOR_NODES:
+        # Planner indicators are cached per kernel node so overlapping configs share work
+        return evaluate_indicator(df, name, symbol, timeframe, **params)
+    key = data_key(df, symbol, timeframe) + (name, tuple(sorted(params.items())))
+    return get_indicator_cache().get_or_compute(key, lambda: INDICATORS[name](df, **params))
@@ -0,0 +1,197 @@
+"""
+Volume profile over fixed-width price bins
+
+Each candle's volume is spread evenly over its low-high range, so a bin receives
+the share of the candle's range it covers. Bins sit on a global grid (multiples of
+bin_size), which lets a profile grow with new prices and be updated in place as
+candles arrive, as the forming candle is revised and as the window start moves.
+"""
+import math
+import threading
+from collections import OrderedDict
+import numpy as np
+
+DEFAULT_BINS = 100
+VALUE_AREA = 0.7
+# Rebuild with a new bin size once the window spans this many times more or fewer bins than asked for
+REBIN_FACTOR = 4
+# Profiles kept for incremental updates, least recently used dropped first
+MAX_PROFILES = 64
+
+
+def nice_bin_size(span, bins):
+    """Round span / bins to 1, 2, 2.5 or 5 times a power of ten"""
+    raw = span / bins if span > 0 and bins > 0 else 0
+    if not np.isfinite(raw) or raw <= 0:
+        return 1.0
+    power = 10 ** math.floor(math.log10(raw))
+    for step in (1, 2, 2.5, 5, 10):
+        if raw <= step * power:
+            return step * power
+    return 10 * power
+
+
+def bin_volumes(low, high, volume, bin_size):
+    """
+    Spread each bar's volume over [low, high] into bins of bin_size
+    Returns: (grid index of the first bin, volume per bin)
+    """
+    low = np.asarray(low, dtype=np.float64)
+    high = np.maximum(np.asarray(high, dtype=np.float64), low)
+    volume = np.asarray(volume, dtype=np.float64)
+    first = np.floor(low / bin_size).astype(np.int64)
+    last = np.floor(high / bin_size).astype(np.int64)
+    # A high exactly on a bin edge belongs to the bin below
+    last = np.maximum(np.where(high == last * bin_size, last - 1, last), first)
+    if not len(low):
+        return 0, np.zeros(0)
+    offset = int(first.min())
+    size = int(last.max()) - offset + 2
+    first -= offset
+    last -= offset
+
+    span = high - low
+    single = first == last
+    # Bars inside one bin (including zero-range bars) put everything there
+    result = np.bincount(first[single], weights=volume[single], minlength=size).astype(np.float64)
+    multi = ~single
+    if multi.any():
+        first, last, low, high, volume, span = (array[multi] for array in (first, last, low, high, volume, span))
+        density = volume / span
+        # Partial first and last bins
+        result += np.bincount(first, weights=density * ((first + offset + 1) * bin_size - low), minlength=size)
+        result += np.bincount(last, weights=density * (high - (last + offset) * bin_size), minlength=size)
+        # Full bins in between get density * bin_size each: a difference array over bins
+        full = density * bin_size
+        inner = last - first > 1
+        steps = np.bincount(first[inner] + 1, weights=full[inner], minlength=size)
+        steps -= np.bincount(last[inner], weights=full[inner], minlength=size)
+        result += np.cumsum(steps)
+    return offset, result[:size - 1]
+
+
+def value_area(volumes, poc, share=VALUE_AREA):
+    """
+    (low, high) bin indices of the value area: grow from the POC towards the
+    side with more volume until `share` of the total is covered
+    """
+    target = volumes.sum() * share
+    low = high = poc
+    covered = volumes[poc]
+    while covered < target and (low > 0 or high < len(volumes) - 1):
+        below = volumes[low - 1] if low > 0 else -1.0
+        above = volumes[high + 1] if high < len(volumes) - 1 else -1.0
+        if above >= below:
+            high += 1
+            covered += above
+        else:
+            low -= 1
+            covered += below
+    return low, high
+
+
+class VolumeProfile:
+    """Volume per price bin over a window of candles that can be updated in place"""
+
+    def __init__(self, bin_size):
+        self.bin_size = bin_size
+        self.offset = 0
+        self.volumes = np.zeros(0)
+        self.start = None
+        self.end = None
+        self._last = None
+
+    def _add(self, low, high, volume, sign=1.0):
+        offset, volumes = bin_volumes(low, high, volume, self.bin_size)
+        if not len(volumes):
+            return
+        # Grow the bin array to cover both ranges
+        new_offset = min(self.offset, offset) if len(self.volumes) else offset
+        new_end = max(self.offset + len(self.volumes), offset + len(volumes)) if len(self.volumes) else offset + len(volumes)
+        if new_offset != self.offset or new_end != self.offset + len(self.volumes):
+            grown = np.zeros(new_end - new_offset)
+            grown[self.offset - new_offset:self.offset - new_offset + len(self.volumes)] = self.volumes
+            self.offset, self.volumes = new_offset, grown
+        self.volumes[offset - self.offset:offset - self.offset + len(volumes)] += sign * volumes
+
+    def update(self, timestamp, low, high, volume, start=0):
+        """
+        Bring the profile to bars[start:] of the given arrays, reusing what it already holds
+        The newest bar may be a revision of the one added last time
+        """
+        n = len(timestamp)
+        if not n or start >= n:
+            self.offset, self.volumes, self.start, self.end, self._last = 0, np.zeros(0), None, None, None
+            return self
+        start_ts = timestamp[start]
+        rebuild = (self.start is None or self.start > start_ts or self.start < timestamp[0]
+                   or self.end < start_ts)
+        if not rebuild:
+            end_index = int(np.searchsorted(timestamp, self.end))
+            rebuild = end_index >= n or timestamp[end_index] != self.end
+        if rebuild:
+            self.offset, self.volumes = 0, np.zeros(0)
+            self._add(low[start:], high[start:], volume[start:])
+        else:
+            # Bars that left the window, the stale copy of the last bar, then everything from it on
+            old_start = int(np.searchsorted(timestamp, self.start))
+            if old_start < start:
+                self._add(low[old_start:start], high[old_start:start], volume[old_start:start], sign=-1.0)
+            self._add(*(np.array([value]) for value in self._last), sign=-1.0)
+            self._add(low[end_index:], high[end_index:], volume[end_index:])
+            np.maximum(self.volumes, 0.0, out=self.volumes)
+        self.start, self.end = start_ts, timestamp[-1]
+        self._last = (low[-1], high[-1], volume[-1])
+        return self
+
+    def snapshot(self, share=VALUE_AREA):
+        """Bin centers and volumes with the point of control and value area prices"""
+        volumes = self.volumes.copy()
+        prices = (self.offset + np.arange(len(volumes)) + 0.5) * self.bin_size
+        result = {'prices': prices, 'volumes': volumes, 'bin_size': self.bin_size,
+                  'poc': None, 'value_area': None}
+        if len(volumes) and volumes.sum() > 0:
+            poc = int(np.argmax(volumes))
+            low, high = value_area(volumes, poc, share)
+            result['poc'] = float(prices[poc])
+            result['value_area'] = (float(prices[low] - self.bin_size / 2), float(prices[high] + self.bin_size / 2))
+        return result
+
+
+_profiles = OrderedDict()
+_profiles_lock = threading.Lock()
+
+
+def calculate_profile(df, start=0, bins=DEFAULT_BINS, share=VALUE_AREA):
+    """Volume profile snapshot of df[start:], built from scratch"""
+    low = df['low'].to_numpy(dtype=np.float64)[start:]
+    high = df['high'].to_numpy(dtype=np.float64)[start:]
+    if not len(low):
+        return VolumeProfile(1.0).snapshot(share)
+    profile = VolumeProfile(nice_bin_size(high.max() - low.min(), bins))
+    timestamp = df['timestamp'].to_numpy()[start:]
+    return profile.update(timestamp, low, high, df['volume'].to_numpy(dtype=np.float64)[start:]).snapshot(share)
+
+
+def cached_profile(df, key, start=0, bins=DEFAULT_BINS, share=VALUE_AREA):
+    """
+    Volume profile snapshot of df[start:], updated in place from the last call with the same key
+    key: identifies the series and window, e.g. (symbol, timeframe, view)
+    """
+    timestamp = df['timestamp'].to_numpy()
+    low = df['low'].to_numpy(dtype=np.float64)
+    high = df['high'].to_numpy(dtype=np.float64)
+    volume = df['volume'].to_numpy(dtype=np.float64)
+    if start >= len(df):
+        return VolumeProfile(1.0).snapshot(share)
+    span = high[start:].max() - low[start:].min()
+    with _profiles_lock:
+        profile = _profiles.get((key, bins))
+        if profile is None or not bins / REBIN_FACTOR <= span / profile.bin_size <= bins * REBIN_FACTOR:
+            profile = VolumeProfile(nice_bin_size(span, bins))
+        _profiles[(key, bins)] = profile
+        _profiles.move_to_end((key, bins))
+        while len(_profiles) > MAX_PROFILES:
+            _profiles.popitem(last=False)
+        # Sessions rendering the same series share one profile
+        return profile.update(timestamp, low, high, volume, start).snapshot(share)
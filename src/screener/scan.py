@@ -0,0 +1,122 @@
+"""
+Market screener across KuCoin USDT pairs
+
+Recent candles for every pair are fetched concurrently on one event loop with a
+bounded number of requests in flight, then each pair is summarised with the
+indicator functions the chart uses.
+"""
+import asyncio
+import time
+import numpy as np
+import pandas as pd
+from src.api import async_client
+from src.api.kucoin import TIMEFRAME_MAP, TIMEFRAME_SECONDS, MAX_CANDLES_PER_REQUEST, parse_candles
+from src.indicators.technical import calculate_rsi, calculate_macd, calculate_ma_batch, find_support_resistance
+from src.utils.metrics import increment, span
+
+QUOTE = "USDT"
+DEFAULT_TIMEFRAME = "1h"
+DEFAULT_BARS = 200
+RSI_PERIOD = 14
+MA_PERIOD = 50
+# A MACD cross within this many bars is reported as a fresh cross
+CROSS_LOOKBACK = 3
+
+COLUMNS = ['symbol', 'last', 'change_rate', 'vol_value', 'rsi', 'macd_state',
+           'ma_distance', 'level', 'level_type', 'level_distance']
+
+
+def usdt_pairs(tickers, limit=None):
+    """USDT pairs from the all-tickers snapshot, by 24h quote volume, optionally the top `limit`"""
+    pairs = tickers[tickers.index.str.endswith(f"-{QUOTE}")].sort_values('volValue', ascending=False)
+    return list(pairs.index[:limit])
+
+
+async def fetch_recent(session, semaphore, symbol, timeframe, bars):
+    """The last `bars` candles of symbol as Candles"""
+    end = int(time.time())
+    params = {
+        'type': TIMEFRAME_MAP[timeframe],
+        'symbol': symbol,
+        'startAt': end - bars * TIMEFRAME_SECONDS[timeframe],
+        'endAt': end
+    }
+    async with semaphore:
+        data = await async_client.get(session, "/api/v1/market/candles", params=params)
+    if data['code'] != '200000':
+        raise ValueError(f"API Error: {data.get('msg')}")
+    return parse_candles(data['data'])
+
+
+async def fetch_all(symbols, timeframe, bars, concurrency):
+    """{symbol: Candles or the exception that stopped it}"""
+    semaphore = asyncio.Semaphore(concurrency)
+    async with async_client.create_session(concurrency) as session:
+        results = await asyncio.gather(
+            *(fetch_recent(session, semaphore, symbol, timeframe, bars) for symbol in symbols),
+            return_exceptions=True
+        )
+    return dict(zip(symbols, results))
+
+
+def macd_state(macd, signal):
+    """'bullish'/'bearish' side of the signal line, with a '_cross' suffix for a fresh cross"""
+    side = np.sign(macd - signal)
+    side = side[np.isfinite(side) & (side != 0)]
+    if not len(side):
+        return None
+    state = 'bullish' if side[-1] > 0 else 'bearish'
+    recent = side[-CROSS_LOOKBACK - 1:]
+    return f"{state}_cross" if np.any(recent != side[-1]) else state
+
+
+def analyse(df):
+    """Indicator summary of one pair's candles"""
+    close = float(df['close'].iloc[-1])
+    rsi = calculate_rsi(df, RSI_PERIOD).iloc[-1]
+    macd, signal, _ = calculate_macd(df)
+    ma = calculate_ma_batch(df, (MA_PERIOD,))[0, -1]
+    support, resistance = find_support_resistance(df)
+    levels = [(price, kind) for price, kind, _ in support + resistance]
+    level, level_type = min(levels, key=lambda item: abs(item[0] - close)) if levels else (np.nan, None)
+    return {
+        'rsi': float(rsi),
+        'macd_state': macd_state(macd.to_numpy(), signal.to_numpy()),
+        'ma_distance': (close / ma - 1) * 100 if np.isfinite(ma) else np.nan,
+        'level': float(level),
+        'level_type': level_type,
+        'level_distance': (level / close - 1) * 100
+    }
+
+
+def screen(tickers, timeframe=DEFAULT_TIMEFRAME, bars=DEFAULT_BARS, limit=None,
+           concurrency=async_client.DEFAULT_CONCURRENCY):
+    """
+    Scan USDT pairs from the all-tickers snapshot
+    Returns: (DataFrame with COLUMNS, one row per pair that could be analysed, {symbol: error})
+    """
+    symbols = usdt_pairs(tickers, limit)
+    bars = min(bars, MAX_CANDLES_PER_REQUEST)
+    with span("screener.fetch"):
+        candles = asyncio.run(fetch_all(symbols, timeframe, bars, concurrency))
+
+    rows = []
+    errors = {}
+    with span("screener.analyse"):
+        for symbol, result in candles.items():
+            if isinstance(result, Exception):
+                errors[symbol] = repr(result)
+                continue
+            # Too short for the slowest indicator window to mean anything
+            if len(result) < MA_PERIOD:
+                continue
+            ticker = tickers.loc[symbol]
+            rows.append({
+                'symbol': symbol,
+                'last': ticker['last'],
+                'change_rate': ticker['changeRate'] * 100,
+                'vol_value': ticker['volValue'],
+                **analyse(result.to_frame())
+            })
+    increment("screener.pairs", len(rows))
+    return pd.DataFrame(rows, columns=COLUMNS), errors
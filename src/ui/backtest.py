@@ -0,0 +1,135 @@
+import streamlit as st
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+from src.backtest.engine import run_backtest, DEFAULT_FEE
+from src.ui.downsample import LevelOfDetail
+from src.utils.metrics import span
+
+def rule_inputs(texts):
+    """Rule pickers with their parameters; returns the rules for run_backtest"""
+    labels = {
+        'ma_cross': texts["rule_ma_cross"],
+        'macd': texts["rule_macd"],
+        'rsi': texts["rule_rsi"],
+        'ichimoku': texts["rule_ichimoku"]
+    }
+    selected = st.multiselect(texts["backtest_rules"], list(labels), default=['ma_cross'],
+                              format_func=labels.get, key="backtest_rules")
+    rules = []
+    for name in selected:
+        st.caption(labels[name])
+        if name == 'ma_cross':
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                fast = st.number_input("Fast", min_value=1, value=20, key="bt_ma_fast")
+            with col2:
+                slow = st.number_input("Slow", min_value=1, value=50, key="bt_ma_slow")
+            with col3:
+                kind = st.selectbox("Type", ["SMA", "EMA", "WMA"], key="bt_ma_kind")
+            rules.append({'rule': name, 'fast': fast, 'slow': slow, 'kind': kind.lower()})
+        elif name == 'macd':
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                fast = st.number_input("Fast", min_value=1, value=12, key="bt_macd_fast")
+            with col2:
+                slow = st.number_input("Slow", min_value=1, value=26, key="bt_macd_slow")
+            with col3:
+                signal = st.number_input("Signal", min_value=1, value=9, key="bt_macd_signal")
+            rules.append({'rule': name, 'fast': fast, 'slow': slow, 'signal': signal})
+        elif name == 'rsi':
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                period = st.number_input("Period", min_value=1, value=14, key="bt_rsi_period")
+            with col2:
+                lower = st.number_input("Lower", min_value=0, max_value=100, value=30, key="bt_rsi_lower")
+            with col3:
+                upper = st.number_input("Upper", min_value=0, max_value=100, value=70, key="bt_rsi_upper")
+            rules.append({'rule': name, 'period': period, 'lower': lower, 'upper': upper})
+        elif name == 'ichimoku':
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                tenkan = st.number_input("Tenkan", min_value=1, value=9, key="bt_ichi_tenkan")
+            with col2:
+                kijun = st.number_input("Kijun", min_value=1, value=26, key="bt_ichi_kijun")
+            with col3:
+                senkou = st.number_input("Senkou", min_value=1, value=52, key="bt_ichi_senkou")
+            rules.append({'rule': name, 'tenkan': tenkan, 'kijun': kijun, 'senkou': senkou})
+    return rules
+
+def render_backtest(load_candles, texts, symbol, timeframe):
+    """
+    Backtest the chosen rules when asked and show equity, drawdown and trades
+    load_candles: returns the candle frame, or None after showing why it could not
+    """
+    settings_col, result_col = st.columns([1, 3])
+    with settings_col:
+        rules = rule_inputs(texts)
+        fee = st.number_input(texts["backtest_fee"], min_value=0.0, max_value=5.0,
+                              value=DEFAULT_FEE * 100, step=0.01, format="%.3f", key="bt_fee") / 100
+        allow_short = st.checkbox(texts["backtest_short"], value=False, key="bt_short")
+        start = st.button(texts["backtest_run"], key="backtest_run", disabled=not rules)
+
+    with result_col:
+        if not rules:
+            st.info(texts["backtest_no_rules"])
+            return
+        # Candles are only loaded and the figure only built on request; reruns redraw the stored result
+        settings = (symbol, timeframe, rules, fee, allow_short)
+        if start:
+            df = load_candles()
+            if df is None:
+                return
+            with span("backtest.run"):
+                result = run_backtest(df, rules, fee=fee, allow_short=allow_short, timeframe=timeframe, symbol=symbol)
+            st.session_state.backtest_result = (settings, result.stats, result_figure(df, result, texts), result.trades)
+
+        last = st.session_state.get('backtest_result')
+        if last is None or last[0] != settings:
+            st.info(texts["backtest_hint"])
+            return
+        _, stats, fig, trades = last
+
+        col1, col2, col3, col4, col5 = st.columns(5)
+        col1.metric(texts["backtest_return"], f"{stats['total_return'] * 100:+.2f}%")
+        col2.metric(texts["backtest_drawdown"], f"{stats['max_drawdown'] * 100:.2f}%")
+        col3.metric(texts["backtest_sharpe"], f"{stats['sharpe']:.2f}")
+        col4.metric(texts["backtest_trades"], f"{stats['trades']:,}")
+        col5.metric(texts["backtest_win_rate"], f"{stats['win_rate'] * 100:.1f}%")
+        st.plotly_chart(fig, use_container_width=True, config={'displaylogo': False})
+
+        st.caption(texts["backtest_trade_list"])
+        trades = trades.copy()
+        trades['return'] *= 100
+        st.dataframe(
+            trades.iloc[::-1],
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'entry_price': st.column_config.NumberColumn(format="$%.4f"),
+                'exit_price': st.column_config.NumberColumn(format="$%.4f"),
+                'return': st.column_config.NumberColumn(format="%+.2f%%")
+            }
+        )
+
+def result_figure(df, result, texts):
+    """Equity and drawdown of a backtest result over df"""
+    # Long histories are downsampled the same way as chart overlays
+    lod = LevelOfDetail(df)
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.7, 0.3], vertical_spacing=0.03)
+    x, y = lod.line(result.equity)
+    fig.add_trace(go.Scatter(x=x, y=y, name=texts["backtest_equity"],
+                             line=dict(color='#3b82f6', width=1)), row=1, col=1)
+    x, y = lod.line(result.drawdown * 100)
+    fig.add_trace(go.Scatter(x=x, y=y, name=texts["backtest_drawdown"], fill='tozeroy',
+                             line=dict(color='#ef4444', width=1)), row=2, col=1)
+    fig.update_layout(
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        margin=dict(t=30, l=0, r=0, b=0),
+        height=500,
+        showlegend=False
+    )
+    fig.update_yaxes(title_text=texts["backtest_equity"], side='right', row=1, col=1)
+    fig.update_yaxes(title_text="%", side='right', row=2, col=1)
+    return fig
@@ -1,16 +1,31 @@
 import streamlit as st
+import numpy as np
+import pandas as pd
 import plotly.graph_objects as go
-from src.indicators.technical import (
-    calculate_ma, calculate_macd, calculate_ichimoku,
-    calculate_rsi, calculate_volume_profile, find_support_resistance
-)
-from src.api.kucoin import fetch_market_info
+from src.indicators.technical import cached_indicator, MA_KINDS
+from src.indicators.planner import compile_indicators, CONFIG_PARAMS
+from src.indicators.cache import data_key
+from src.indicators.volume_profile import cached_profile
+from src.ui.downsample import LevelOfDetail, DEFAULT_MAX_POINTS
+from src.ui.figure_model import FigureModel
+from src.utils.metrics import increment, span
 import time
 
-def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_crosshair, 
-                   symbol, timeframe):
-    # Display market info
-    market_info = fetch_market_info(symbol)
+# The longest volume profile bar spans 1 / VOLUME_PROFILE_WIDTH of the chart width
+VOLUME_PROFILE_WIDTH = 4
+# Price bins of the volume profile over the visible range
+VOLUME_PROFILE_BINS = 100
+
+def level_lines(prices, start, end):
+    """x/y data drawing horizontal levels between start and end as one NaN-separated line"""
+    # ISO strings with None gaps keep the figure on orjson's fast path; object arrays and NaT fall back to pure Python
+    x = [str(np.datetime_as_string(start)), str(np.datetime_as_string(end)), None] * len(prices)
+    y = np.full(3 * len(prices), np.nan)
+    y[0::3] = y[1::3] = prices
+    return {'x': x, 'y': y}
+
+def render_market_info(market_info, texts):
+    """Price, change, volume and market cap cards; nothing when market_info is None"""
     if market_info:
         col1, col2, col3, col4 = st.columns(4)
         
@@ -50,177 +65,248 @@ def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_cro
         
         # Add spacing between info boxes and chart
         st.markdown("<div style='margin-bottom: 2rem;'></div>", unsafe_allow_html=True)
+
+def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_crosshair, 
+                   symbol, timeframe, market_info=None, view_seconds=None, max_points=DEFAULT_MAX_POINTS,
+                   webgl=False, figure_model=None, volume_profile=False, live_indicators=None):
+    # Display market info; callers fetch it, e.g. alongside the candles with fetch_chart_data
+    render_market_info(market_info, texts)
+    # A timed-out or failed fetch can leave no candles, and possibly no stats either
+    if df is None or df.empty:
+        st.error(texts["error_no_data"])
+        return
     
     # Create two columns for chart and right sidebar
     chart_col, right_sidebar = st.columns([3, 1])
     
     with chart_col:
-        # Create candlestick chart
-        fig = go.Figure()
+        # Reuse this session's figure and only patch traces whose inputs changed
+        if figure_model is None:
+            figure_model = st.session_state.setdefault('figure_model', FigureModel())
+        
+        # WebGL line traces render large overlays much faster than SVG
+        Scatter = go.Scattergl if webgl else go.Scatter
+        
+        # Indicators use the full history; only the visible range is sent, downsampled past max_points
+        view_start = 0
+        if view_seconds:
+            view_start = int(df['timestamp'].searchsorted(df['timestamp'].iloc[-1] - pd.Timedelta(seconds=view_seconds)))
+        lod = LevelOfDetail(df, view_start, max_points)
+        # Every data-dependent trace is rebuilt from the same candles and visible range
+        version = (data_key(df, symbol, timeframe), view_start, max_points)
+        
+        def line(values):
+            return lambda: dict(zip(('x', 'y'), lod.line(values)))
         
         # Add candlestick
-        fig.add_trace(go.Candlestick(
-            x=df['timestamp'],
-            open=df['open'],
-            high=df['high'],
-            low=df['low'],
-            close=df['close'],
+        figure_model.trace('OHLC', go.Candlestick, version,
+            lambda: {
+                'x': lod.candles['timestamp'],
+                'open': lod.candles['open'],
+                'high': lod.candles['high'],
+                'low': lod.candles['low'],
+                'close': lod.candles['close']
+            },
             increasing_line_color='#22c55e',
             decreasing_line_color='#ef4444',
             increasing_fillcolor='#22c55e',
             decreasing_fillcolor='#ef4444',
             name='OHLC'
-        ))
+        )
+        
+        with span("chart.indicators"):
+            if live_indicators is not None:
+                # Streaming: only the candles that arrived or were revised since the last render are fed
+                outputs = {
+                    name: [live_indicators.evaluate(df, name, **{param: config[param] for param in CONFIG_PARAMS[name]})
+                           for config in configs]
+                    for name, configs in indicators.items() if name != 'MA'
+                }
+            else:
+                # Evaluate the other indicator configs as one plan so shared intermediates are computed once
+                plan, indicator_nodes = compile_indicators({name: configs for name, configs in indicators.items() if name != 'MA'})
+                results = plan.evaluate(df, symbol, timeframe)
+                outputs = {
+                    name: [tuple(results[node] for node in nodes) if isinstance(nodes, tuple) else results[nodes]
+                           for nodes in config_nodes]
+                    for name, config_nodes in indicator_nodes.items()
+                }
+            
+            # Moving Averages, one batched pass per kind
+            ma_batches = []
+            for kind in MA_KINDS:
+                ma_configs = [ma for ma in indicators['MA'] if ma.get('kind', 'SMA').lower() == kind]
+                if not ma_configs:
+                    continue
+                if live_indicators is not None and kind == 'sma':
+                    ma_matrix = [live_indicators.evaluate(df, 'MA', period=ma['period'], min_periods=ma['period'])
+                                 for ma in ma_configs]
+                else:
+                    ma_matrix = cached_indicator(
+                        df, 'MABatch', symbol, timeframe, periods=tuple(ma['period'] for ma in ma_configs), kind=kind)
+                ma_batches.append((kind, ma_configs, ma_matrix))
         
         # Add Moving Averages
-        for ma in indicators['MA']:
-            ma_data = df['close'].rolling(window=ma['period']).mean()
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=ma_data,
-                line=dict(color=ma['color'], width=1),
-                name=f"MA({ma['period']})"
-            ))
+        for kind, ma_configs, ma_matrix in ma_batches:
+            for ma, ma_data in zip(ma_configs, ma_matrix):
+                figure_model.trace(f"MA-{kind}-{ma['period']}", Scatter, version, line(ma_data),
+                    line=dict(color=ma['color'], width=1),
+                    name=f"{kind.upper()}({ma['period']})"
+                )
         
         # Add MACD
-        for macd_config in indicators['MACD']:
-            exp1 = df['close'].ewm(span=macd_config['fast'], adjust=False).mean()
-            exp2 = df['close'].ewm(span=macd_config['slow'], adjust=False).mean()
-            macd = exp1 - exp2
-            signal = macd.ewm(span=macd_config['signal'], adjust=False).mean()
-            histogram = macd - signal
+        for macd_config, (macd, signal, histogram) in zip(indicators['MACD'], outputs['MACD']):
+            params = f"{macd_config['fast']},{macd_config['slow']},{macd_config['signal']}"
             
             # Create new y-axis for MACD
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=macd,
-                name=f"MACD({macd_config['fast']},{macd_config['slow']},{macd_config['signal']})",
+            figure_model.trace(f"MACD-{params}", Scatter, version, line(macd),
+                name=f"MACD({params})",
                 line=dict(color='#3b82f6', width=1),
                 yaxis='y2'
-            ))
+            )
             
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=signal,
+            figure_model.trace(f"MACD-{params}-signal", Scatter, version, line(signal),
                 name='Signal',
                 line=dict(color='#f59e0b', width=1),
                 yaxis='y2'
-            ))
+            )
+            
+            def histogram_data(values=histogram):
+                line_x, line_y = lod.line(values)
+                # Numeric colors through a two-color scale validate far faster than per-bar color strings
+                return {'x': line_x, 'y': line_y, 'marker_color': np.where(line_y >= 0, 1.0, 0.0)}
             
-            fig.add_trace(go.Bar(
-                x=df['timestamp'],
-                y=histogram,
+            figure_model.trace(f"MACD-{params}-histogram", go.Bar, version, histogram_data,
                 name='Histogram',
                 marker=dict(
-                    color=['#22c55e' if val >= 0 else '#ef4444' for val in histogram],
+                    colorscale=[[0, '#ef4444'], [1, '#22c55e']],
+                    cmin=0,
+                    cmax=1,
                     opacity=0.5
                 ),
                 yaxis='y2'
-            ))
+            )
         
         # Add RSI
-        for rsi_config in indicators['RSI']:
-            delta = df['close'].diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=rsi_config['period']).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=rsi_config['period']).mean()
-            rs = gain / loss
-            rsi = 100 - (100 / (1 + rs))
-            
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'],
-                y=rsi,
+        for rsi_config, rsi in zip(indicators['RSI'], outputs['RSI']):
+            figure_model.trace(f"RSI-{rsi_config['period']}", Scatter, version, line(rsi),
                 name=f"RSI({rsi_config['period']})",
                 line=dict(color=rsi_config['color'], width=1),
                 yaxis='y3'
-            ))
+            )
         
         # Add Ichimoku
-        for ichi_config in indicators['Ichimoku']:
-            # Conversion Line (Tenkan-sen)
-            high_9 = df['high'].rolling(window=ichi_config['tenkan']).max()
-            low_9 = df['low'].rolling(window=ichi_config['tenkan']).min()
-            tenkan_sen = (high_9 + low_9) / 2
-            
-            # Base Line (Kijun-sen)
-            high_26 = df['high'].rolling(window=ichi_config['kijun']).max()
-            low_26 = df['low'].rolling(window=ichi_config['kijun']).min()
-            kijun_sen = (high_26 + low_26) / 2
-            
-            # Leading Span A (Senkou Span A)
-            senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(ichi_config['kijun'])
-            
-            # Leading Span B (Senkou Span B)
-            high_52 = df['high'].rolling(window=ichi_config['senkou']).max()
-            low_52 = df['low'].rolling(window=ichi_config['senkou']).min()
-            senkou_span_b = ((high_52 + low_52) / 2).shift(ichi_config['kijun'])
-            
-            # Lagging Span (Chikou Span)
-            chikou_span = df['close'].shift(-ichi_config['kijun'])
+        for ichi_config, ichimoku in zip(indicators['Ichimoku'], outputs['Ichimoku']):
+            # Conversion line, base line, leading spans A/B and lagging span
+            tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span = ichimoku
+            params = f"{ichi_config['tenkan']},{ichi_config['kijun']},{ichi_config['senkou']}"
             
             # Add traces
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=tenkan_sen,
+            figure_model.trace(f"Ichimoku-{params}-tenkan", Scatter, version, line(tenkan_sen),
                 name=f'Tenkan-sen ({ichi_config["tenkan"]})',
                 line=dict(color='#3b82f6', width=1)
-            ))
+            )
             
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=kijun_sen,
+            figure_model.trace(f"Ichimoku-{params}-kijun", Scatter, version, line(kijun_sen),
                 name=f'Kijun-sen ({ichi_config["kijun"]})',
                 line=dict(color='#ef4444', width=1)
-            ))
+            )
             
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=senkou_span_a,
+            figure_model.trace(f"Ichimoku-{params}-senkou-a", Scatter, version, line(senkou_span_a),
                 name=f'Senkou Span A',
                 line=dict(color='#22c55e', width=1),
                 fill=None
-            ))
+            )
             
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=senkou_span_b,
+            figure_model.trace(f"Ichimoku-{params}-senkou-b", Scatter, version, line(senkou_span_b),
                 name=f'Senkou Span B',
                 line=dict(color='#ef4444', width=1),
                 fill='tonexty'
-            ))
+            )
             
-            fig.add_trace(go.Scatter(
-                x=df['timestamp'], y=chikou_span,
+            figure_model.trace(f"Ichimoku-{params}-chikou", Scatter, version, line(chikou_span),
                 name=f'Chikou Span',
                 line=dict(color='#8b5cf6', width=1)
-            ))
+            )
         
         # Add Support and Resistance Levels
-        support_levels, resistance_levels = find_support_resistance(df)
+        with span("chart.support_resistance"):
+            support_levels, resistance_levels = cached_indicator(df, 'SupportResistance', symbol, timeframe)
         
-        # Get current price
-        current_price = float(market_info['last'])
+        # Get current price, from the last candle when market stats are unavailable
+        current_price = float(market_info['last']) if market_info else float(df['close'].iloc[-1])
         
         # Sort levels by price (high to low)
         resistance_levels = sorted(resistance_levels, key=lambda x: (-x[0], -x[2]))  # Sort by price desc, then strength desc
         support_levels = sorted(support_levels, key=lambda x: (-x[0], -x[2]))  # Sort by price desc, then strength desc
         
         # Add support and resistance lines to chart
-        for price, _, strength in support_levels:
-            # Skip levels with strength 11
-            if strength == 11:
-                continue
-                
-            # Only show support lines below current price
-            if price < current_price:
+        # Skip levels with strength 11; only show support below and resistance above the current price
+        visible_support = [price for price, _, strength in support_levels
+                           if strength != 11 and price < current_price]
+        visible_resistance = [price for price, _, strength in resistance_levels
+                              if strength != 11 and price > current_price]
+        
+        # Volume by price over the visible range, updated in place as candles arrive
+        profile = None
+        if volume_profile and len(df):
+            with span("chart.volume_profile"):
+                profile = cached_profile(df, (symbol, timeframe, view_seconds), view_start, bins=VOLUME_PROFILE_BINS)
+        if profile and profile['poc'] is not None:
+            value_low, value_high = profile['value_area']
+            
+            def profile_data(profile=profile):
+                inside = (profile['prices'] >= value_low) & (profile['prices'] <= value_high)
+                return {'x': profile['volumes'], 'y': profile['prices'], 'marker_color': inside.astype(float)}
+            
+            # The profile can change without the candles' version, e.g. when the visible range moves
+            profile_version = (version, float(profile['volumes'].sum()), profile['bin_size'], profile['value_area'])
+            figure_model.trace('VolumeProfile', go.Bar, profile_version, profile_data,
+                name=texts["volume_profile"],
+                orientation='h',
+                width=profile['bin_size'],
+                marker=dict(
+                    colorscale=[[0, '#64748b'], [1, '#f59e0b']],
+                    cmin=0,
+                    cmax=1,
+                    opacity=0.3
+                ),
+                hovertemplate='%{y}: %{x:,.0f}<extra></extra>',
+                xaxis='x2'
+            )
+        
+        fig = figure_model.figure
+        fig.layout.shapes = ()
+        if profile and profile['poc'] is not None:
+            fig.add_hline(y=profile['poc'], line_color="#f59e0b", line_width=1)
+            for price in profile['value_area']:
+                fig.add_hline(y=price, line_dash="dot", line_color="#f59e0b", line_width=0.5)
+        if webgl:
+            # One NaN-separated trace per level type instead of one layout shape per level
+            for key, prices, color, name in (('support', visible_support, '#22c55e', texts["support_levels"]),
+                                             ('resistance', visible_resistance, '#ef4444', texts["resistance_levels"])):
+                if prices and len(lod.timestamps):
+                    figure_model.trace(f"SR-{key}", go.Scattergl, (version, tuple(prices)),
+                        lambda prices=prices: level_lines(prices, lod.timestamps[0], lod.timestamps[-1]),
+                        mode='lines',
+                        name=name,
+                        line=dict(color=color, width=0.5, dash='dash'),
+                        connectgaps=False
+                    )
+        else:
+            for price in visible_support:
                 fig.add_hline(y=price, line_dash="dash", line_color="#22c55e", 
                              line_width=0.5)
-        
-        for price, _, strength in resistance_levels:
-            # Skip levels with strength 11
-            if strength == 11:
-                continue
-                
-            # Only show resistance lines above current price
-            if price > current_price:
+            
+            for price in visible_resistance:
                 fig.add_hline(y=price, line_dash="dash", line_color="#ef4444", 
                              line_width=0.5)
         
+        with span("chart.figure"):
+            fig = figure_model.sync()
+        increment("figure.traces_built", figure_model.built)
+        increment("figure.traces_patched", figure_model.patched)
+        
         # Update layout for multiple y-axes
         layout_updates = {
             'yaxis': dict(
@@ -247,6 +333,7 @@ def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_cro
         }
         
         # Add MACD subplot if exists
+        fig.layout.yaxis2 = None
         if indicators['MACD']:
             layout_updates['yaxis2'] = dict(
                 title='MACD',
@@ -258,6 +345,7 @@ def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_cro
             )
         
         # Add RSI subplot if exists
+        fig.layout.yaxis3 = None
         if indicators['RSI']:
             layout_updates['yaxis3'] = dict(
                 title='RSI',
@@ -269,6 +357,18 @@ def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_cro
                 position=0.95
             )
         
+        # Volume profile histogram along the right edge, next to the price axis
+        fig.layout.xaxis2 = None
+        if profile and profile['poc'] is not None:
+            layout_updates['xaxis2'] = dict(
+                overlaying='x',
+                side='top',
+                range=[profile['volumes'].max() * VOLUME_PROFILE_WIDTH, 0],
+                showgrid=False,
+                showticklabels=False,
+                zeroline=False
+            )
+        
         # Update layout
         fig.update_layout(**layout_updates)
         
@@ -280,8 +380,9 @@ def plot_candlestick(df, indicators, texts, language, theme, show_grid, show_cro
             'modeBarButtonsToAdd': ['drawline', 'eraseshape']
         }
         
-        # Display chart
-        st.plotly_chart(fig, use_container_width=True, config=config)
+        # Display chart; Streamlit serializes the figure here
+        with span("chart.serialize"):
+            st.plotly_chart(fig, use_container_width=True, config=config)
         
     # Display support and resistance levels in right sidebar
     with right_sidebar:
@@ -0,0 +1,49 @@
+import streamlit as st
+import pandas as pd
+from src.utils.metrics import get_metrics
+
+def remember_rerun(trace):
+    """Keep a finished trace as this session's last run of its kind"""
+    if trace is not None and trace.seconds is not None:
+        st.session_state.setdefault('last_reruns', {})[trace.kind] = trace
+
+def render_debug_metrics(texts):
+    """Show this session's last rerun breakdown and process-wide latency percentiles"""
+    metrics = get_metrics()
+    with st.expander(texts["debug_metrics"]):
+        for kind in ("script", "chart"):
+            trace = st.session_state.get('last_reruns', {}).get(kind)
+            if trace is None:
+                continue
+            st.caption(f"{texts['last_rerun']} ({kind}): {trace.seconds * 1000:,.1f} ms")
+            st.dataframe(
+                pd.DataFrame({
+                    'span': list(trace.spans),
+                    'ms': [seconds * 1000 for seconds in trace.spans.values()]
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+
+        summary = metrics.summary()
+        if summary:
+            st.caption(texts["latency_percentiles"])
+            st.dataframe(
+                pd.DataFrame({
+                    'span': list(summary),
+                    'count': [stats['count'] for stats in summary.values()],
+                    'p50 ms': [stats['p50'] * 1000 for stats in summary.values()],
+                    'p99 ms': [stats['p99'] * 1000 for stats in summary.values()]
+                }),
+                hide_index=True,
+                use_container_width=True
+            )
+
+        counters = {**metrics.counters(), **metrics.gauges()}
+        if counters:
+            st.caption(texts["counters"])
+            st.dataframe(
+                pd.DataFrame({'name': list(counters), 'value': list(counters.values())}),
+                hide_index=True,
+                use_container_width=True
+            )
@@ -0,0 +1,82 @@
+import math
+import numpy as np
+import pandas as pd
+
+# Roughly two points per horizontal pixel of a full-width chart; the server cannot see the
+# plotted width, so this assumes a chart of up to about 1000 pixels
+DEFAULT_MAX_POINTS = 2000
+
+
+def ohlc_buckets(df, max_points=DEFAULT_MAX_POINTS):
+    """Aggregate consecutive candles into at most max_points OHLCV buckets"""
+    size = math.ceil(len(df) / max_points) if len(df) else 1
+    if size <= 1:
+        return df
+    starts = np.arange(0, len(df), size)
+    ends = np.minimum(starts + size, len(df)) - 1
+    return pd.DataFrame({
+        'timestamp': df['timestamp'].to_numpy()[starts],
+        'open': df['open'].to_numpy()[starts],
+        'high': np.maximum.reduceat(df['high'].to_numpy(), starts),
+        'low': np.minimum.reduceat(df['low'].to_numpy(), starts),
+        'close': df['close'].to_numpy()[ends],
+        'volume': np.add.reduceat(df['volume'].to_numpy(), starts)
+    })
+
+
+def lttb_indices(x, y, max_points=DEFAULT_MAX_POINTS):
+    """
+    Largest-Triangle-Three-Buckets: indices of the points that best keep the line's shape
+    Each bucket's triangle is anchored on the previous bucket's mean rather than on the point
+    picked there, so all buckets are scored at once over a padded (buckets x width) matrix
+    """
+    n = len(x)
+    if max_points >= n or max_points < 3:
+        return np.arange(n)
+    every = (n - 2) / (max_points - 2)
+    edges = np.append((np.arange(max_points - 2) * every).astype(np.int64) + 1, n - 1)
+    # Means of every bucket, plus the last point as the final "next bucket"
+    counts = np.diff(np.append(edges, n))
+    mean_x = np.add.reduceat(x, edges) / counts
+    mean_y = np.add.reduceat(y, edges) / counts
+    anchor_x = np.append(x[0], mean_x[:-2])
+    anchor_y = np.append(y[0], mean_y[:-2])
+    next_x, next_y = mean_x[1:], mean_y[1:]
+
+    starts, sizes = edges[:-1], counts[:-1]
+    columns = np.arange(sizes.max())
+    index = np.minimum(starts[:, None] + columns, n - 1)
+    # Twice the triangle area between the anchor, each candidate and the next bucket's mean
+    area = np.abs((anchor_x - next_x)[:, None] * (y[index] - anchor_y[:, None])
+                  - (anchor_x[:, None] - x[index]) * (next_y - anchor_y)[:, None])
+    area[columns >= sizes[:, None]] = -1.0
+    selected = np.empty(max_points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    selected[1:-1] = starts + np.argmax(area, axis=1)
+    return selected
+
+
+class LevelOfDetail:
+    """
+    Reduce a candle frame and its overlays to what the visible range needs
+    Rows before `start` are hidden; ranges of at most max_points are kept at full resolution
+    """
+
+    def __init__(self, df, start=0, max_points=DEFAULT_MAX_POINTS):
+        self.start = start
+        self.max_points = max_points
+        self.timestamps = df['timestamp'].to_numpy()[start:]
+        self.full_resolution = len(self.timestamps) <= max_points
+        self.candles = df.iloc[start:] if self.full_resolution else ohlc_buckets(df.iloc[start:], max_points)
+        self._x = self.timestamps.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+
+    def line(self, values):
+        """Return (x, y) for an overlay aligned with the full frame"""
+        y = np.asarray(values, dtype=np.float64)[self.start:]
+        if self.full_resolution:
+            return self.timestamps, y
+        # Warm-up NaNs carry no shape; keep only finite points
+        finite = np.flatnonzero(np.isfinite(y))
+        index = finite[lttb_indices(self._x[finite], y[finite], self.max_points)]
+        return self.timestamps[index], y[index]
@@ -0,0 +1,67 @@
+import plotly.graph_objects as go
+
+
+class FigureModel:
+    """
+    Plotly figure kept across reruns together with the inputs of each trace
+    Traces are declared by key on every render; sync() adds new ones, drops the
+    ones no longer declared and only re-sets the arrays of traces whose data version changed
+    """
+
+    def __init__(self):
+        self.figure = go.Figure()
+        self.patched = 0
+        self.built = 0
+        self._built = {}
+        self._declared = {}
+
+    def trace(self, key, trace_type, version, data, **style):
+        """
+        Declare one trace for the current render
+        version: hashable identity of the trace's inputs; data() is only called when it changes
+        data: callable returning the array properties, e.g. {'x': ..., 'y': ...}
+        style: the remaining, cheap properties such as name, line or yaxis
+        """
+        base, n = key, 1
+        while key in self._declared:
+            n += 1
+            key = f"{base}#{n}"
+        self._declared[key] = (trace_type, version, data, style)
+
+    def sync(self):
+        """Apply the declared traces to the figure and return it"""
+        declared, self._declared = self._declared, {}
+        fig = self.figure
+        self.patched = self.built = 0
+
+        # Drop traces that are no longer declared or whose type changed (e.g. SVG <-> WebGL)
+        keep = [trace for trace in fig.data
+                if trace.uid in declared and isinstance(trace, declared[trace.uid][0])]
+        if len(keep) != len(fig.data):
+            fig.data = keep
+        existing = {trace.uid: trace for trace in keep}
+
+        new_traces = []
+        for key, (trace_type, version, data, style) in declared.items():
+            trace = existing.get(key)
+            if trace is None:
+                new_traces.append(trace_type(uid=key, **data(), **style))
+                self.built += 1
+            else:
+                built_version, built_style = self._built[key]
+                if built_version != version:
+                    trace.update(data())
+                    self.patched += 1
+                if built_style != style:
+                    trace.update(style)
+            self._built[key] = (version, style)
+        if new_traces:
+            fig.add_traces(new_traces)
+        self._built = {key: self._built[key] for key in declared}
+
+        # Keep the declaration order, which also sets legend order and fill='tonexty' pairs
+        order = list(declared)
+        if [trace.uid for trace in fig.data] != order:
+            position = {key: i for i, key in enumerate(order)}
+            fig.data = sorted(fig.data, key=lambda trace: position[trace.uid])
+        return fig
@@ -0,0 +1,61 @@
+import streamlit as st
+from src.api.kucoin import fetch_all_tickers, TIMEFRAME_MAP
+from src.screener.scan import screen, usdt_pairs, DEFAULT_TIMEFRAME
+
+def render_screener(texts):
+    """Scan every USDT pair on demand and show a sortable ranking"""
+    tickers = fetch_all_tickers()
+    if tickers is None:
+        st.error(texts["error_no_data"])
+        return
+    available = len(usdt_pairs(tickers))
+
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        timeframe = st.selectbox(texts["timeframe_label"], list(TIMEFRAME_MAP),
+                                 index=list(TIMEFRAME_MAP).index(DEFAULT_TIMEFRAME), key="screener_timeframe")
+    with col2:
+        limit = st.number_input(texts["screener_pairs"], min_value=1, max_value=max(available, 1),
+                                value=available, help=texts["screener_pairs_help"], key="screener_limit")
+    with col3:
+        st.write("")
+        if st.button(texts["screener_scan"], key="screener_scan"):
+            with st.spinner(texts["screener_scanning"]):
+                st.session_state.screener_results = screen(tickers, timeframe, limit=limit)
+
+    results = st.session_state.get('screener_results')
+    if results is None:
+        return
+    table, errors = results
+    if errors:
+        st.caption(texts["screener_failed"].format(count=len(errors)))
+
+    states = {
+        'bullish': texts["macd_bullish"],
+        'bearish': texts["macd_bearish"],
+        'bullish_cross': texts["macd_bullish_cross"],
+        'bearish_cross': texts["macd_bearish_cross"]
+    }
+    table = table.assign(macd_state=table['macd_state'].map(states), level_type=table['level_type'].map({
+        'support': texts["support"],
+        'resistance': texts["resistance"]
+    }))
+    # Column headers sort the table in place in the browser
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        height=600,
+        column_config={
+            'symbol': st.column_config.TextColumn(texts["symbol_label"]),
+            'last': st.column_config.NumberColumn(texts["price_label"], format="$%.4f"),
+            'change_rate': st.column_config.NumberColumn(texts["change_label"], format="%+.2f%%"),
+            'vol_value': st.column_config.NumberColumn(texts["volume_label"], format="$%.0f"),
+            'rsi': st.column_config.NumberColumn("RSI", format="%.1f"),
+            'macd_state': st.column_config.TextColumn("MACD"),
+            'ma_distance': st.column_config.NumberColumn(texts["screener_ma_distance"], format="%+.2f%%"),
+            'level': st.column_config.NumberColumn(texts["screener_level"], format="$%.4f"),
+            'level_type': st.column_config.TextColumn(texts["screener_level_type"]),
+            'level_distance': st.column_config.NumberColumn(texts["screener_level_distance"], format="%+.2f%%")
+        }
+    )
@@ -0,0 +1,108 @@
+import time
+import streamlit as st
+import pandas as pd
+import plotly.graph_objects as go
+from src.backtest.sweep import sweep, parameter_grid, best, OBJECTIVES
+from src.backtest.engine import DEFAULT_FEE
+from src.utils.metrics import span
+
+# Default (from, to, step) per swept parameter
+SWEEP_RANGES = {
+    'macd': {'fast': (5, 20, 1), 'slow': (20, 60, 1), 'signal': (5, 15, 1)},
+    'ma_cross': {'fast': (5, 50, 5), 'slow': (20, 200, 10)},
+    'rsi': {'period': (7, 28, 1), 'lower': (20, 40, 5), 'upper': (60, 80, 5)},
+    'ichimoku': {'tenkan': (5, 20, 1), 'kijun': (20, 60, 2), 'senkou': (40, 120, 4)}
+}
+# Seconds between heatmap redraws while results stream in
+REDRAW_SECONDS = 1.0
+
+def range_inputs(rule):
+    """From/to/step inputs per parameter of rule; returns {param: range}"""
+    ranges = {}
+    for param, (start, stop, step) in SWEEP_RANGES[rule].items():
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            start = st.number_input(f"{param.title()} from", min_value=1, value=start, key=f"sweep_{rule}_{param}_from")
+        with col2:
+            stop = st.number_input(f"{param.title()} to", min_value=1, value=stop, key=f"sweep_{rule}_{param}_to")
+        with col3:
+            step = st.number_input(f"{param.title()} step", min_value=1, value=step, key=f"sweep_{rule}_{param}_step")
+        ranges[param] = range(start, stop + 1, step)
+    return ranges
+
+def heatmap(results, rule, objective, texts):
+    """Best objective over the remaining parameters for each pair of the first two"""
+    x_param, y_param = list(SWEEP_RANGES[rule])[:2]
+    table = pd.DataFrame([{**params, objective: stats[objective]} for params, stats in results])
+    grid = table.pivot_table(index=y_param, columns=x_param, values=objective, aggfunc='max')
+    fig = go.Figure(go.Heatmap(
+        x=grid.columns,
+        y=grid.index,
+        z=grid.to_numpy(),
+        colorscale='RdYlGn',
+        colorbar=dict(title=texts[f"objective_{objective}"])
+    ))
+    fig.update_layout(
+        xaxis_title=x_param,
+        yaxis_title=y_param,
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        font=dict(color='#e2e8f0'),
+        margin=dict(t=30, l=0, r=0, b=0),
+        height=500
+    )
+    return fig
+
+def render_sweep(load_candles, texts, timeframe):
+    """
+    Sweep one rule's parameters on all cores when asked and show a heatmap
+    load_candles: returns the candle frame, or None after showing why it could not
+    """
+    labels = {
+        'macd': texts["rule_macd"],
+        'ma_cross': texts["rule_ma_cross"],
+        'rsi': texts["rule_rsi"],
+        'ichimoku': texts["rule_ichimoku"]
+    }
+    settings_col, result_col = st.columns([1, 3])
+    with settings_col:
+        rule = st.selectbox(texts["sweep_rule"], list(labels), format_func=labels.get, key="sweep_rule")
+        ranges = range_inputs(rule)
+        objective = st.selectbox(texts["sweep_objective"], OBJECTIVES,
+                                 format_func=lambda name: texts[f"objective_{name}"], key="sweep_objective")
+        fee = st.number_input(texts["backtest_fee"], min_value=0.0, max_value=5.0,
+                              value=DEFAULT_FEE * 100, step=0.01, format="%.3f", key="sweep_fee") / 100
+        allow_short = st.checkbox(texts["backtest_short"], value=False, key="sweep_short")
+        total = len(parameter_grid(ranges))
+        st.caption(texts["sweep_combinations"].format(count=total))
+        start = st.button(texts["sweep_run"], key="sweep_run", disabled=not total)
+
+    with result_col:
+        chart = st.empty()
+        df = load_candles() if start else None
+        if df is not None:
+            progress = st.progress(0.0)
+            results = []
+            redrawn = time.monotonic()
+            with span("sweep.run"):
+                # Redraw the heatmap periodically as chunks of results come back
+                for result in sweep(df, rule, ranges, fee=fee, allow_short=allow_short, timeframe=timeframe):
+                    results.append(result)
+                    if time.monotonic() - redrawn > REDRAW_SECONDS:
+                        progress.progress(len(results) / total)
+                        chart.plotly_chart(heatmap(results, rule, objective, texts), use_container_width=True)
+                        redrawn = time.monotonic()
+            progress.empty()
+            st.session_state.sweep_results = (rule, results)
+
+        last = st.session_state.get('sweep_results')
+        if last is None or last[0] != rule or not last[1]:
+            return
+        results = last[1]
+        chart.plotly_chart(heatmap(results, rule, objective, texts), use_container_width=True)
+        st.caption(texts["sweep_best"])
+        st.dataframe(
+            pd.DataFrame([{**params, **stats} for params, stats in best(results, objective)]),
+            hide_index=True,
+            use_container_width=True
+        )
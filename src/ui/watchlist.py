@@ -0,0 +1,29 @@
+import streamlit as st
+import pandas as pd
+from src.api.kucoin import fetch_all_tickers
+
+def render_watchlist(symbols, texts):
+    """Display market stats for symbols from the shared all-tickers snapshot"""
+    tickers = fetch_all_tickers()
+    if tickers is None:
+        st.caption(texts["error_no_data"])
+        return
+    
+    # Symbols missing from the snapshot (e.g. delisted pairs) are skipped
+    rows = tickers.loc[[symbol for symbol in symbols if symbol in tickers.index]]
+    table = pd.DataFrame({
+        texts["symbol_label"]: rows.index,
+        texts["price_label"]: rows['last'].to_numpy(),
+        texts["change_label"]: rows['changeRate'].to_numpy() * 100,
+        texts["volume_label"]: rows['volValue'].to_numpy()
+    })
+    st.dataframe(
+        table,
+        hide_index=True,
+        use_container_width=True,
+        column_config={
+            texts["price_label"]: st.column_config.NumberColumn(format="$%.4f"),
+            texts["change_label"]: st.column_config.NumberColumn(format="%+.2f%%"),
+            texts["volume_label"]: st.column_config.NumberColumn(format="$%.0f")
+        }
+    )
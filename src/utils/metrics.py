@@ -0,0 +1,227 @@
+"""
+Lightweight hot-path timing and counters
+
+span(name) times a block; increment(name) counts an event. Both feed the
+process-wide Metrics (p50/p99 over a sliding window, exported as Prometheus
+text) and, while a rerun is being traced, that rerun's own breakdown, which
+can be printed as one JSON log line per rerun.
+"""
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+
+# Observations kept per span for percentiles
+WINDOW = 1024
+QUANTILES = (0.5, 0.9, 0.99)
+PREFIX = "kmchart"
+# Print one JSON line per traced rerun when set to 1
+LOG_RERUNS = os.environ.get("METRICS_LOG") == "1"
+
+
+class Metrics:
+    """Thread-safe span timings and event counters"""
+
+    def __init__(self, window=WINDOW):
+        self.window = window
+        self._timings = {}
+        self._totals = {}
+        self._counters = {}
+        self._gauges = {}
+        self._lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self._lock:
+            timings = self._timings.get(name)
+            if timings is None:
+                timings = self._timings[name] = deque(maxlen=self.window)
+            timings.append(seconds)
+            count, total = self._totals.get(name, (0, 0.0))
+            self._totals[name] = (count + 1, total + seconds)
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def register_gauges(self, name, read):
+        """read() returns {gauge name: value}, sampled on every export"""
+        with self._lock:
+            self._gauges[name] = read
+
+    def summary(self):
+        """{span: {'count', 'sum', 'last', 'p50', 'p90', 'p99'}} over the sliding window"""
+        with self._lock:
+            timings = {name: np.fromiter(values, dtype=np.float64) for name, values in self._timings.items()}
+            totals = dict(self._totals)
+        summary = {}
+        for name, values in sorted(timings.items()):
+            count, total = totals[name]
+            summary[name] = {'count': count, 'sum': total, 'last': float(values[-1])}
+            for quantile, value in zip(QUANTILES, np.quantile(values, QUANTILES)):
+                summary[name][f"p{int(quantile * 100)}"] = float(value)
+        return summary
+
+    def counters(self):
+        with self._lock:
+            return dict(sorted(self._counters.items()))
+
+    def gauges(self):
+        with self._lock:
+            readers = list(self._gauges.values())
+        gauges = {}
+        for read in readers:
+            try:
+                gauges.update(read())
+            except Exception as e:
+                print(f"Metrics gauge error: {e}")
+        return dict(sorted(gauges.items()))
+
+    def prometheus(self):
+        """Render everything in the Prometheus text exposition format"""
+        lines = [f"# TYPE {PREFIX}_span_seconds summary"]
+        for name, stats in self.summary().items():
+            for quantile in QUANTILES:
+                lines.append(f'{PREFIX}_span_seconds{{span="{name}",quantile="{quantile}"}} '
+                             f'{stats[f"p{int(quantile * 100)}"]:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_sum{{span="{name}"}} {stats["sum"]:.6f}')
+            lines.append(f'{PREFIX}_span_seconds_count{{span="{name}"}} {stats["count"]}')
+        lines.append(f"# TYPE {PREFIX}_events_total counter")
+        for name, value in self.counters().items():
+            lines.append(f'{PREFIX}_events_total{{event="{name}"}} {value}')
+        lines.append(f"# TYPE {PREFIX}_state gauge")
+        for name, value in self.gauges().items():
+            lines.append(f'{PREFIX}_state{{name="{name}"}} {value}')
+        return "\n".join(lines) + "\n"
+
+
+class RerunTrace:
+    """Spans and counters recorded during one script or fragment run"""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.spans = {}
+        self.counters = {}
+        # Worker threads running in a copy of the rerun's context record into the same trace
+        self._lock = threading.Lock()
+
+    def add_span(self, name, seconds):
+        with self._lock:
+            self.spans[name] = self.spans.get(name, 0.0) + seconds
+
+    def add_count(self, name, value):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self):
+        return {
+            'event': 'rerun',
+            'kind': self.kind,
+            'seconds': round(self.seconds, 6) if self.seconds is not None else None,
+            'spans': {name: round(seconds, 6) for name, seconds in self.spans.items()},
+            'counters': self.counters
+        }
+
+
+_metrics = Metrics()
+_trace = contextvars.ContextVar("rerun_trace", default=None)
+
+
+def get_metrics():
+    """Return the process-wide metrics"""
+    return _metrics
+
+
+@contextmanager
+def span(name):
+    """Time a block under name"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        _metrics.observe(name, elapsed)
+        trace = _trace.get()
+        if trace is not None:
+            trace.add_span(name, elapsed)
+
+
+def increment(name, value=1):
+    """Count an event"""
+    _metrics.increment(name, value)
+    trace = _trace.get()
+    if trace is not None:
+        trace.add_count(name, value)
+
+
+def begin_rerun(kind):
+    """Start tracing a run of the calling thread, replacing any unfinished trace"""
+    trace = RerunTrace(kind)
+    _trace.set(trace)
+    return trace
+
+
+def end_rerun(trace):
+    """Finish a trace started by begin_rerun and record its total as the rerun.<kind> span"""
+    if trace is None or _trace.get() is not trace:
+        return
+    trace.seconds = time.perf_counter() - trace.started
+    _trace.set(None)
+    _metrics.observe(f"rerun.{trace.kind}", trace.seconds)
+    if LOG_RERUNS:
+        print(json.dumps(trace.to_dict()), flush=True)
+
+
+@contextmanager
+def rerun(kind):
+    """Trace a block as one run unless it is already part of a traced run"""
+    trace = begin_rerun(kind) if _trace.get() is None else None
+    try:
+        yield trace
+    finally:
+        end_rerun(trace)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path != "/metrics":
+            self.send_error(404)
+            return
+        body = _metrics.prometheus().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_started = False
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port, host="0.0.0.0"):
+    """
+    Serve /metrics in Prometheus text format on a background thread, once per process
+    Returns the server, or None when the port could not be bound; that is not retried
+    """
+    global _server, _server_started
+    with _server_lock:
+        if not _server_started:
+            _server_started = True
+            try:
+                _server = ThreadingHTTPServer((host, port), _MetricsHandler)
+            except OSError as e:
+                print(f"Metrics server not started on {host}:{port}: {e}")
+                return None
+            threading.Thread(target=_server.serve_forever, name="metrics-server", daemon=True).start()
+        return _server
@@ -0,0 +1,18 @@
+"""run_backtest edge cases"""
+import warnings
+import numpy as np
+import pandas as pd
+import pytest
+from src.backtest.engine import run_backtest
+
+
+@pytest.mark.parametrize("count", [0, 1])
+def test_short_frames_have_zero_stats_without_warnings(count):
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime(60 * np.arange(count), unit='s'),
+        'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0
+    })
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", RuntimeWarning)
+        result = run_backtest(df, [{'rule': 'rsi', 'period': 14}], timeframe='1m')
+    assert result.stats['sharpe'] == 0.0 and result.stats['trades'] == 0
@@ -0,0 +1,16 @@
+"""Indicator cache keys"""
+import pandas as pd
+import pytest
+from src.indicators.cache import data_key
+
+
+@pytest.mark.parametrize("column", ['high', 'low', 'close', 'volume'])
+def test_revised_forming_candle_changes_key(column):
+    df = pd.DataFrame({
+        'timestamp': pd.to_datetime([0, 60], unit='s'),
+        'open': 1.0, 'high': 2.0, 'low': 0.5, 'close': 1.5, 'volume': 10.0
+    })
+    revised = df.copy()
+    revised.loc[1, column] += 0.25
+    assert data_key(df, 'BTC-USDT', '1m') != data_key(revised, 'BTC-USDT', '1m')
+    assert data_key(df, 'BTC-USDT', '1m') == data_key(df.copy(), 'BTC-USDT', '1m')
@@ -0,0 +1,45 @@
+"""Candles container parsing and merging"""
+import numpy as np
+from src.data.candles import Candles
+
+
+def candles(timestamps, close, turnover=True):
+    timestamps = np.asarray(timestamps, dtype=np.int64)
+    close = np.asarray(close, dtype=np.float64)
+    return Candles(timestamps, close, close + 1, close - 1, close, np.ones(len(close)),
+                   close * 10 if turnover else None)
+
+
+def test_concat_keeps_the_last_copy_of_each_timestamp():
+    older = candles([0, 60, 120], [1.0, 2.0, 3.0])
+    # Overlaps older at 120 (the forming candle, revised) and repeats 180 within itself
+    newer = candles([180, 120, 180, 240], [4.0, 3.5, 4.5, 5.0])
+    merged = Candles.concat([older, Candles.empty(), newer])
+    assert merged.timestamp.tolist() == [0, 60, 120, 180, 240]
+    assert merged.close.tolist() == [1.0, 2.0, 3.5, 4.5, 5.0]
+    assert merged.turnover.tolist() == [10.0, 20.0, 35.0, 45.0, 50.0]
+
+
+def test_concat_drops_fields_missing_from_a_part():
+    merged = Candles.concat([candles([0], [1.0]), candles([60], [2.0], turnover=False)])
+    assert merged.turnover is None and merged.close.tolist() == [1.0, 2.0]
+    assert len(Candles.concat([Candles.empty(), Candles.empty()])) == 0
+
+
+def test_from_kucoin_is_time_ordered():
+    # KuCoin rows: time, open, close, high, low, volume, turnover, newest first
+    rows = [["120", "3", "3.5", "4", "2.5", "7", "24.5"], ["60", "2", "3", "3.5", "1.5", "5", "15"]]
+    parsed = Candles.from_kucoin(rows)
+    assert parsed.timestamp.tolist() == [60, 120]
+    assert parsed.open.tolist() == [2.0, 3.0] and parsed.close.tolist() == [3.0, 3.5]
+    assert parsed.high.tolist() == [3.5, 4.0] and parsed.low.tolist() == [1.5, 2.5]
+    assert parsed.volume.tolist() == [5.0, 7.0] and parsed.turnover.tolist() == [15.0, 24.5]
+
+
+def test_slices_and_frames_share_memory():
+    series = candles(60 * np.arange(10), np.arange(10.0))
+    part = series[2:5]
+    assert np.shares_memory(part.close, series.close) and part.timestamp.tolist() == [120, 180, 240]
+    frame = series.to_frame()
+    assert np.shares_memory(frame['close'].to_numpy(), series.close)
+    assert str(frame['timestamp'].iloc[1]) == "1970-01-01 00:01:00"
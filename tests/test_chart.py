@@ -0,0 +1,23 @@
+"""plot_candlestick in a Streamlit test session"""
+import sys
+from streamlit.testing.v1 import AppTest
+
+
+def empty_chart_script():
+    import pandas as pd
+    from src.config.texts import texts
+    from src.ui.chart import plot_candlestick
+
+    empty = pd.DataFrame({column: pd.Series(dtype='float64')
+                          for column in ('open', 'high', 'low', 'close', 'volume')})
+    empty.insert(0, 'timestamp', pd.Series(dtype='datetime64[ns]'))
+    plot_candlestick(empty, {}, texts["English"], "English", "Dark", True, True, "BTC-USDT", "1h",
+                     market_info=None, view_seconds=86400, volume_profile=True)
+
+
+def test_empty_frame_without_stats_shows_no_data(monkeypatch):
+    # AppTest leaves its script as __main__, which spawned worker processes would re-import
+    monkeypatch.setitem(sys.modules, "__main__", sys.modules["__main__"])
+    at = AppTest.from_function(empty_chart_script).run()
+    assert not at.exception
+    assert [error.value for error in at.error] == ["No data available"]
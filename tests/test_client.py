@@ -0,0 +1,89 @@
+"""Rate limiting and retries of the shared HTTP client"""
+import pytest
+import requests
+from src.api import client
+from src.api.client import TokenBucket
+from tools.mock_kucoin import serve
+
+PATH = "/api/v1/market/stats"
+
+
+class Clock:
+    """Fake monotonic clock whose sleep() only advances time"""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(client.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(client.time, "sleep", clock.sleep)
+    return clock
+
+
+@pytest.fixture
+def api(monkeypatch):
+    server, mock = serve(0, push_interval=0)
+    monkeypatch.setattr(client, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield mock
+    server.shutdown()
+
+
+def test_reserve_borrows_and_refills(clock):
+    bucket = TokenBucket(rate=10, capacity=5)
+    assert bucket.reserve(5) == 0.0
+    # An empty bucket hands out tokens on credit; later callers wait until it is paid back
+    assert bucket.reserve(2) == pytest.approx(0.2)
+    assert bucket.reserve(1) == pytest.approx(0.3)
+    clock.now += 0.3
+    assert bucket.reserve(0) == pytest.approx(0.0, abs=1e-9)
+    # Refills stop at capacity
+    clock.now += 100
+    assert bucket.reserve(5) == 0.0
+    assert bucket.reserve(1) == pytest.approx(0.1)
+
+
+def test_acquire_waits_for_refill(clock):
+    bucket = TokenBucket(rate=4, capacity=4)
+    bucket.acquire(4)
+    assert clock.sleeps == []
+    bucket.acquire(2)
+    assert sum(clock.sleeps) == pytest.approx(0.5)
+
+
+def test_retries_429_after_retry_after(api, monkeypatch):
+    sleeps = []
+
+    def sleep(seconds):
+        # The limit lifts while the client backs off; the in-process mock's own zero latency sleeps are ignored
+        if seconds:
+            sleeps.append(seconds)
+            api.rate_limit_rate = 0.0
+
+    monkeypatch.setattr(client.time, "sleep", sleep)
+    api.rate_limit_rate = 1.0
+    data = client.get(PATH, params={'symbol': "BTC-USDT"})
+    assert data['code'] == '200000'
+    assert api.counts[PATH] == 2
+    assert len(sleeps) == 1 and sleeps[0] >= 1
+
+
+def test_gives_up_after_max_retries(api, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(client.time, "sleep", lambda seconds: seconds and sleeps.append(seconds))
+    api.rate_limit_rate = 1.0
+    with pytest.raises(requests.HTTPError) as error:
+        client.get(PATH, params={'symbol': "BTC-USDT"}, retries=2)
+    assert error.value.response.status_code == 429
+    # Backoff honours the mock's Retry-After of 1 second between the three attempts
+    assert api.counts[PATH] == 3 and len(sleeps) == 2 and min(sleeps) >= 1
@@ -0,0 +1,49 @@
+"""Overlay downsampling against a per-bucket reference"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.ui.downsample import LevelOfDetail, lttb_indices
+
+
+def reference(x, y, max_points):
+    """One bucket at a time, each triangle anchored on the previous bucket's mean"""
+    n = len(x)
+    every = (n - 2) / (max_points - 2)
+    edges = list((np.arange(max_points - 2) * every).astype(np.int64) + 1) + [n - 1, n]
+    selected = [0]
+    anchor = (x[0], y[0])
+    for i in range(max_points - 2):
+        start, end, next_end = edges[i], edges[i + 1], edges[i + 2]
+        next_mean = (x[end:next_end].mean(), y[end:next_end].mean())
+        area = [abs((anchor[0] - next_mean[0]) * (y[j] - anchor[1]) - (anchor[0] - x[j]) * (next_mean[1] - anchor[1]))
+                for j in range(start, end)]
+        selected.append(start + int(np.argmax(area)))
+        anchor = (x[start:end].mean(), y[start:end].mean())
+    return np.array(selected + [n - 1])
+
+
+@pytest.mark.parametrize("n, max_points", [(1000, 100), (10_007, 2000), (5000, 3), (2500, 2000)])
+def test_matches_reference(n, max_points):
+    rng = np.random.default_rng(n)
+    x = np.sort(rng.random(n)) * 1e9
+    y = np.cumsum(rng.normal(0, 1, n))
+    np.testing.assert_array_equal(lttb_indices(x, y, max_points), reference(x, y, max_points))
+
+
+def test_keeps_endpoints_order_and_spikes():
+    x = np.arange(100_000, dtype=np.float64)
+    y = np.sin(x / 5000)
+    y[54_321] = 50.0
+    index = lttb_indices(x, y, 500)
+    assert len(index) == 500 and index[0] == 0 and index[-1] == len(x) - 1
+    assert (np.diff(index) > 0).all()
+    assert 54_321 in index
+
+
+def test_level_of_detail_skips_warmup_nans():
+    df = pd.DataFrame({'timestamp': pd.to_datetime(60 * np.arange(10_000), unit='s'),
+                       'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0})
+    values = np.arange(10_000, dtype=np.float64)
+    values[:200] = np.nan
+    x, y = LevelOfDetail(df, max_points=1000).line(values)
+    assert len(y) == 1000 and np.isfinite(y).all() and y[0] == 200.0 and y[-1] == 9999.0
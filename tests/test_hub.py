@@ -0,0 +1,78 @@
+"""DataHub refresh scheduling against a fake loader"""
+import threading
+import time
+import numpy as np
+from src.data.candles import Candles
+from src.data.hub import DataHub
+
+NOW = 1_700_000_000
+
+
+class Loader:
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, symbol, since):
+        with self._lock:
+            self.calls += 1
+            count = self.calls
+        timestamps = NOW + 60 * np.arange(count, dtype=np.int64)
+        values = np.full(count, 1.0)
+        return Candles(timestamps, values, values, values, values, values)
+
+
+def test_stale_snapshot_is_reloaded_after_refresher_stops():
+    loader = Loader()
+    hub = DataHub(loader, interval=0.05, idle_timeout=0.1, history_seconds=10**9)
+    try:
+        hub.get("BTC-USDT", "1m")
+        # Nobody reads, so the refresher stops
+        time.sleep(0.4)
+        assert hub.active() == []
+        calls = loader.calls
+        frame = hub.get("BTC-USDT", "1m")
+        assert loader.calls == calls + 1
+        assert len(frame) == loader.calls
+        assert hub.active() == ["BTC-USDT"]
+    finally:
+        hub.stop()
+
+
+def test_fresh_snapshot_is_served_from_memory():
+    loader = Loader()
+    hub = DataHub(loader, interval=60)
+    try:
+        hub.get("BTC-USDT", "1m")
+        hub.get("BTC-USDT", "1m")
+        assert loader.calls == 1
+    finally:
+        hub.stop()
+
+
+def test_reader_racing_idle_exit_keeps_a_refresher():
+    loader = Loader()
+    hub = DataHub(loader, interval=0.01, idle_timeout=0.02, history_seconds=10**9)
+    try:
+        for _ in range(100):
+            hub.get("BTC-USDT", "1m")
+            time.sleep(0.001 * np.random.default_rng().integers(0, 40))
+            hub.get("BTC-USDT", "1m")
+            assert hub.active() == ["BTC-USDT"]
+    finally:
+        hub.stop()
+
+
+def test_max_age_reloads_at_the_callers_pace():
+    loader = Loader()
+    hub = DataHub(loader, interval=60)
+    try:
+        hub.get("BTC-USDT", "1m")
+        time.sleep(0.06)
+        hub.get("BTC-USDT", "1m", max_age=0.05)
+        assert loader.calls == 2
+        # Without max_age the 60s interval applies
+        hub.get("BTC-USDT", "1m")
+        assert loader.calls == 2
+    finally:
+        hub.stop()
@@ -0,0 +1,57 @@
+"""Paged backfill and chart fetch deadlines against the REST stand-in in tools/mock_kucoin.py"""
+import time
+import numpy as np
+import pytest
+from src.api import client, kucoin
+from src.api.kucoin import MAX_CANDLES_PER_REQUEST, TIMEFRAME_SECONDS, split_range
+from tools.mock_kucoin import serve
+
+TIMEFRAME = "15m"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    server, mock = serve(0, push_interval=0)
+    monkeypatch.setattr(client, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield mock
+    server.shutdown()
+
+
+def test_split_range_pages_are_contiguous_and_capped():
+    seconds = TIMEFRAME_SECONDS[TIMEFRAME]
+    start, end = 1_700_000_000, 1_700_000_000 + 3 * MAX_CANDLES_PER_REQUEST * seconds + 123
+    pages = split_range(start, end, TIMEFRAME)
+    assert pages[0][0] == start and pages[-1][1] == end
+    for (_, previous_end), (page_start, page_end) in zip(pages, pages[1:]):
+        # Adjacent pages share their boundary candle
+        assert page_start == previous_end
+    # Inclusive ends: at most MAX_CANDLES_PER_REQUEST candle opens per page
+    assert all(page_end - page_start <= (MAX_CANDLES_PER_REQUEST - 1) * seconds for page_start, page_end in pages)
+    assert split_range(end, start, TIMEFRAME) == []
+
+
+def test_backfill_dedupes_page_boundaries(api):
+    seconds = TIMEFRAME_SECONDS[TIMEFRAME]
+    end = int(time.time()) // seconds * seconds
+    start = end - 3 * MAX_CANDLES_PER_REQUEST * seconds
+    candles = kucoin.backfill_candles("BTC-USDT", TIMEFRAME, start, end)
+    assert api.counts["/api/v1/market/candles"] == len(split_range(start, end, TIMEFRAME)) > 1
+    np.testing.assert_array_equal(candles.timestamp, np.arange(start, end + 1, seconds))
+
+
+@pytest.fixture
+def slow_api(monkeypatch):
+    server, mock = serve(0, latency=3.0)
+    monkeypatch.setattr(client, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    kucoin.fetch_market_info.clear()
+    kucoin._fetch_all_tickers.clear()
+    yield mock
+    server.shutdown()
+
+
+def test_market_stats_are_bounded_by_their_deadline(slow_api):
+    started = time.monotonic()
+    candles, market_info, errors = kucoin.fetch_chart_data(
+        "BTC-USDT", "1h", load_candles=lambda: "candles", market_info_timeout=0.5)
+    assert time.monotonic() - started < 1.5
+    assert candles == "candles" and market_info is None and 'market_info' in errors
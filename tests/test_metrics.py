@@ -0,0 +1,28 @@
+"""Rerun traces across worker threads and the once-per-process metrics server"""
+import socket
+from src.api import kucoin
+from src.utils import metrics
+
+
+def test_backfill_pages_record_into_the_callers_trace(monkeypatch):
+    def request_candles(symbol, timeframe, start, end):
+        with metrics.span("kucoin.request"):
+            return [[str(start), "1", "1", "1", "1", "1", "1"]]
+
+    monkeypatch.setattr(kucoin, "request_candles", request_candles)
+    with metrics.rerun("script") as trace:
+        candles = kucoin.backfill_candles("BTC-USDT", "1m", 0, 60 * 1500 * 4, max_workers=4)
+    assert len(candles) == len(kucoin.split_range(0, 60 * 1500 * 4, "1m")) > 1
+    assert "kucoin.request" in trace.spans and "kucoin.parse" in trace.spans
+
+
+def test_metrics_server_bind_failure_is_not_retried(monkeypatch):
+    monkeypatch.setattr(metrics, "_server", None)
+    monkeypatch.setattr(metrics, "_server_started", False)
+    with socket.socket() as taken:
+        taken.bind(("127.0.0.1", 0))
+        taken.listen()
+        port = taken.getsockname()[1]
+        assert metrics.start_metrics_server(port, host="127.0.0.1") is None
+        # Later reruns neither raise nor try to bind again
+        assert metrics.start_metrics_server(port, host="127.0.0.1") is None
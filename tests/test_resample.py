@@ -0,0 +1,61 @@
+"""Local timeframe aggregation against pandas resample"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.api.kucoin import TIMEFRAME_SECONDS
+from src.data.candles import Candles
+from src.data.resample import BUCKET_ORIGIN, MultiTimeframe, resample
+
+
+def base_candles(count=30_000, seed=0):
+    """1m candles with gaps, starting mid-week and mid-day"""
+    rng = np.random.default_rng(seed)
+    minutes = np.sort(rng.choice(2 * count, count, replace=False))
+    timestamp = 1_700_000_000 // 60 * 60 + 60 * minutes
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    spread = rng.random((2, count))
+    return Candles(timestamp, close + rng.normal(0, 0.1, count), close + spread[0], close - spread[1], close,
+                   rng.random(count) * 10, rng.random(count) * 1000)
+
+
+def pandas_resample(candles, timeframe):
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    df = candles.to_frame(turnover=True).set_index('timestamp')
+    origin = pd.Timestamp(BUCKET_ORIGIN.get(timeframe, 0), unit='s')
+    aggregated = df.resample(f"{seconds}s", origin=origin).agg({
+        'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'turnover': 'sum'
+    })
+    # pandas also emits the empty buckets between gaps
+    return aggregated[df['open'].resample(f"{seconds}s", origin=origin).count() > 0]
+
+
+def assert_same(candles, expected):
+    np.testing.assert_array_equal(candles.timestamp, expected.index.to_numpy(dtype='datetime64[s]').astype(np.int64))
+    for name in ('open', 'high', 'low', 'close', 'volume', 'turnover'):
+        np.testing.assert_allclose(getattr(candles, name), expected[name].to_numpy(), rtol=1e-12, err_msg=name)
+
+
+@pytest.mark.parametrize("timeframe", list(TIMEFRAME_SECONDS))
+def test_resample_matches_pandas(timeframe):
+    base = base_candles()
+    assert_same(resample(base, timeframe), pandas_resample(base, timeframe))
+
+
+def test_weeks_start_on_monday():
+    weeks = resample(base_candles(), "1w")
+    assert (weeks.timestamp.astype('datetime64[s]').astype('datetime64[D]').view(np.int64) % 7 == 4).all()
+
+
+@pytest.mark.parametrize("timeframe", ["5m", "1h", "1d"])
+def test_incremental_updates_match_full_resample(timeframe):
+    base = base_candles(5000, seed=1)
+    series = MultiTimeframe(base[:3000])
+    series.candles(timeframe)
+    for end in range(3000, 5000, 250):
+        # Each top-up re-sends the forming candle, first with a provisional close
+        revised = base[end - 1:end + 250]
+        provisional = Candles.concat([revised])  # a copy
+        provisional.close[-1] += 1.0
+        series.update(provisional)
+        series.update(revised)
+    assert_same(series.candles(timeframe), pandas_resample(base, timeframe))
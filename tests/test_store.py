@@ -0,0 +1,60 @@
+"""Candle store top-ups against the REST stand-in in tools/mock_kucoin.py"""
+import numpy as np
+import pytest
+from src.api import client, kucoin
+from src.api.kucoin import MAX_CANDLES_PER_REQUEST, TIMEFRAME_SECONDS
+from src.data.store import CandleStore
+from tools.mock_kucoin import serve
+
+SYMBOL = "BTC-USDT"
+TIMEFRAME = "15m"
+
+
+@pytest.fixture
+def api(monkeypatch):
+    server, mock = serve(0, push_interval=0)
+    monkeypatch.setattr(client, "BASE_URL", f"http://127.0.0.1:{server.server_port}")
+    yield mock
+    server.shutdown()
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = CandleStore(str(tmp_path / "candles.db"))
+    monkeypatch.setattr(kucoin, "get_candle_store", lambda: store)
+    yield store
+    store.close()
+
+
+def candle_requests(mock):
+    return mock.counts.get("/api/v1/market/candles", 0)
+
+
+def test_sync_resumes_from_the_last_stored_candle(api, store):
+    first = kucoin.sync_candle_series(SYMBOL, TIMEFRAME)
+    pages = candle_requests(api)
+    assert pages > 1 and len(first) > MAX_CANDLES_PER_REQUEST
+    assert (np.diff(first.timestamp) == TIMEFRAME_SECONDS[TIMEFRAME]).all()
+
+    # A second sync only asks for the page from the newest stored candle on, and stores no duplicates
+    last = store.last_timestamp(SYMBOL, TIMEFRAME)
+    second = kucoin.sync_candle_series(SYMBOL, TIMEFRAME)
+    assert candle_requests(api) == pages + 1
+    assert second.timestamp[0] == first.timestamp[0] and len(second) in (len(first), len(first) + 1)
+    assert len(np.unique(second.timestamp)) == len(second)
+    assert store.last_timestamp(SYMBOL, TIMEFRAME) >= last
+
+    # `since` returns only the newest part of the stored series
+    assert kucoin.sync_candle_series(SYMBOL, TIMEFRAME, since=last).timestamp[0] == last
+
+
+def test_upsert_replaces_the_forming_candle(store):
+    store.upsert(SYMBOL, TIMEFRAME, [(0, 1, 2, 0.5, 1.5, 10), (900, 1.5, 2, 1, 1.8, 4)])
+    # The newest candle is revised and a new one opens
+    store.upsert(SYMBOL, TIMEFRAME, [(900, 1.5, 2.5, 1, 2.2, 9), (1800, 2.2, 2.3, 2.1, 2.2, 1)])
+    assert store.load_candles(SYMBOL, TIMEFRAME).timestamp.tolist() == [0, 900, 1800]
+    frame = store.load(SYMBOL, TIMEFRAME)
+    assert frame['close'].tolist() == [1.5, 2.2, 2.2] and frame['volume'].tolist() == [10, 9, 1]
+    assert store.last_timestamp(SYMBOL, TIMEFRAME) == 1800
+    assert len(store.load_candles(SYMBOL, TIMEFRAME, start=900, end=900)) == 1
+    assert store.last_timestamp(SYMBOL, "1h") is None
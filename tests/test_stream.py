@@ -0,0 +1,143 @@
+"""KuCoinStream against the local WebSocket stand-in in tools/mock_kucoin.py"""
+import threading
+import time
+import pandas as pd
+import pytest
+from src.api import client, stream as stream_module
+from src.api.stream import KuCoinStream, candle_topic, snapshot_topic
+from tools.mock_kucoin import serve, topic_message
+
+SYMBOL = "BTC-USDT"
+CANDLES = candle_topic(SYMBOL, "1m")
+SNAPSHOT = snapshot_topic(SYMBOL)
+
+
+def wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def history(count=3, start=1_700_000_000):
+    timestamps = start + 60 * pd.RangeIndex(count)
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(timestamps, unit='s'),
+        'open': 100.0, 'high': 101.0, 'low': 99.0, 'close': 100.5, 'volume': 10.0
+    })
+
+
+def candle_message(timestamp, close, volume=5.0):
+    row = [str(timestamp), "100", str(close), str(max(close, 100) + 1), str(min(close, 100) - 1), str(volume), "0"]
+    return {'type': 'message', 'topic': CANDLES, 'subject': 'trade.candles.update',
+            'data': {'symbol': SYMBOL, 'candles': row, 'time': timestamp * 10**9}}
+
+
+def subscribed(mock, topic):
+    """Connected clients currently subscribed to topic"""
+    return [ws for ws in list(mock.clients) if topic in ws.topics]
+
+
+@pytest.fixture
+def mock():
+    server, mock = serve(0, push_interval=0)
+    mock.url = f"ws://127.0.0.1:{server.server_port}/ws"
+    mock.base_url = f"http://127.0.0.1:{server.server_port}"
+    yield mock
+    server.shutdown()
+
+
+@pytest.fixture
+def stream(mock, monkeypatch):
+    monkeypatch.setattr(stream_module, "RECONNECT_DELAY", 0.05)
+    stream = KuCoinStream(capacity=1000, endpoint=mock.url)
+    yield stream
+    stream.stop()
+
+
+def test_subscribe_seeds_and_subscribes(mock, stream):
+    buffer = stream.subscribe(SYMBOL, load_history=history)
+    assert len(buffer) == 3
+    assert wait_for(lambda: subscribed(mock, CANDLES) and subscribed(mock, SNAPSHOT))
+    # Later callers share the buffer without subscribing again
+    assert stream.subscribe(SYMBOL, load_history=history) is buffer
+    assert [topic for _, topic in mock.subscriptions].count(CANDLES) == 1
+
+
+def test_ticks_merge_into_ring_buffer(mock, stream):
+    buffer = stream.subscribe(SYMBOL, load_history=history)
+    assert wait_for(lambda: subscribed(mock, CANDLES) and subscribed(mock, SNAPSHOT))
+    last = buffer.last()[0]
+
+    # Revision of the forming candle, a new candle, then a stale one that is ignored
+    mock.push(candle_message(last, close=105.0))
+    assert wait_for(lambda: buffer.last()[4] == 105.0)
+    assert len(buffer) == 3
+    mock.push(candle_message(last + 60, close=106.0))
+    assert wait_for(lambda: len(buffer) == 4)
+    mock.push(candle_message(last - 60, close=1.0))
+    mock.push(candle_message(last + 60, close=107.0))
+    assert wait_for(lambda: buffer.last()[4] == 107.0)
+    frame = buffer.to_frame()
+    assert len(frame) == 4 and (frame['close'] != 1.0).all()
+
+    mock.push(topic_message(SNAPSHOT))
+    assert wait_for(lambda: stream.market_info(SYMBOL) is not None)
+    assert float(stream.market_info(SYMBOL)['last']) > 0
+
+
+def test_reconnect_resubscribes(mock, stream):
+    buffer = stream.subscribe(SYMBOL, load_history=history)
+    assert wait_for(lambda: subscribed(mock, CANDLES))
+    first = subscribed(mock, CANDLES)[0]
+
+    mock.drop_connections()
+    assert wait_for(lambda: subscribed(mock, CANDLES) and subscribed(mock, CANDLES)[0] is not first)
+    assert wait_for(lambda: subscribed(mock, SNAPSHOT))
+    mock.push(candle_message(buffer.last()[0] + 60, close=110.0))
+    assert wait_for(lambda: buffer.last()[4] == 110.0)
+
+
+def test_failed_seed_is_not_registered(mock, stream):
+    def fail():
+        raise ConnectionError("upstream down")
+
+    with pytest.raises(ConnectionError):
+        stream.subscribe(SYMBOL, load_history=fail)
+    assert not mock.subscriptions
+    # The next caller seeds again
+    assert len(stream.subscribe(SYMBOL, load_history=history)) == 3
+
+
+def test_concurrent_subscribers_share_one_seed(mock, stream):
+    loads = []
+    release = threading.Event()
+
+    def slow_history():
+        loads.append(1)
+        release.wait(5)
+        return history()
+
+    buffers = []
+    threads = [threading.Thread(target=lambda: buffers.append(stream.subscribe(SYMBOL, load_history=slow_history)))
+               for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    assert wait_for(lambda: loads)
+    # Nothing is visible to callers or ticks until the seed finished
+    assert SYMBOL not in stream._buffers and not mock.subscriptions
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert len(loads) == 1
+    assert len(buffers) == 4 and all(buffer is buffers[0] for buffer in buffers)
+    assert len(buffers[0]) == 3
+
+
+def test_bullet_public_token(mock, monkeypatch):
+    monkeypatch.setattr(client, "BASE_URL", mock.base_url)
+    url, ping_interval = KuCoinStream()._connect_info()
+    assert url.startswith(mock.url + "?token=")
+    assert ping_interval == 18
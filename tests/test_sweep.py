@@ -0,0 +1,40 @@
+"""Parameter sweep on a process pool against direct backtests"""
+import numpy as np
+import pandas as pd
+from src.backtest import sweep as sweep_module
+from src.backtest.engine import run_backtest
+from src.backtest.sweep import WORKER_CACHE_SERIES, best, sweep
+from src.indicators.cache import get_indicator_cache
+
+
+def candles(count=5000, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 0.5, count))
+    return pd.DataFrame({
+        'timestamp': pd.to_datetime(1_700_000_000 + 3600 * np.arange(count), unit='s'),
+        'open': close, 'high': close + 1, 'low': close - 1, 'close': close, 'volume': 1.0
+    })
+
+
+def test_sweep_matches_direct_backtests():
+    df = candles()
+    results = list(sweep(df, 'ma_cross', {'fast': range(5, 20, 5), 'slow': range(20, 60, 10)},
+                         timeframe='1h', max_workers=2))
+    assert len(results) == 12
+    params, stats = best(results, 'sharpe', 1)[0]
+    assert stats == run_backtest(df, [{'rule': 'ma_cross', **params}], timeframe='1h', with_trades=False).stats
+
+
+def test_worker_cache_budget_follows_the_candles(monkeypatch):
+    cache = get_indicator_cache()
+    monkeypatch.setattr(cache, "max_bytes", cache.max_bytes)
+    block, length = sweep_module._share(candles(1000))
+    try:
+        sweep_module._attach(block.name, length)
+        assert cache.max_bytes == WORKER_CACHE_SERIES * length * 8
+    finally:
+        sweep_module._block.close()
+        monkeypatch.setattr(sweep_module, "_block", None)
+        monkeypatch.setattr(sweep_module, "_frame", None)
+        block.close()
+        block.unlink()
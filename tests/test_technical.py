@@ -0,0 +1,45 @@
+"""Batched moving averages against pandas rolling and ewm"""
+import numpy as np
+import pandas as pd
+import pytest
+from src.indicators.technical import MA_BATCH_BLOCK, calculate_ma_batch
+
+PERIODS = (1, 2, 5, 20, 200)
+
+
+def closes_with_gaps(count=3 * MA_BATCH_BLOCK + 100, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    close[rng.random(count) < 0.01] = np.nan
+    # A gap on a block boundary and a run longer than some windows
+    close[MA_BATCH_BLOCK] = np.nan
+    close[500:510] = np.nan
+    return pd.DataFrame({'close': close})
+
+
+@pytest.mark.parametrize("min_periods", [None, 1, 3])
+def test_sma_matches_rolling_mean_with_nan(min_periods):
+    df = closes_with_gaps()
+    result = calculate_ma_batch(df, PERIODS, min_periods=min_periods)
+    for row, period in enumerate(PERIODS):
+        required = period if min_periods is None else min(min_periods, period)
+        expected = df['close'].rolling(period, min_periods=required).mean().to_numpy()
+        np.testing.assert_allclose(result[row], expected, rtol=1e-9, atol=1e-9)
+
+
+def test_wma_matches_weighted_rolling_with_nan():
+    df = closes_with_gaps()
+    result = calculate_ma_batch(df, PERIODS, kind='wma')
+    for row, period in enumerate(PERIODS):
+        weights = np.arange(1, period + 1)
+        expected = df['close'].rolling(period).apply(lambda window: np.dot(window, weights) / weights.sum(), raw=True)
+        # The weighted cumulative sums carry index-scaled rounding error
+        np.testing.assert_allclose(result[row], expected.to_numpy(), rtol=1e-9, atol=1e-7)
+
+
+def test_ema_matches_ewm_with_nan():
+    df = closes_with_gaps()
+    result = calculate_ma_batch(df, PERIODS, kind='ema')
+    for row, period in enumerate(PERIODS):
+        expected = df['close'].ewm(span=period, adjust=False).mean().to_numpy()
+        np.testing.assert_allclose(result[row], expected, rtol=1e-12, atol=1e-12)
@@ -0,0 +1,53 @@
+"""In-place VolumeProfile updates against a full bin_volumes rebuild"""
+import numpy as np
+from src.indicators.volume_profile import VolumeProfile, bin_volumes
+
+BIN_SIZE = 0.5
+
+
+def candles(count, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, count))
+    low = close - rng.random(count) * 3
+    high = close + rng.random(count) * 3
+    # Some zero-range bars and bars ending exactly on a bin edge
+    high[::17] = low[::17]
+    high[5::23] = np.ceil(high[5::23] / BIN_SIZE) * BIN_SIZE
+    return 1_700_000_000 + 60 * np.arange(count), low, high, rng.random(count) * 10
+
+
+def dense(offset, volumes, start, end):
+    """volumes on the grid bins [start, end)"""
+    result = np.zeros(end - start)
+    result[offset - start:offset - start + len(volumes)] = volumes
+    return result
+
+
+def assert_matches_rebuild(profile, low, high, volume):
+    offset, expected = bin_volumes(low, high, volume, BIN_SIZE)
+    start = min(offset, profile.offset)
+    end = max(offset + len(expected), profile.offset + len(profile.volumes))
+    np.testing.assert_allclose(dense(profile.offset, profile.volumes, start, end),
+                               dense(offset, expected, start, end), rtol=1e-9, atol=1e-9)
+
+
+def test_sliding_window_with_revisions_matches_rebuild():
+    timestamp, low, high, volume = candles(600)
+    profile = VolumeProfile(BIN_SIZE)
+    window = 200
+    for end in range(300, 600):
+        start = end - window
+        # The forming candle is revised before the next one opens
+        for scale in (0.5, 1.0):
+            revised = volume[:end + 1].copy()
+            revised[-1] *= scale
+            profile.update(timestamp[:end + 1], low[:end + 1], high[:end + 1], revised, start)
+            assert_matches_rebuild(profile, low[start:end + 1], high[start:end + 1], revised[start:])
+
+
+def test_growing_window_matches_rebuild():
+    timestamp, low, high, volume = candles(400, seed=1)
+    profile = VolumeProfile(BIN_SIZE)
+    for end in range(1, 400, 7):
+        profile.update(timestamp[:end], low[:end], high[:end], volume[:end])
+        assert_matches_rebuild(profile, low[:end], high[:end], volume[:end])
@@ -0,0 +1,225 @@
+"""
+Drive concurrent headless Streamlit sessions through app.py against a KuCoin stand-in
+
+Starts `streamlit run app.py` with KUCOIN_BASE_URL pointing at tools/mock_kucoin.py
+(in-process unless --base-url is given) and opens N WebSocket sessions that each
+request M full reruns, like N browser tabs pressing refresh. Reports rerun latency,
+server memory per session and upstream request counts.
+
+Run from the repository root:
+    python -m tools.load_test --sessions 20 --reruns 10 --latency 50
+    python -m tools.load_test --sessions 50 --base-url http://localhost:8801 --json results.json
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import websocket
+from streamlit.proto import BackMsg_pb2, ForwardMsg_pb2
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_TIMEOUT = 60
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rss_bytes(pid):
+    """Resident set size of a process (Linux)"""
+    with open(f"/proc/{pid}/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def percentile(values, q):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def scrape_counters(metrics_port):
+    """Event counters from the app's Prometheus endpoint"""
+    body = urllib.request.urlopen(f"http://127.0.0.1:{metrics_port}/metrics", timeout=5).read().decode()
+    counters = {}
+    for line in body.splitlines():
+        if line.startswith("kmchart_events_total{"):
+            name = line.split('event="', 1)[1].split('"', 1)[0]
+            counters[name] = float(line.rsplit(" ", 1)[1])
+    return counters
+
+
+def start_app(port, metrics_port, base_url):
+    env = dict(
+        os.environ,
+        KUCOIN_BASE_URL=base_url,
+        METRICS_PORT=str(metrics_port),
+        # A fresh candle store so every run starts cold
+        CANDLE_DB_PATH=os.path.join(tempfile.mkdtemp(prefix="kmchart-load-"), "candles.db")
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+         "--server.headless", "true", "--server.port", str(port),
+         "--server.enableCORS", "false", "--server.enableXsrfProtection", "false",
+         "--browser.gatherUsageStats", "false"],
+        cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1)
+            return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Streamlit did not start")
+
+
+class Session:
+    """One headless browser tab speaking the Streamlit WebSocket protocol"""
+
+    def __init__(self, port, timeout):
+        self.ws = websocket.create_connection(f"ws://127.0.0.1:{port}/_stcore/stream", timeout=timeout)
+
+    def rerun(self):
+        """Request a full script run and return (seconds until it finished, finish status)"""
+        message = BackMsg_pb2.BackMsg()
+        message.rerun_script.query_string = ""
+        message.rerun_script.page_script_hash = ""
+        start = time.perf_counter()
+        self.ws.send_binary(message.SerializeToString())
+        while True:
+            forward = ForwardMsg_pb2.ForwardMsg()
+            forward.ParseFromString(self.ws.recv())
+            if forward.WhichOneof('type') == 'script_finished':
+                return time.perf_counter() - start, forward.script_finished
+
+    def close(self):
+        self.ws.close()
+
+
+def run_session(port, reruns, timeout, ready, go, first_runs, latencies, errors):
+    try:
+        session = Session(port, timeout)
+    except Exception as e:
+        errors.append(f"connect: {e!r}")
+        ready.release()
+        return
+    try:
+        seconds, _ = session.rerun()
+        first_runs.append(seconds)
+        ready.release()
+        # Keep every session open until all have connected, so memory is measured with all of them alive
+        go.wait()
+        for _ in range(reruns):
+            seconds, status = session.rerun()
+            if status == ForwardMsg_pb2.ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                errors.append("compile error")
+            latencies.append(seconds)
+    except Exception as e:
+        errors.append(repr(e))
+        ready.release()
+    finally:
+        session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sessions', type=int, default=10)
+    parser.add_argument('--reruns', type=int, default=5, help="full reruns per session after the first run")
+    parser.add_argument('--base-url', help="running KuCoin stand-in (default: start tools/mock_kucoin.py)")
+    parser.add_argument('--latency', type=float, default=0.0, help="in-process mock latency in ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="in-process mock 503 rate")
+    parser.add_argument('--timeout', type=float, default=120, help="seconds allowed per script run")
+    parser.add_argument('--json', help="also write the report to this file")
+    args = parser.parse_args()
+
+    mock = None
+    if args.base_url is None:
+        from tools.mock_kucoin import serve
+        server, mock = serve(0, latency=args.latency / 1000, error_rate=args.error_rate)
+        args.base_url = f"http://127.0.0.1:{server.server_port}"
+
+    port, metrics_port = free_port(), free_port()
+    app = start_app(port, metrics_port, args.base_url)
+    try:
+        rss_idle = rss_bytes(app.pid)
+        first_runs, latencies, errors = [], [], []
+        ready = threading.Semaphore(0)
+        go = threading.Event()
+        threads = [
+            threading.Thread(target=run_session, name=f"session-{i}",
+                             args=(port, args.reruns, args.timeout, ready, go, first_runs, latencies, errors))
+            for i in range(args.sessions)
+        ]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for _ in threads:
+            ready.acquire()
+        rss_loaded = rss_bytes(app.pid)
+        go.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        counters = scrape_counters(metrics_port)
+    finally:
+        app.terminate()
+        app.wait()
+
+    report = {
+        'sessions': args.sessions,
+        'reruns_per_session': args.reruns,
+        'wall_seconds': elapsed,
+        'first_run_seconds': {
+            'p50': percentile(first_runs, 0.5),
+            'p99': percentile(first_runs, 0.99),
+            'max': max(first_runs, default=float('nan'))
+        },
+        'rerun_seconds': {
+            'p50': percentile(latencies, 0.5),
+            'p95': percentile(latencies, 0.95),
+            'p99': percentile(latencies, 0.99),
+            'mean': statistics.fmean(latencies) if latencies else float('nan'),
+            'count': len(latencies)
+        },
+        'server_rss_bytes': {'idle': rss_idle, 'loaded': rss_loaded},
+        'rss_bytes_per_session': (rss_loaded - rss_idle) / max(args.sessions, 1),
+        'upstream_requests': counters.get('kucoin.http_requests', 0),
+        'upstream_retries': counters.get('kucoin.http_retries', 0),
+        'hub_upstream_loads': counters.get('hub.upstream_loads', 0),
+        'mock_requests_by_endpoint': dict(mock.counts) if mock is not None else None,
+        'errors': errors[:20],
+        'error_count': len(errors)
+    }
+
+    print(f"sessions: {args.sessions}  reruns/session: {args.reruns}  wall: {elapsed:.1f}s")
+    print(f"first run   p50 {report['first_run_seconds']['p50'] * 1000:8.1f} ms"
+          f"   p99 {report['first_run_seconds']['p99'] * 1000:8.1f} ms")
+    print(f"rerun       p50 {report['rerun_seconds']['p50'] * 1000:8.1f} ms"
+          f"   p95 {report['rerun_seconds']['p95'] * 1000:8.1f} ms"
+          f"   p99 {report['rerun_seconds']['p99'] * 1000:8.1f} ms")
+    print(f"memory      {report['rss_bytes_per_session'] / 1e6:.1f} MB server RSS per session "
+          f"({rss_idle / 1e6:.0f} MB idle, {rss_loaded / 1e6:.0f} MB loaded)")
+    print(f"upstream    {report['upstream_requests']:.0f} requests, {report['upstream_retries']:.0f} retries, "
+          f"{report['hub_upstream_loads']:.0f} hub loads")
+    if mock is not None:
+        print(f"mock        {report['mock_requests_by_endpoint']}")
+    if errors:
+        print(f"errors      {len(errors)}, first: {errors[0]}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,406 @@
+"""
+Local stand-in for the KuCoin public REST and WebSocket APIs
+
+Serves deterministic synthetic data for /api/v1/market/candles, /api/v1/market/stats
+and /api/v1/market/allTickers, with optional latency and error injection.
+POST /api/v1/bullet-public hands out the /ws endpoint, which accepts subscribe,
+unsubscribe and ping messages and pushes candle and snapshot updates for the
+subscribed topics every --push-interval seconds.
+GET /mock/stats returns the number of requests served per endpoint.
+
+Run from the repository root, then start the app against it:
+    python -m tools.mock_kucoin --port 8801 --latency 50 --error-rate 0.01
+    KUCOIN_BASE_URL=http://localhost:8801 streamlit run app.py
+"""
+import argparse
+import base64
+import hashlib
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+from src.api.kucoin import TIMEFRAME_MAP, TIMEFRAME_SECONDS, MAX_CANDLES_PER_REQUEST
+
+SYMBOLS = ["BTC", "ETH", "BNB", "XRP", "ADA", "DOGE", "DOT", "AVAX", "MATIC"]
+KUCOIN_TYPES = {kucoin_type: timeframe for timeframe, kucoin_type in TIMEFRAME_MAP.items()}
+WS_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+WS_TEXT, WS_CLOSE, WS_PING, WS_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def symbols(pairs=len(SYMBOLS)):
+    """The listed base currencies: the app's coins, then synthetic ones up to `pairs`"""
+    return (SYMBOLS + [f"ALT{i}" for i in range(max(pairs - len(SYMBOLS), 0))])[:pairs]
+
+
+def base_price(symbol):
+    """Stable per-symbol price level between 0.1 and 100000"""
+    digest = hashlib.sha256(symbol.encode()).digest()
+    return 10 ** (int.from_bytes(digest[:4], "big") / 2**32 * 6 - 1)
+
+
+def price_at(symbol, timestamps):
+    """Deterministic price path: a few overlapping cycles around the symbol's level"""
+    t = np.asarray(timestamps, dtype=np.float64)
+    phase = base_price(symbol) % 1 * 2 * np.pi
+    wave = (0.08 * np.sin(2 * np.pi * t / (30 * 86400) + phase)
+            + 0.03 * np.sin(2 * np.pi * t / (3 * 86400) + 2 * phase)
+            + 0.01 * np.sin(2 * np.pi * t / 3600 + 3 * phase)
+            + 0.004 * np.sin(t * 12.9898 + phase))
+    return base_price(symbol) * (1 + wave)
+
+
+def candles(symbol, timeframe, start, end):
+    """KuCoin candle rows for [start, end]: strings, newest first, at most one page"""
+    seconds = TIMEFRAME_SECONDS[timeframe]
+    end = min(end, int(time.time()))
+    first = -(-start // seconds) * seconds
+    opens = np.arange(first, end + 1, seconds, dtype=np.int64)[-MAX_CANDLES_PER_REQUEST:]
+    if not len(opens):
+        return []
+    open_price = price_at(symbol, opens)
+    close = price_at(symbol, np.minimum(opens + seconds, end))
+    spread = np.abs(np.sin(opens * 78.233)) * 0.002 * open_price
+    high = np.maximum(open_price, close) + spread
+    low = np.minimum(open_price, close) - spread
+    volume = 1 + np.abs(np.sin(opens * 3.7)) * 100
+    rows = np.column_stack([opens, open_price, close, high, low, volume, volume * close])[::-1]
+    return [[str(int(row[0]))] + [f"{value:.8g}" for value in row[1:]] for row in rows.tolist()]
+
+
+def stats(symbol, now=None):
+    """24h market stats in the /api/v1/market/stats shape"""
+    now = int(time.time()) if now is None else now
+    day = np.arange(now - 86400, now + 1, 3600)
+    prices = price_at(symbol, day)
+    last = prices[-1]
+    vol = float(np.abs(np.sin(now // 60 * 3.7)) * 1000 + 1000)
+    return {
+        'time': now * 1000,
+        'symbol': symbol,
+        'last': f"{last:.8g}",
+        'changeRate': f"{last / prices[0] - 1:.4f}",
+        'high': f"{prices.max():.8g}",
+        'low': f"{prices.min():.8g}",
+        'vol': f"{vol:.8g}",
+        'volValue': f"{vol * last:.8g}"
+    }
+
+
+def snapshot(symbol, now=None):
+    """Snapshot push payload for symbol, as sent on /market/snapshot topics"""
+    market = stats(symbol, now)
+    return {'sequence': market['time'], 'data': {
+        'symbol': symbol,
+        'lastTradedPrice': float(market['last']),
+        'changeRate': float(market['changeRate']),
+        'high': float(market['high']),
+        'low': float(market['low']),
+        'vol': float(market['vol']),
+        'volValue': float(market['volValue'])
+    }}
+
+
+def topic_message(topic, now=None):
+    """Synthetic push for a candle or snapshot topic, or None for unknown topics"""
+    now = int(time.time()) if now is None else now
+    kind, _, target = topic.partition(":")
+    if kind == "/market/candles":
+        symbol, kucoin_type = target.rsplit("_", 1)
+        timeframe = KUCOIN_TYPES.get(kucoin_type)
+        if timeframe is None:
+            return None
+        rows = candles(symbol, timeframe, now - TIMEFRAME_SECONDS[timeframe], now)
+        if not rows:
+            return None
+        data = {'symbol': symbol, 'candles': rows[0], 'time': now * 10**9}
+        return {'type': 'message', 'topic': topic, 'subject': 'trade.candles.update', 'data': data}
+    if kind == "/market/snapshot":
+        return {'type': 'message', 'topic': topic, 'subject': 'trade.snapshot', 'data': snapshot(target, now)}
+    return None
+
+
+def ws_frame(payload, opcode=WS_TEXT):
+    """One unmasked, unfragmented server frame"""
+    length = len(payload)
+    if length < 126:
+        header = bytes([0x80 | opcode, length])
+    elif length < 2**16:
+        header = bytes([0x80 | opcode, 126]) + length.to_bytes(2, "big")
+    else:
+        header = bytes([0x80 | opcode, 127]) + length.to_bytes(8, "big")
+    return header + payload
+
+
+def read_ws_frame(stream):
+    """(opcode, payload) of the next client frame, or (None, None) once the connection is gone"""
+    head = stream.read(2)
+    if len(head) < 2:
+        return None, None
+    length = head[1] & 0x7F
+    if length == 126:
+        length = int.from_bytes(stream.read(2), "big")
+    elif length == 127:
+        length = int.from_bytes(stream.read(8), "big")
+    mask = stream.read(4) if head[1] & 0x80 else b""
+    payload = stream.read(length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return head[0] & 0x0F, payload
+
+
+class WebSocketClient:
+    """One connected WebSocket client and the topics it subscribed to"""
+
+    def __init__(self, handler):
+        self.topics = set()
+        self._handler = handler
+        self._lock = threading.Lock()
+
+    def send(self, message, opcode=WS_TEXT):
+        payload = message if isinstance(message, bytes) else json.dumps(message).encode()
+        with self._lock:
+            try:
+                self._handler.wfile.write(ws_frame(payload, opcode))
+                self._handler.wfile.flush()
+            except OSError:
+                pass
+
+    def drop(self):
+        """Cut the connection without a close handshake, like a network failure"""
+        try:
+            self._handler.connection.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+
+class MockKuCoin:
+    """Request counters, WebSocket clients and fault injection settings shared by all handler threads"""
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, rate_limit_rate=0.0, seed=0, pairs=len(SYMBOLS),
+                 push_interval=1.0):
+        self.pairs = pairs
+        self.push_interval = push_interval
+        self.clients = []
+        # Every subscribe message received, in order, as (client, topic)
+        self.subscriptions = []
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.counts = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def count(self, path):
+        with self._lock:
+            self.counts[path] = self.counts.get(path, 0) + 1
+
+    def fault(self):
+        """Sleep the configured latency and return an injected HTTP status, or None"""
+        with self._lock:
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+            roll = self._random.random()
+        time.sleep(delay)
+        if roll < self.rate_limit_rate:
+            return 429
+        if roll < self.rate_limit_rate + self.error_rate:
+            return 503
+        return None
+
+    def push(self, message):
+        """Send a topic message to every client subscribed to its topic"""
+        with self._lock:
+            clients = [client for client in self.clients if message['topic'] in client.topics]
+        for client in clients:
+            client.send(message)
+
+    def drop_connections(self):
+        """Cut every WebSocket connection; clients are expected to reconnect and resubscribe"""
+        with self._lock:
+            clients = list(self.clients)
+        for client in clients:
+            client.drop()
+
+    def push_loop(self, stop):
+        """Push a fresh update for every subscribed topic each push_interval seconds"""
+        while not stop.wait(self.push_interval):
+            with self._lock:
+                topics = set().union(*(client.topics for client in self.clients))
+            for topic in topics:
+                message = topic_message(topic)
+                if message is not None:
+                    self.push(message)
+
+
+def make_handler(mock):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            params = {key: values[0] for key, values in parse_qs(url.query).items()}
+            if url.path == "/mock/stats":
+                with mock._lock:
+                    return self._send(200, dict(mock.counts))
+            mock.count(url.path)
+            status = mock.fault()
+            if status is not None:
+                return self._send(status, {'code': str(status), 'msg': "injected failure"})
+            if url.path == "/api/v1/market/candles":
+                timeframe = KUCOIN_TYPES.get(params.get('type'))
+                if timeframe is None or 'symbol' not in params:
+                    return self._send(200, {'code': '400100', 'msg': "invalid parameters"})
+                now = int(time.time())
+                rows = candles(params['symbol'], timeframe,
+                               int(params.get('startAt', now - 100 * TIMEFRAME_SECONDS[timeframe])),
+                               int(params.get('endAt', now)))
+                return self._send(200, {'code': '200000', 'data': rows})
+            if url.path == "/api/v1/market/stats":
+                return self._send(200, {'code': '200000', 'data': stats(params.get('symbol', 'BTC-USDT'))})
+            if url.path == "/api/v1/market/allTickers":
+                now = int(time.time())
+                tickers = [stats(f"{symbol}-USDT", now) for symbol in symbols(mock.pairs)]
+                return self._send(200, {'code': '200000', 'data': {'time': now * 1000, 'ticker': tickers}})
+            if url.path == "/ws" and self.headers.get("Upgrade", "").lower() == "websocket":
+                return self._websocket()
+            self._send(404, {'code': '404000', 'msg': "not found"})
+
+        def do_POST(self):
+            url = urlparse(self.path)
+            self.rfile.read(int(self.headers.get("Content-Length") or 0))
+            mock.count(url.path)
+            status = mock.fault()
+            if status is not None:
+                return self._send(status, {'code': str(status), 'msg': "injected failure"})
+            if url.path == "/api/v1/bullet-public":
+                host, port = self.server.server_address[:2]
+                return self._send(200, {'code': '200000', 'data': {
+                    'token': uuid.uuid4().hex,
+                    'instanceServers': [{
+                        'endpoint': f"ws://{host}:{port}/ws",
+                        'encrypt': False,
+                        'protocol': 'websocket',
+                        'pingInterval': 18000,
+                        'pingTimeout': 10000
+                    }]
+                }})
+            self._send(404, {'code': '404000', 'msg': "not found"})
+
+        def _websocket(self):
+            accept = base64.b64encode(hashlib.sha1((self.headers["Sec-WebSocket-Key"] + WS_GUID).encode()).digest())
+            self.send_response(101)
+            self.send_header("Upgrade", "websocket")
+            self.send_header("Connection", "Upgrade")
+            self.send_header("Sec-WebSocket-Accept", accept.decode())
+            self.end_headers()
+            self.close_connection = True
+
+            client = WebSocketClient(self)
+            with mock._lock:
+                mock.clients.append(client)
+            client.send({'id': uuid.uuid4().hex, 'type': 'welcome'})
+            try:
+                while True:
+                    opcode, payload = read_ws_frame(self.rfile)
+                    if opcode is None:
+                        return
+                    if opcode == WS_CLOSE:
+                        client.send(payload[:2], WS_CLOSE)
+                        return
+                    if opcode == WS_PING:
+                        client.send(payload, WS_PONG)
+                    elif opcode == WS_TEXT:
+                        self._ws_message(client, json.loads(payload))
+            except OSError:
+                pass
+            finally:
+                with mock._lock:
+                    mock.clients.remove(client)
+
+        def _ws_message(self, client, message):
+            kind = message.get('type')
+            if kind == 'ping':
+                client.send({'id': message.get('id'), 'type': 'pong'})
+            elif kind in ('subscribe', 'unsubscribe'):
+                with mock._lock:
+                    for topic in message.get('topic', '').split(","):
+                        if kind == 'subscribe':
+                            client.topics.add(topic)
+                            mock.subscriptions.append((client, topic))
+                        else:
+                            client.topics.discard(topic)
+                if message.get('response'):
+                    client.send({'id': message.get('id'), 'type': 'ack'})
+
+        def _send(self, status, body):
+            payload = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            if status == 429:
+                self.send_header("Retry-After", "1")
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+class MockServer(ThreadingHTTPServer):
+    """HTTP server that also stops the WebSocket pushes and connections on shutdown"""
+    daemon_threads = True
+
+    def __init__(self, address, mock):
+        super().__init__(address, make_handler(mock))
+        self.mock = mock
+        self.stopped = threading.Event()
+
+    def shutdown(self):
+        self.stopped.set()
+        self.mock.drop_connections()
+        super().shutdown()
+
+
+def serve(port=8801, host="127.0.0.1", **settings):
+    """Start the mock on a background thread; returns (server, mock)"""
+    mock = MockKuCoin(**settings)
+    server = MockServer((host, port), mock)
+    threading.Thread(target=server.serve_forever, name="mock-kucoin", daemon=True).start()
+    if mock.push_interval:
+        threading.Thread(target=mock.push_loop, args=(server.stopped,), name="mock-kucoin-push", daemon=True).start()
+    return server, mock
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8801)
+    parser.add_argument('--latency', type=float, default=0.0, help="added latency per request in ms")
+    parser.add_argument('--jitter', type=float, default=0.0, help="uniform latency jitter in ms")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument('--rate-limit-rate', type=float, default=0.0, help="fraction of requests answered with 429")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--pairs', type=int, default=len(SYMBOLS), help="USDT pairs listed by allTickers")
+    parser.add_argument('--push-interval', type=float, default=1.0,
+                        help="seconds between WebSocket pushes per subscribed topic, 0 to disable")
+    args = parser.parse_args()
+
+    server, _ = serve(args.port, args.host, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                      error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, seed=args.seed,
+                      pairs=args.pairs, push_interval=args.push_interval)
+    print(f"Mock KuCoin API on http://{args.host}:{server.server_port}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()